@@ -0,0 +1,35 @@
+"""Общие помощники для команд-замеров производительности."""
+from contextlib import contextmanager
+
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+
+@contextmanager
+def scratch_database(verbosity=0, name=None):
+    """
+    Временная база с миграциями; рабочая база не затрагивается.
+
+    name - файл базы для замеров, где важны блокировки и доступ из
+    нескольких потоков; по умолчанию SQLite создаёт базу в памяти.
+    """
+    old_name = connection.settings_dict['NAME']
+    test_settings = connection.settings_dict.setdefault('TEST', {})
+    old_test_name = test_settings.get('NAME')
+    if name is not None:
+        test_settings['NAME'] = name
+    connection.creation.create_test_db(
+        verbosity=verbosity, autoclobber=True, serialize=False
+    )
+    try:
+        yield
+    finally:
+        connection.creation.destroy_test_db(old_name, verbosity=verbosity)
+        test_settings['NAME'] = old_test_name
+
+
+def captured_get(client, url):
+    """GET-запрос с перехватом всех SQL-запросов, сделанных за время ответа."""
+    with CaptureQueriesContext(connection) as context:
+        response = client.get(url)
+    return response, context.captured_queries
@@ -0,0 +1,113 @@
+"""
+Проверки настроек, которые замедляют сайт в боевом окружении.
+
+Запуск: python manage.py check --deploy --tag performance
+"""
+from django.conf import settings
+from django.contrib.staticfiles.storage import ManifestFilesMixin
+from django.core.checks import Warning, register
+from django.utils.module_loading import import_string
+
+PERFORMANCE_TAG = 'performance'
+
+LOCAL_CACHE_BACKENDS = (
+    'django.core.cache.backends.locmem.LocMemCache',
+    'core.metrics.InstrumentedLocMemCache',
+    'django.core.cache.backends.dummy.DummyCache',
+)
+DB_SESSION_ENGINE = 'django.contrib.sessions.backends.db'
+CACHED_TEMPLATE_LOADER = 'django.template.loaders.cached.Loader'
+
+
+@register(PERFORMANCE_TAG, deploy=True)
+def check_debug(app_configs, **kwargs):
+    """DEBUG копит в памяти каждый SQL-запрос соединения."""
+    if settings.DEBUG:
+        return [Warning(
+            'DEBUG включён.',
+            hint='Django хранит все SQL-запросы в connection.queries, '
+                 'а медиа раздаются через django.views.static.serve.',
+            id='core.W001',
+        )]
+    return []
+
+
+@register(PERFORMANCE_TAG, deploy=True)
+def check_persistent_connections(app_configs, **kwargs):
+    """Без CONN_MAX_AGE соединение с базой открывается на каждый запрос."""
+    return [
+        Warning(
+            f'База {alias!r} открывает новое соединение на каждый запрос.',
+            hint="Задайте DATABASES['%s']['CONN_MAX_AGE'] > 0." % alias,
+            id='core.W002',
+        )
+        for alias, database in settings.DATABASES.items()
+        if not database.get('CONN_MAX_AGE')
+    ]
+
+
+def _uses_cached_loader(template_settings):
+    loaders = template_settings.get('OPTIONS', {}).get('loaders')
+    if loaders is None:
+        # Django сам включает кеширующий загрузчик при выключенном DEBUG.
+        return not settings.DEBUG
+    return any(
+        loader[0] == CACHED_TEMPLATE_LOADER
+        if isinstance(loader, (list, tuple)) else
+        loader == CACHED_TEMPLATE_LOADER
+        for loader in loaders
+    )
+
+
+@register(PERFORMANCE_TAG, deploy=True)
+def check_cached_templates(app_configs, **kwargs):
+    """Без кеширующего загрузчика шаблоны парсятся на каждый рендер."""
+    return [
+        Warning(
+            f'Шаблоны {template["BACKEND"]} не кешируются.',
+            hint=f'Оберните загрузчики в {CACHED_TEMPLATE_LOADER}.',
+            id='core.W003',
+        )
+        for template in settings.TEMPLATES
+        if template['BACKEND'].endswith('DjangoTemplates')
+        and not _uses_cached_loader(template)
+    ]
+
+
+@register(PERFORMANCE_TAG, deploy=True)
+def check_shared_cache(app_configs, **kwargs):
+    """Локальный кеш у каждого воркера свой и не переживает рестарт."""
+    backend = settings.CACHES['default']['BACKEND']
+    if backend in LOCAL_CACHE_BACKENDS:
+        return [Warning(
+            f'Кеш по умолчанию {backend} не общий для процессов.',
+            hint='Используйте memcached или другой разделяемый кеш.',
+            id='core.W004',
+        )]
+    return []
+
+
+@register(PERFORMANCE_TAG, deploy=True)
+def check_session_engine(app_configs, **kwargs):
+    """Сессии в базе стоят запроса к django_session на каждый запрос."""
+    if settings.SESSION_ENGINE == DB_SESSION_ENGINE:
+        return [Warning(
+            'Сессии читаются из базы на каждый запрос.',
+            hint='Используйте cached_db или signed_cookies.',
+            id='core.W005',
+        )]
+    return []
+
+
+@register(PERFORMANCE_TAG, deploy=True)
+def check_static_storage(app_configs, **kwargs):
+    """Статика без хеша в имени не может кешироваться надолго."""
+    storage_class = import_string(settings.STATICFILES_STORAGE)
+    if not issubclass(storage_class, ManifestFilesMixin):
+        return [Warning(
+            f'{settings.STATICFILES_STORAGE} не добавляет хеш к именам.',
+            hint='Используйте core.staticfiles.'
+                 'CompressedManifestStaticFilesStorage.',
+            id='core.W006',
+        )]
+    return []
@@ -0,0 +1,84 @@
+"""
+Кеш ответов по поколению с поддержкой условных GET.
+
+Для документов, которые роботы перечитывают по расписанию (sitemap.xml,
+RSS и Atom): ответ строится один раз на поколение, например 'feed',
+которое увеличивается при изменении постов. Пока поколение не сменилось,
+ответ берётся из кеша, а клиент с совпавшим ETag или Last-Modified
+получает 304 без тела. Поколение может зависеть от запроса (лента одной
+группы, одна страница карты сайта): тогда изменение поста сбрасывает
+только затронутые им документы.
+"""
+import hashlib
+import time
+from functools import wraps
+
+from django.conf import settings
+from django.core.cache import cache
+from django.http import HttpResponse
+from django.utils.cache import get_conditional_response
+from django.utils.http import http_date, parse_http_date_safe, quote_etag
+
+from . import generations
+
+
+def cache_conditional(generation, timeout=None, key_prefix='conditional',
+                      params=()):
+    """
+    Кеширует GET-ответы view до смены поколения generation, но не дольше
+    timeout секунд (по умолчанию settings.CONDITIONAL_CACHE_TIMEOUT), и
+    отвечает 304 на условные запросы.
+
+    generation - имя поколения или функция с аргументами view, которая
+    возвращает кортеж имён: ответ устаревает при смене любого из них.
+
+    Ключ - путь и только параметры params, которые читает view: со
+    случайной строкой запроса кеш нельзя ни обойти, ни засорить.
+    """
+    def decorator(view):
+        @wraps(view)
+        def wrapper(request, *args, **kwargs):
+            if request.method not in ('GET', 'HEAD'):
+                return view(request, *args, **kwargs)
+            query = '&'.join(
+                f'{name}={request.GET[name]}'
+                for name in params if name in request.GET
+            )
+            names = (
+                generation(request, *args, **kwargs) if callable(generation)
+                else (generation,)
+            )
+            key = ':'.join((
+                key_prefix,
+                *(str(generations.get(name)) for name in names),
+                hashlib.md5(f'{request.path}?{query}'.encode()).hexdigest(),
+            ))
+            cached = cache.get(key)
+            if cached is None:
+                response = view(request, *args, **kwargs)
+                if hasattr(response, 'render'):
+                    response.render()
+                if response.status_code != 200 or response.streaming:
+                    return response
+                last_modified = parse_http_date_safe(
+                    response.get('Last-Modified', '')
+                ) or int(time.time())
+                cached = (
+                    response.content, response['Content-Type'],
+                    quote_etag(hashlib.md5(response.content).hexdigest()),
+                    last_modified,
+                )
+                cache.set(key, cached, timeout or getattr(
+                    settings, 'CONDITIONAL_CACHE_TIMEOUT', 24 * 60 * 60
+                ))
+            content, content_type, etag, last_modified = cached
+            response = get_conditional_response(
+                request, etag=etag, last_modified=last_modified
+            )
+            if response is None:
+                response = HttpResponse(content, content_type=content_type)
+            response['ETag'] = etag
+            response['Last-Modified'] = http_date(last_modified)
+            return response
+        return wrapper
+    return decorator
@@ -0,0 +1,167 @@
+"""
+Счётчики с отложенной записью в базу.
+
+Частые приращения одного поля (лайки, просмотры популярного поста) не
+обновляют строку в базе каждый раз: иначе все пишущие выстраиваются в
+очередь за блокировкой одной строки, а в SQLite - всей базы. Приращения
+копятся в кеше атомарными cache.incr, а сбрасывает их в базу одним
+bulk_update на пачку объектов команда flush_counters - по расписанию или
+воркером с --every. Запрос, который увеличил счётчик, в базу не пишет.
+
+Как устроен буфер в кеше:
+    counters:<name>:plus:<pk>   - накопленные прибавления объекта;
+    counters:<name>:minus:<pk>  - накопленные вычитания объекта;
+    counters:<name>:seq         - номер последнего события;
+    counters:<name>:dirty:<seq> - pk объекта, изменённого событием seq;
+    counters:<name>:flushed     - номер последнего сброшенного события;
+    counters:<name>:late        - события, чей dirty-ключ сброс не застал.
+Прибавления и вычитания копятся раздельно и только растут: memcached
+не хранит отрицательных чисел, а decr ниже нуля обрезает до нуля.
+Сброс читает pk из dirty-ключей после flushed, поэтому не перебирает
+все объекты. Потерять можно только то, что кеш не сохранил до сброса.
+"""
+from django.core.cache import cache
+from django.db import transaction
+from django.db.models import F
+
+FLUSH_BATCH_SIZE = 500
+# Ключи буфера живут ограниченное время, чтобы не копить в кеше нули по
+# каждому когда-либо изменённому объекту. Сброс идёт намного чаще.
+BUFFER_TIMEOUT = 24 * 60 * 60
+# Сброс, который упал посередине, не должен держать блокировку вечно.
+FLUSH_LOCK_TIMEOUT = 60
+# Событие получает номер раньше, чем записан его dirty-ключ. Ключи,
+# которых сброс не нашёл среди последних LATE_WINDOW событий, он
+# перечитает в следующий раз, а не потеряет.
+LATE_WINDOW = 100
+
+
+def cache_incr(key, amount=1, timeout=None):
+    """cache.incr, создающий ключ при первом обращении."""
+    try:
+        return cache.incr(key, amount)
+    except ValueError:
+        if cache.add(key, amount, timeout):
+            return amount
+        return cache.incr(key, amount)
+
+
+class BufferedCounter:
+    """Приращения поля field модели model, сбрасываемые в базу пачками."""
+
+    def __init__(self, name, model, field, on_flush=None):
+        self.name = name
+        self.model = model
+        self.field = field
+        self.on_flush = on_flush
+
+    def key(self, *parts):
+        return ':'.join(('counters', self.name) + tuple(map(str, parts)))
+
+    def incr(self, pk, amount=1):
+        """
+        Только буферизует приращение (или вычитание при amount < 0);
+        в базу его пишет flush.
+        """
+        if not amount:
+            return
+        bucket = 'plus' if amount > 0 else 'minus'
+        cache_incr(self.key(bucket, pk), abs(amount), BUFFER_TIMEOUT)
+        seq = cache_incr(self.key('seq'))
+        cache.set(self.key('dirty', seq), pk, BUFFER_TIMEOUT)
+
+    def pending(self, pk):
+        """Приращение объекта, ещё не попавшее в базу."""
+        buckets = cache.get_many(
+            [self.key('plus', pk), self.key('minus', pk)]
+        )
+        return (
+            buckets.get(self.key('plus', pk), 0)
+            - buckets.get(self.key('minus', pk), 0)
+        )
+
+    def flush(self):
+        """
+        Переносит накопленные приращения в базу.
+
+        Возвращает словарь {pk: приращение}. Одновременно работает только
+        один сброс; остальные процессы сразу возвращают пустой словарь.
+        """
+        if not cache.add(self.key('lock'), 1, FLUSH_LOCK_TIMEOUT):
+            return {}
+        try:
+            flushed = self.flush_pending()
+        finally:
+            cache.delete(self.key('lock'))
+        if flushed and self.on_flush is not None:
+            self.on_flush(flushed)
+        return flushed
+
+    def flush_pending(self):
+        head = cache.get(self.key('seq'), 0)
+        done = cache.get(self.key('flushed'), 0)
+        if done > head:
+            # Кеш потерял счётчик событий и начал его заново.
+            done = 0
+        flushed = {}
+        # События прошлого сброса, которые получили номер, но ещё не
+        # успели записать dirty-ключ; второй раз их не ждём.
+        late = [seq for seq in cache.get(self.key('late'), []) if seq <= done]
+        missing = []
+        batches = [late] + [
+            range(start, min(start + FLUSH_BATCH_SIZE, head + 1))
+            for start in range(done + 1, head + 1, FLUSH_BATCH_SIZE)
+        ]
+        for seqs in batches:
+            dirty_keys = {self.key('dirty', seq): seq for seq in seqs}
+            dirty = cache.get_many(list(dirty_keys))
+            missing.extend(
+                seq for key, seq in dirty_keys.items()
+                if key not in dirty and seq > head - LATE_WINDOW
+                and seq not in late
+            )
+            deltas = self.write(set(dirty.values()))
+            cache.delete_many(list(dirty))
+            for pk, delta in deltas.items():
+                flushed[pk] = flushed.get(pk, 0) + delta
+        cache.set(self.key('late'), missing, BUFFER_TIMEOUT)
+        cache.set(self.key('flushed'), head, None)
+        return flushed
+
+    def write(self, pks):
+        """Записывает приращения объектов pks и вычитает их из буфера."""
+        bucket_keys = {
+            self.key(bucket, pk): (bucket, pk)
+            for pk in pks for bucket in ('plus', 'minus')
+        }
+        buckets = {
+            key: value
+            for key, value in cache.get_many(list(bucket_keys)).items()
+            if value
+        }
+        if not buckets:
+            return {}
+        deltas = {}
+        for key, value in buckets.items():
+            bucket, pk = bucket_keys[key]
+            deltas[pk] = deltas.get(pk, 0) + (
+                value if bucket == 'plus' else -value
+            )
+        objects = []
+        for pk, delta in deltas.items():
+            if delta:
+                obj = self.model(pk=pk)
+                setattr(obj, self.field, F(self.field) + delta)
+                objects.append(obj)
+        if objects:
+            with transaction.atomic():
+                self.model.objects.bulk_update(objects, [self.field])
+        # Вычитаем прочитанное, а не обнуляем: приращения, пришедшие во
+        # время записи, дождутся следующего сброса. Корзина с тех пор
+        # только росла, так что decr не уйдёт ниже нуля.
+        for key, value in buckets.items():
+            try:
+                cache.decr(key, value)
+            except ValueError:
+                pass
+        return {pk: delta for pk, delta in deltas.items() if delta}
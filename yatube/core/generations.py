@@ -0,0 +1,34 @@
+"""
+Поколения для инвалидации целых групп ключей кеша.
+
+Номер поколения входит в ключи кеша; чтобы устарели все ключи группы,
+достаточно увеличить номер (bump), не перебирая и не удаляя ключи. Если
+кеш потерял номер, новый берётся из часов и заведомо больше старого,
+поэтому старые записи не оживут.
+"""
+import time
+
+from django.core.cache import cache
+
+
+def key(name):
+    return f'generation:{name}'
+
+
+def initial():
+    return int(time.time() * 1000)
+
+
+def get(name):
+    generation = cache.get(key(name))
+    if generation is None:
+        cache.add(key(name), initial(), None)
+        generation = cache.get(key(name), initial())
+    return generation
+
+
+def bump(name):
+    try:
+        cache.incr(key(name))
+    except ValueError:
+        cache.add(key(name), initial(), None)
@@ -0,0 +1,117 @@
+"""
+Кеширование страниц с «дырками» под персональные фрагменты.
+
+Страница, обёрнутая cache_with_holes, рендерится один раз для всех: вместо
+фрагментов, помеченных в шаблоне тегом {% hole %}, в кеш попадает
+метка. На каждом запросе, в том числе из кеша, метки заменяются
+фрагментами, отрендеренными для текущего пользователя. Так шапка с именем
+пользователя не заставляет рендерить ленту заново для каждого.
+
+Те же фрагменты отдаёт core.views.fragment для подстановки на клиенте.
+"""
+import re
+from functools import wraps
+
+from django.conf import settings
+from django.core.cache import cache
+from django.http import HttpResponse
+from django.template.loader import render_to_string
+from django.utils.cache import patch_vary_headers
+
+from . import generations
+
+HOLE_RE = re.compile(r'<!--hole:([\w/.-]+)-->')
+# Ключ страницы включает поколение: bump('feed') сбрасывает все ленты.
+GENERATION = 'feed'
+# Число комментариев видно только в лентах, но не в карте сайта и RSS:
+# комментарии увеличивают только это поколение, оно тоже входит в ключ.
+COMMENTS_GENERATION = 'feed:comments'
+
+
+def placeholder(template_name):
+    return f'<!--hole:{template_name}-->'
+
+
+def fill_holes(content, request):
+    """Подставляет в content фрагменты, отрендеренные для request."""
+    fragments = {}
+
+    def render(match):
+        name = match.group(1)
+        if name not in fragments:
+            fragments[name] = render_to_string(name, request=request)
+        return fragments[name]
+
+    return HOLE_RE.sub(render, content)
+
+
+def fill_response(response, request):
+    """Заполняет метки в ответе, который не попадёт в кеш."""
+    charset = response.charset
+    if response.streaming:
+        response.streaming_content = (
+            fill_holes(chunk.decode(charset), request).encode(charset)
+            for chunk in response.streaming_content
+        )
+    else:
+        response.content = fill_holes(
+            response.content.decode(charset), request
+        )
+    return response
+
+
+def cacheable(response):
+    return (
+        response.status_code == 200
+        and not response.streaming
+        and not response.cookies
+        # Токен CSRF свой у каждого пользователя.
+        and b'csrfmiddlewaretoken' not in response.content
+    )
+
+
+def cache_with_holes(timeout=None, key_prefix='holes',
+                     generation=GENERATION):
+    """
+    Кеширует GET-ответы view на timeout секунд (по умолчанию
+    settings.HOLES_CACHE_TIMEOUT), кроме фрагментов. Ключ включает полный
+    путь с параметрами и поколение generation. При нулевом timeout
+    страница не кешируется, но фрагменты подставляются так же.
+    """
+    def decorator(view):
+        @wraps(view)
+        def wrapper(request, *args, **kwargs):
+            page_timeout = timeout
+            if page_timeout is None:
+                page_timeout = getattr(settings, 'HOLES_CACHE_TIMEOUT', 20)
+            if request.method not in ('GET', 'HEAD'):
+                return view(request, *args, **kwargs)
+            key = ':'.join((
+                key_prefix, str(generations.get(generation)),
+                str(generations.get(COMMENTS_GENERATION)),
+                request.get_full_path(),
+            ))
+            cached = cache.get(key) if page_timeout else None
+            if cached is not None:
+                content, content_type = cached
+            else:
+                request.punch_holes = True
+                try:
+                    response = view(request, *args, **kwargs)
+                finally:
+                    # Иначе страница ошибки (handler404 после Http404)
+                    # вышла бы с незаполненными дырами.
+                    request.punch_holes = False
+                if not page_timeout or not cacheable(response):
+                    return fill_response(response, request)
+                content = response.content.decode(response.charset)
+                content_type = response['Content-Type']
+                cache.set(key, (content, content_type), page_timeout)
+            response = HttpResponse(
+                fill_holes(content, request), content_type=content_type
+            )
+            # Фрагменты зависят от пользователя, а значит от сессии.
+            patch_vary_headers(response, ('Cookie',))
+            return response
+        return wrapper
+    return decorator
@@ -0,0 +1,356 @@
+"""
+Нагрузочный прогон: смешанный трафик Yatube против сервера в процессе.
+
+Команда manage.py loadtest создаёт временную базу-файл, заполняет её
+(seed), поднимает многопоточный WSGI-сервер на свободном порту и
+запускает виртуальных пользователей. Каждый выбирает сценарии по весам
+SCENARIOS и ходит на сервер через urllib с собственными cookie, как
+браузер: формы отправляются с токеном CSRF, картинки - multipart.
+
+Сервер работает в том же процессе, поэтому абсолютные цифры ниже, чем на
+gunicorn; прогон нужен для сравнения версий между собой (baseline).
+"""
+import json
+import random
+import re
+import threading
+import time
+import uuid
+from io import StringIO
+from http.cookiejar import CookieJar
+from urllib.error import HTTPError, URLError
+from urllib.parse import urlencode
+from urllib.request import HTTPCookieProcessor, Request, build_opener
+
+from django.contrib.auth import get_user_model
+from django.contrib.auth.hashers import make_password
+from django.core.management import call_command
+from django.core.servers.basehttp import ThreadedWSGIServer, WSGIRequestHandler
+from django.core.wsgi import get_wsgi_application
+from django.db import OperationalError
+from django.db.backends.signals import connection_created
+
+from posts.models import Comment, Group, Post
+
+User = get_user_model()
+
+PASSWORD = 'loadtest-Password-1'
+CSRF_RE = re.compile(r'name="csrfmiddlewaretoken" value="([^"]+)"')
+WRITE_SQL = ('INSERT', 'UPDATE', 'DELETE')
+# Показатели, по которым прогон сравнивается с сохранённым: имя и
+# направление, в котором значение ухудшается.
+COMPARED = (
+    ('throughput', -1),
+    ('p99', 1),
+    ('error_rate', 1),
+    ('write_p99', 1),
+)
+SMALL_GIF = (
+    b'GIF89a\x02\x00\x01\x00\x80\x00\x00\x00\x00\x00\xff\xff\xff!\xf9\x04'
+    b'\x00\x00\x00\x00\x00,\x00\x00\x00\x00\x02\x00\x01\x00\x00\x02\x02\x0c'
+    b'\n\x00;'
+)
+
+
+def seed(users, groups, posts, comments):
+    """Пользователи с одним паролем, группы, посты и комментарии."""
+    # Пароль хешируется один раз: сид не должен стоить минуты PBKDF2.
+    password = make_password(PASSWORD)
+    User.objects.bulk_create([
+        User(username=f'user{number}', password=password)
+        for number in range(users)
+    ])
+    Group.objects.bulk_create([
+        Group(title=f'Группа {number}', slug=f'group{number}',
+              description=f'Описание группы {number}')
+        for number in range(groups)
+    ])
+    authors = list(User.objects.values_list('pk', flat=True))
+    group_ids = list(Group.objects.values_list('pk', flat=True))
+    batch = []
+    for number in range(posts):
+        post = Post(
+            author_id=random.choice(authors),
+            group_id=random.choice(group_ids + [None]),
+            text=f'Пост {number}\n\n' + 'Текст нагрузочного поста. ' * 40,
+        )
+        post.render()
+        batch.append(post)
+    Post.objects.bulk_create(batch, batch_size=500)
+    post_ids = list(Post.objects.values_list('pk', flat=True))
+    batch = []
+    for number in range(comments):
+        comment = Comment(
+            post_id=random.choice(post_ids),
+            author_id=random.choice(authors),
+            text=f'Комментарий {number}',
+        )
+        comment.render()
+        batch.append(comment)
+    Comment.objects.bulk_create(batch, batch_size=500)
+    # В ленте групп нужны счётчики и последний пост (posts.group_stats),
+    # в лентах постов - число комментариев.
+    call_command('rebuild_group_stats', verbosity=0)
+    call_command('reconcile_comment_counts', stdout=StringIO())
+
+
+class QuietRequestHandler(WSGIRequestHandler):
+
+    def log_message(self, format, *args):
+        pass
+
+
+def start_server():
+    """Многопоточный WSGI-сервер на свободном порту; (сервер, адрес)."""
+    server = ThreadedWSGIServer(('127.0.0.1', 0), QuietRequestHandler)
+    server.set_app(get_wsgi_application())
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    host, port = server.server_address
+    return server, f'http://{host}:{port}'
+
+
+class WriteTimer:
+    """
+    Время пишущих SQL-запросов во всех потоках сервера.
+
+    SQLite пускает одного писателя: остальные ждут блокировку внутри
+    execute, поэтому хвост времени записей и ошибки 'database is locked'
+    показывают ожидание блокировок.
+    """
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.durations = []
+        self.locked = 0
+
+    def __call__(self, execute, sql, params, many, context):
+        if not sql.lstrip().upper().startswith(WRITE_SQL):
+            return execute(sql, params, many, context)
+        started = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        except OperationalError as error:
+            if 'locked' in str(error):
+                with self.lock:
+                    self.locked += 1
+            raise
+        finally:
+            with self.lock:
+                self.durations.append(time.perf_counter() - started)
+
+    def connection_created(self, sender, connection, **kwargs):
+        connection.execute_wrappers.append(self)
+
+    def install(self):
+        connection_created.connect(self.connection_created)
+
+    def uninstall(self):
+        connection_created.disconnect(self.connection_created)
+
+
+def multipart(fields, files):
+    """Тело multipart/form-data и его Content-Type."""
+    boundary = uuid.uuid4().hex
+    parts = []
+    for name, value in fields.items():
+        parts.append(
+            f'--{boundary}\r\nContent-Disposition: form-data; '
+            f'name="{name}"\r\n\r\n{value}\r\n'.encode()
+        )
+    for name, (filename, content, content_type) in files.items():
+        parts.append(
+            f'--{boundary}\r\nContent-Disposition: form-data; '
+            f'name="{name}"; filename="{filename}"\r\n'
+            f'Content-Type: {content_type}\r\n\r\n'.encode()
+            + content + b'\r\n'
+        )
+    parts.append(f'--{boundary}--\r\n'.encode())
+    return b''.join(parts), f'multipart/form-data; boundary={boundary}'
+
+
+class VirtualUser:
+    """Один посетитель: свои cookie, свой аккаунт, свои посты."""
+
+    def __init__(self, base_url, number, context, results):
+        self.base_url = base_url
+        self.username = f'user{number % context["users"]}'
+        self.context = context
+        self.results = results
+        self.opener = build_opener(HTTPCookieProcessor(CookieJar()))
+        self.logged_in = False
+        self.own_posts = []
+
+    def request(self, scenario, path, data=None, content_type=None):
+        """Запрос с замером; возвращает текст ответа или None при ошибке."""
+        if isinstance(data, dict):
+            data = urlencode(data).encode()
+            content_type = 'application/x-www-form-urlencoded'
+        request = Request(self.base_url + path, data=data)
+        if content_type:
+            request.add_header('Content-Type', content_type)
+        started = time.perf_counter()
+        status, body = None, None
+        try:
+            with self.opener.open(request, timeout=30) as response:
+                status, body = response.status, response.read()
+        except HTTPError as error:
+            status = error.code
+        except (URLError, OSError):
+            status = 0
+        self.results.append(
+            (scenario, time.perf_counter() - started, status)
+        )
+        if status != 200:
+            return None
+        return body.decode()
+
+    def form(self, scenario, path, data, files=None):
+        """Открывает форму и отправляет её с токеном CSRF."""
+        page = self.request(scenario, path)
+        token = page and CSRF_RE.search(page)
+        if not token:
+            return None
+        data = {**data, 'csrfmiddlewaretoken': token.group(1)}
+        if files:
+            body, content_type = multipart(data, files)
+            return self.request(scenario, path, body, content_type)
+        return self.request(scenario, path, data)
+
+    def random_post(self):
+        return random.randint(1, self.context['posts'])
+
+    def browse_feed(self):
+        for page in range(1, random.randint(2, 4)):
+            self.request('browse_feed', f'/?page={page}')
+
+    def read_group(self):
+        group = random.randrange(self.context['groups'])
+        self.request('read_group', f'/group/group{group}/')
+
+    def read_profile(self):
+        author = random.randrange(self.context['users'])
+        self.request('read_profile', f'/profile/user{author}/')
+
+    def read_post(self):
+        self.request('read_post', f'/posts/{self.random_post()}/')
+
+    def login(self):
+        self.logged_in = self.form('login', '/auth/login/', {
+            'username': self.username, 'password': PASSWORD,
+        }) is not None
+
+    def ensure_login(self):
+        if not self.logged_in:
+            self.login()
+        return self.logged_in
+
+    def create_post(self):
+        if not self.ensure_login():
+            return
+        page = self.form('create_post', '/create/', {
+            'text': f'Нагрузочный пост {uuid.uuid4().hex}',
+        }, files={'image': ('load.gif', SMALL_GIF, 'image/gif')})
+        if page is None:
+            return
+        own = re.findall(r'/posts/(\d+)/"', page)
+        if own:
+            self.own_posts.append(max(map(int, own)))
+
+    def comment_burst(self):
+        if not self.ensure_login():
+            return
+        post_id = self.random_post()
+        page = self.request('comment_burst', f'/posts/{post_id}/')
+        token = page and CSRF_RE.search(page)
+        if not token:
+            return
+        for number in range(3):
+            self.request('comment_burst', f'/posts/{post_id}/comment/', {
+                'text': f'Комментарий {number}',
+                'csrfmiddlewaretoken': token.group(1),
+            })
+
+    def edit_post(self):
+        if not self.own_posts:
+            return self.create_post()
+        post_id = random.choice(self.own_posts)
+        self.form('edit_post', f'/posts/{post_id}/edit/', {
+            'text': f'Исправленный пост {uuid.uuid4().hex}',
+        })
+
+    def run(self, deadline):
+        scenarios, weights = zip(*SCENARIOS)
+        while time.monotonic() < deadline:
+            getattr(self, random.choices(scenarios, weights)[0])()
+
+
+# Сценарии и их доли в трафике: в основном гости читают ленты.
+SCENARIOS = (
+    ('browse_feed', 40),
+    ('read_group', 15),
+    ('read_profile', 10),
+    ('read_post', 20),
+    ('login', 4),
+    ('create_post', 3),
+    ('comment_burst', 5),
+    ('edit_post', 3),
+)
+
+
+def percentile(values, fraction):
+    if not values:
+        return 0
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(len(ordered) * fraction))]
+
+
+def summarize(results, elapsed, writes):
+    """Итоги прогона: общие и по сценариям."""
+    durations = [duration for _, duration, _ in results]
+    errors = sum(1 for _, _, status in results if status != 200)
+    report = {
+        'requests': len(results),
+        'throughput': len(results) / elapsed if elapsed else 0,
+        'p50': percentile(durations, 0.5),
+        'p99': percentile(durations, 0.99),
+        'error_rate': errors / len(results) if results else 0,
+        'write_p99': percentile(writes.durations, 0.99),
+        'locked': writes.locked,
+        'scenarios': {},
+    }
+    for scenario, _ in SCENARIOS:
+        own = [item for item in results if item[0] == scenario]
+        report['scenarios'][scenario] = {
+            'requests': len(own),
+            'p99': percentile([duration for _, duration, _ in own], 0.99),
+            'errors': sum(1 for _, _, status in own if status != 200),
+        }
+    return report
+
+
+def compare(report, baseline, tolerance):
+    """
+    Строки сравнения с baseline и список показателей, ухудшившихся
+    больше чем на tolerance (доля).
+    """
+    lines, regressions = [], []
+    for name, worse in COMPARED:
+        old, new = baseline.get(name, 0), report[name]
+        if old:
+            change = (new - old) / old
+        else:
+            change = float('inf') if new > old else 0
+        lines.append(f'{name:<12}{old:>12.4f}{new:>12.4f}{change:>+10.1%}')
+        if change * worse > tolerance:
+            regressions.append(name)
+    return lines, regressions
+
+
+def load_baseline(path):
+    with open(path) as source:
+        return json.load(source)
+
+
+def save_baseline(path, report):
+    with open(path, 'w') as target:
+        json.dump(report, target, indent=2, ensure_ascii=False)
@@ -0,0 +1,96 @@
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.core.management.base import BaseCommand
+from django.test import Client, override_settings
+
+from core.bench import captured_get, scratch_database
+
+User = get_user_model()
+
+SCENARIOS = (
+    ('db + ModelBackend', {
+        'SESSION_ENGINE': 'django.contrib.sessions.backends.db',
+        'AUTHENTICATION_BACKENDS': [
+            'django.contrib.auth.backends.ModelBackend'
+        ],
+    }),
+    ('core.sessions + CachedModelBackend', {
+        'SESSION_ENGINE': 'core.sessions',
+        'AUTHENTICATION_BACKENDS': ['users.backends.CachedModelBackend'],
+    }),
+)
+
+STALE_SESSION_KEY = 'x' * 32
+
+
+class Command(BaseCommand):
+    help = (
+        'Сравнивает число запросов к базе на просмотр главной страницы '
+        'для разных движков сессий и бэкендов аутентификации.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--requests', type=int, default=20,
+            help='Сколько просмотров усреднять в каждом сценарии.'
+        )
+        parser.add_argument(
+            '--url', default='/about/author/',
+            help='Страница для замера; по умолчанию без запросов за '
+                 'контентом, чтобы в счёт шли только сессия и пользователь.'
+        )
+
+    def handle(self, *args, **options):
+        with scratch_database(), override_settings(
+            ALLOWED_HOSTS=['testserver']
+        ):
+            user = User.objects.create_user(username='bench')
+            results = [
+                (label, self.measure(user, overrides, options))
+                for label, overrides in SCENARIOS
+            ]
+
+        self.stdout.write(
+            f'{"сценарий":<36}{"гость":>8}{"старая cookie":>15}'
+            f'{"пользователь":>14}'
+        )
+        for label, counts in results:
+            self.stdout.write(
+                f'{label:<36}' + ''.join(
+                    f'{count:>{width}.2f}'
+                    for count, width in zip(counts, (8, 15, 14))
+                )
+            )
+        saved = ', '.join(
+            f'{before - after:.2f}'
+            for before, after in zip(results[0][1], results[-1][1])
+        )
+        self.stdout.write(self.style.SUCCESS(
+            f'Экономия запросов к базе на просмотр {options["url"]}: {saved}'
+        ))
+
+    def measure(self, user, overrides, options):
+        """Среднее число запросов для гостя, старой cookie и пользователя."""
+        url, requests = options['url'], options['requests']
+        with override_settings(**overrides):
+            cache.clear()
+            authenticated = Client()
+            authenticated.force_login(user)
+            return (
+                self.average(Client(), url, requests),
+                self.average(Client(), url, requests, STALE_SESSION_KEY),
+                self.average(authenticated, url, requests),
+            )
+
+    def average(self, client, url, requests, session_cookie=None):
+        total = 0
+        # Первый запрос прогревает кеши и в замер не входит.
+        for number in range(requests + 1):
+            if session_cookie:
+                # Django удаляет битую cookie, а бот присылает её снова.
+                client.cookies[settings.SESSION_COOKIE_NAME] = session_cookie
+            _, queries = captured_get(client, url)
+            if number:
+                total += len(queries)
+        return total / requests
@@ -0,0 +1,61 @@
+import os
+
+from django.contrib.staticfiles import finders
+from django.contrib.staticfiles.storage import (
+    ManifestFilesMixin, staticfiles_storage,
+)
+from django.core.management import call_command
+from django.core.management.base import BaseCommand, CommandError
+
+from core.staticfiles import COMPRESS_EXTENSIONS
+
+
+def file_size(path):
+    return os.path.getsize(path) if os.path.exists(path) else None
+
+
+class Command(BaseCommand):
+    help = (
+        'Собирает статику для боевого сервера: чистит неиспользуемые '
+        'CSS-селекторы, добавляет хеш к именам, пишет .gz и .br копии.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--clear', action='store_true',
+            help='Удалить ранее собранные файлы перед сборкой.'
+        )
+
+    def handle(self, *args, **options):
+        if not isinstance(staticfiles_storage, ManifestFilesMixin):
+            raise CommandError(
+                'STATICFILES_STORAGE не добавляет хеш к именам, '
+                'запустите сборку с YATUBE_ENV=prod.'
+            )
+        call_command(
+            'collectstatic', interactive=False, clear=options['clear'],
+            verbosity=options['verbosity'],
+        )
+        self.report(staticfiles_storage)
+
+    def report(self, storage):
+        self.stdout.write(
+            f'{"файл":<50}{"исходный":>10}{"итог":>10}{"gzip":>10}{"br":>10}'
+        )
+        for name, hashed_name in sorted(storage.hashed_files.items()):
+            if not name.endswith(COMPRESS_EXTENSIONS):
+                continue
+            path = storage.path(hashed_name)
+            sizes = (
+                self.source_size(name),
+                file_size(path),
+                file_size(path + '.gz'),
+                file_size(path + '.br'),
+            )
+            self.stdout.write(f'{hashed_name:<50}' + ''.join(
+                f'{"-" if size is None else size:>10}' for size in sizes
+            ))
+
+    def source_size(self, name):
+        path = finders.find(name)
+        return file_size(path) if path else None
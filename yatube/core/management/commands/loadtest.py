@@ -0,0 +1,150 @@
+import os
+import shutil
+import tempfile
+import threading
+import time
+
+from django.conf import settings
+from django.core.cache import cache
+from django.core.management.base import BaseCommand, CommandError
+from django.test import override_settings
+
+from core import loadtest
+from core.bench import scratch_database
+
+
+class Command(BaseCommand):
+    help = (
+        'Нагрузочный прогон: заполняет временную базу, поднимает сервер в '
+        'процессе и гоняет смешанный трафик (ленты, вход, посты с '
+        'картинками, комментарии, правки). Печатает пропускную '
+        'способность, p99, долю ошибок и ожидание блокировок базы; '
+        'сравнивает с сохранённым прогоном.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--users', type=int, default=8,
+            help='Одновременных виртуальных пользователей.'
+        )
+        parser.add_argument(
+            '--duration', type=float, default=30,
+            help='Длительность прогона в секундах.'
+        )
+        parser.add_argument('--seed-users', type=int, default=50)
+        parser.add_argument('--seed-groups', type=int, default=10)
+        parser.add_argument('--seed-posts', type=int, default=2000)
+        parser.add_argument('--seed-comments', type=int, default=5000)
+        parser.add_argument(
+            '--save-baseline', metavar='PATH',
+            help='Сохранить итоги прогона в JSON.'
+        )
+        parser.add_argument(
+            '--baseline', metavar='PATH',
+            help='Сравнить с сохранённым прогоном; ухудшение больше '
+                 '--tolerance завершает команду с ошибкой.'
+        )
+        parser.add_argument(
+            '--tolerance', type=float, default=0.1,
+            help='Допустимое ухудшение показателя, доля (0.1 = 10%%).'
+        )
+
+    def handle(self, *args, **options):
+        workdir = tempfile.mkdtemp(prefix='yatube-loadtest-')
+        writes = loadtest.WriteTimer()
+        try:
+            with scratch_database(
+                name=os.path.join(workdir, 'db.sqlite3')
+            ), override_settings(
+                ALLOWED_HOSTS=['127.0.0.1'],
+                DEBUG=False,
+                MEDIA_ROOT=os.path.join(workdir, 'media'),
+                # Ограничения частоты на одном IP съели бы весь трафик.
+                RATELIMITS={
+                    scope: None
+                    for scope in getattr(settings, 'RATELIMITS', {})
+                },
+            ):
+                cache.clear()
+                started = time.monotonic()
+                loadtest.seed(
+                    options['seed_users'], options['seed_groups'],
+                    options['seed_posts'], options['seed_comments'],
+                )
+                self.stdout.write(
+                    f'База заполнена за {time.monotonic() - started:.1f} с'
+                )
+                report = self.run(options, writes)
+        finally:
+            shutil.rmtree(workdir, ignore_errors=True)
+
+        self.print_report(report)
+        if options['save_baseline']:
+            loadtest.save_baseline(options['save_baseline'], report)
+            self.stdout.write(f'Итоги сохранены в {options["save_baseline"]}')
+        if options['baseline']:
+            self.check_baseline(report, options)
+
+    def run(self, options, writes):
+        context = {
+            'users': options['seed_users'],
+            'groups': options['seed_groups'],
+            'posts': options['seed_posts'],
+        }
+        server, base_url = loadtest.start_server()
+        writes.install()
+        results = []
+        try:
+            started = time.monotonic()
+            deadline = started + options['duration']
+            threads = [
+                threading.Thread(target=loadtest.VirtualUser(
+                    base_url, number, context, results
+                ).run, args=(deadline,))
+                for number in range(options['users'])
+            ]
+            for thread in threads:
+                thread.start()
+            for thread in threads:
+                thread.join()
+            elapsed = time.monotonic() - started
+        finally:
+            writes.uninstall()
+            server.shutdown()
+            server.server_close()
+        return loadtest.summarize(results, elapsed, writes)
+
+    def print_report(self, report):
+        self.stdout.write(f'{"сценарий":<16}{"запросов":>10}{"p99, мс":>10}'
+                          f'{"ошибок":>8}')
+        for scenario, stats in report['scenarios'].items():
+            self.stdout.write(
+                f'{scenario:<16}{stats["requests"]:>10}'
+                f'{stats["p99"] * 1000:>10.1f}{stats["errors"]:>8}'
+            )
+        self.stdout.write(
+            f'Всего {report["requests"]} запросов, '
+            f'{report["throughput"]:.1f} в секунду; '
+            f'p50 {report["p50"] * 1000:.1f} мс, '
+            f'p99 {report["p99"] * 1000:.1f} мс; '
+            f'ошибок {report["error_rate"]:.2%}'
+        )
+        self.stdout.write(
+            f'Записи в базу: p99 {report["write_p99"] * 1000:.1f} мс, '
+            f'"database is locked": {report["locked"]}'
+        )
+
+    def check_baseline(self, report, options):
+        lines, regressions = loadtest.compare(
+            report, loadtest.load_baseline(options['baseline']),
+            options['tolerance'],
+        )
+        self.stdout.write(f'{"показатель":<12}{"было":>12}{"стало":>12}'
+                          f'{"":>10}')
+        for line in lines:
+            self.stdout.write(line)
+        if regressions:
+            raise CommandError(
+                'Хуже сохранённого прогона: ' + ', '.join(regressions)
+            )
+        self.stdout.write(self.style.SUCCESS('Не хуже сохранённого прогона'))
@@ -0,0 +1,27 @@
+"""
+Файлы кладутся в PRERENDER_ROOT по адресу страницы: /about/author/ ->
+about/author/index.html. Фронтенд-сервер может отдавать их гостям сам,
+пока у клиента нет cookie сессии; иначе их отдаёт
+core.middleware.PrerenderedPagesMiddleware.
+"""
+import os
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+
+from core import prerender
+
+
+class Command(BaseCommand):
+    help = (
+        'Рендерит в HTML страницы из PRERENDER_PAGES и страницы ошибок. '
+        'Запускается при деплое после build_static: шаблоны этих страниц '
+        'меняются только вместе с кодом.'
+    )
+
+    def handle(self, *args, **options):
+        for path in prerender.prerender_all():
+            self.stdout.write(
+                f'{os.path.relpath(path, settings.PRERENDER_ROOT):<40}'
+                f'{os.path.getsize(path):>10}'
+            )
@@ -0,0 +1,128 @@
+import os
+import statistics
+import subprocess
+import sys
+
+from django.apps import apps
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+
+
+def parse_importtime(stderr):
+    """Строки -X importtime: {модуль: (собственное, накопленное) в мкс}."""
+    modules = {}
+    for line in stderr.splitlines():
+        if not line.startswith('import time:'):
+            continue
+        fields = line[len('import time:'):].split('|')
+        if len(fields) != 3 or not fields[0].strip().isdigit():
+            continue
+        modules[fields[2].strip()] = (int(fields[0]), int(fields[1]))
+    return modules
+
+
+def owner(module, app_modules):
+    """Приложение из INSTALLED_APPS, которому принадлежит модуль."""
+    for app_module in app_modules:
+        if module == app_module or module.startswith(f'{app_module}.'):
+            return app_module
+    return module.split('.')[0]
+
+
+class Command(BaseCommand):
+    help = (
+        'Замеряет холодный старт воркера: время импорта по модулям и '
+        'приложениям (python -X importtime) и полное время загрузки '
+        'WSGI-приложения в отдельном процессе.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--top', type=int, default=15,
+            help='Сколько самых медленных модулей и приложений показать.'
+        )
+        parser.add_argument(
+            '--repeat', type=int, default=5,
+            help='Сколько раз замерить холодный старт.'
+        )
+        parser.add_argument(
+            '--url', default='/about/author/',
+            help='Первый запрос после старта; по умолчанию страница без '
+                 'запросов к базе.'
+        )
+
+    def boot(self, url, *python_options):
+        """
+        Запускает новый процесс: импорт WSGI-модуля и первый запрос к url.
+
+        Возвращает (время загрузки, время первого запроса, stderr).
+        """
+        module = settings.WSGI_APPLICATION.rpartition('.')[0]
+        hosts = [host for host in settings.ALLOWED_HOSTS if host != '*']
+        host = hosts[0].lstrip('.') if hosts else 'testserver'
+        script = '\n'.join((
+            'import time',
+            'start = time.perf_counter()',
+            f'import {module}',
+            'booted = time.perf_counter()',
+            'from django.test import Client',
+            'client = Client()',
+            'requested = time.perf_counter()',
+            f'client.get({url!r}, HTTP_HOST={host!r})',
+            'print(booted - start, time.perf_counter() - requested)',
+        ))
+        env = dict(os.environ, PYTHONPATH=os.pathsep.join(
+            filter(None, [settings.BASE_DIR, os.environ.get('PYTHONPATH')])
+        ))
+        result = subprocess.run(
+            [sys.executable, *python_options, '-c', script],
+            cwd=settings.BASE_DIR, env=env,
+            stdout=subprocess.PIPE, stderr=subprocess.PIPE,
+            universal_newlines=True,
+        )
+        if result.returncode:
+            raise CommandError(result.stderr[-2000:])
+        booted, first_request = map(float, result.stdout.split()[-2:])
+        return booted, first_request, result.stderr
+
+    def handle(self, *args, **options):
+        top = options['top']
+        url = options['url']
+        _, _, stderr = self.boot(url, '-X', 'importtime')
+        modules = parse_importtime(stderr)
+        total = sum(own for own, _ in modules.values())
+
+        app_modules = sorted(
+            (config.name for config in apps.get_app_configs()),
+            key=len, reverse=True,
+        )
+        by_app = {}
+        for module, (own, _) in modules.items():
+            app = owner(module, app_modules)
+            by_app[app] = by_app.get(app, 0) + own
+
+        self.stdout.write(
+            f'Импортировано модулей: {len(modules)}, '
+            f'время импорта: {total / 1000:.1f} мс'
+        )
+        self.stdout.write('\nПо приложениям и пакетам (собственное время):')
+        slowest_apps = sorted(by_app.items(), key=lambda item: -item[1])
+        for app, own in slowest_apps[:top]:
+            self.stdout.write(f'  {own / 1000:8.1f} мс  {app}')
+        self.stdout.write('\nМодули (накопленное время):')
+        for module, (_, cumulative) in sorted(
+            modules.items(), key=lambda item: -item[1][1]
+        )[:top]:
+            self.stdout.write(f'  {cumulative / 1000:8.1f} мс  {module}')
+
+        runs = [self.boot(url) for _ in range(options['repeat'])]
+        boot_times = [run[0] for run in runs]
+        first_request_times = [run[1] for run in runs]
+        for title, timings in (
+            (f'Загрузка {settings.WSGI_APPLICATION}', boot_times),
+            (f'Первый запрос {url}', first_request_times),
+        ):
+            self.stdout.write(self.style.SUCCESS(
+                f'{title}: медиана {statistics.median(timings) * 1000:.0f} '
+                f'мс, минимум {min(timings) * 1000:.0f} мс'
+            ))
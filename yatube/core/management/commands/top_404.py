@@ -0,0 +1,44 @@
+from datetime import timedelta
+
+from django.core.management.base import BaseCommand
+from django.utils import timezone
+
+from core import not_found
+from core.models import NotFoundPath
+
+
+class Command(BaseCommand):
+    help = (
+        'Показывает адреса, чаще всего отвечающие 404: кандидатов на '
+        'редирект, robots.txt или блокировку на фронтенд-сервере.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--limit', type=int, default=20,
+            help='Сколько адресов показать.'
+        )
+        parser.add_argument(
+            '--reset', action='store_true',
+            help='После вывода обнулить статистику.'
+        )
+        parser.add_argument(
+            '--prune', type=int, metavar='DAYS',
+            help='Удалить адреса, не отвечавшие 404 последние DAYS дней.'
+        )
+
+    def handle(self, *args, **options):
+        not_found.hits.flush()
+        if options['prune'] is not None:
+            cutoff = timezone.now() - timedelta(days=options['prune'])
+            pruned, _ = NotFoundPath.objects.filter(
+                last_seen__lt=cutoff
+            ).delete()
+            self.stdout.write(f'Удалено устаревших адресов: {pruned}')
+        for entry in NotFoundPath.objects.all()[:options['limit']]:
+            self.stdout.write(f'{entry.hits:>10} {entry.path}')
+        if options['reset']:
+            deleted, _ = NotFoundPath.objects.all().delete()
+            self.stdout.write(self.style.SUCCESS(
+                f'Статистика обнулена: удалено адресов {deleted}'
+            ))
@@ -0,0 +1,346 @@
+"""
+Метрики запросов, базы и кеша в формате Prometheus.
+
+Каждый процесс копит счётчики и гистограммы в памяти (registry): запись
+стоит одной операции со словарём под блокировкой. Раз в
+METRICS_DUMP_INTERVAL секунд процесс сбрасывает свои значения в файл
+<pid>.json в каталоге METRICS_DIR, а /metrics (core.views.metrics)
+складывает файлы всех воркеров. Значения накопительные: когда воркер
+завершается (max_requests), мастер gunicorn прибавляет его файл к общему
+aggregate.json и удаляет (merge_worker), так что файлов не больше, чем
+живых воркеров. Каталог очищается при старте gunicorn (см.
+gunicorn.conf.py). Без METRICS_DIR /metrics показывает только процесс,
+который ответил.
+
+Что собирается:
+    yatube_requests_total{view,method,status}
+    yatube_request_duration_seconds{view}      - гистограмма
+    yatube_db_queries_total{view}, yatube_db_query_seconds_total{view}
+    yatube_cache_operations_total{operation,result}
+    yatube_cache_seconds_total{operation}
+"""
+import json
+import os
+import threading
+import time
+from bisect import bisect_left
+
+from django.conf import settings
+from django.core.cache.backends.base import BaseCache
+from django.core.cache.backends.locmem import LocMemCache
+from django.core.cache.backends.memcached import MemcachedCache
+
+BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10)
+
+# Сумма завершившихся воркеров.
+AGGREGATE = 'aggregate.json'
+
+# Методы, которые идут в метки как есть; остальные (их присылают боты)
+# сводятся в 'other', чтобы не плодить ряды.
+METHODS = ('GET', 'HEAD', 'POST', 'PUT', 'PATCH', 'DELETE', 'OPTIONS')
+
+METRICS = {
+    'yatube_requests_total': (
+        'counter', 'Ответы по view, методу и статусу.'),
+    'yatube_request_duration_seconds': (
+        'histogram', 'Время ответа по view.'),
+    'yatube_db_queries_total': (
+        'counter', 'SQL-запросы по view.'),
+    'yatube_db_query_seconds_total': (
+        'counter', 'Время SQL-запросов по view.'),
+    'yatube_cache_operations_total': (
+        'counter', 'Операции с кешем; у get - попадание или промах.'),
+    'yatube_cache_seconds_total': (
+        'counter', 'Время операций с кешем.'),
+}
+
+
+class Registry:
+    """Значения метрик одного процесса."""
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.counters = {}
+        self.histograms = {}
+        self.dumped = 0
+
+    def inc(self, name, labels, amount=1):
+        key = (name, labels)
+        with self.lock:
+            self.counters[key] = self.counters.get(key, 0) + amount
+
+    def observe(self, name, labels, value):
+        key = (name, labels)
+        with self.lock:
+            histogram = self.histograms.get(key)
+            if histogram is None:
+                # Счётчики корзин, сумма и число наблюдений.
+                histogram = self.histograms[key] = [0] * (len(BUCKETS) + 3)
+            histogram[bisect_left(BUCKETS, value)] += 1
+            histogram[-2] += value
+            histogram[-1] += 1
+
+    def snapshot(self):
+        with self.lock:
+            return {
+                'counters': [
+                    [name, list(labels), value]
+                    for (name, labels), value in self.counters.items()
+                ],
+                'histograms': [
+                    [name, list(labels), list(values)]
+                    for (name, labels), values in self.histograms.items()
+                ],
+            }
+
+    def dump(self, force=False):
+        """Пишет значения процесса в METRICS_DIR не чаще интервала."""
+        directory = getattr(settings, 'METRICS_DIR', None)
+        now = time.monotonic()
+        if not directory or not force and now - self.dumped < getattr(
+            settings, 'METRICS_DUMP_INTERVAL', 1
+        ):
+            return
+        self.dumped = now
+        os.makedirs(directory, exist_ok=True)
+        write_snapshot(
+            os.path.join(directory, f'{os.getpid()}.json'), self.snapshot()
+        )
+
+
+registry = Registry()
+
+
+def read_snapshot(path):
+    try:
+        with open(path) as source:
+            return json.load(source)
+    except (OSError, ValueError):
+        # Файл удалили или дописывают прямо сейчас.
+        return None
+
+
+def write_snapshot(path, snapshot):
+    with open(f'{path}.tmp', 'w') as target:
+        json.dump(snapshot, target)
+    os.replace(f'{path}.tmp', path)
+
+
+def total(snapshots):
+    """Сумма снимков: словари counters и histograms по (имя, метки)."""
+    counters, histograms = {}, {}
+    for snapshot in snapshots:
+        for name, labels, value in snapshot['counters']:
+            key = (name, tuple(map(tuple, labels)))
+            counters[key] = counters.get(key, 0) + value
+        for name, labels, values in snapshot['histograms']:
+            key = (name, tuple(map(tuple, labels)))
+            summed = histograms.setdefault(key, [0] * len(values))
+            for index, value in enumerate(values):
+                summed[index] += value
+    return counters, histograms
+
+
+def collect():
+    """Сумма значений всех процессов: из файлов и из текущего."""
+    snapshots = [registry.snapshot()]
+    directory = getattr(settings, 'METRICS_DIR', None)
+    if directory and os.path.isdir(directory):
+        aggregate = read_snapshot(os.path.join(directory, AGGREGATE))
+        # Файлы воркеров, уже вошедших в сумму, но ещё не удалённых.
+        skip = {f'{os.getpid()}.json', AGGREGATE}
+        if aggregate is not None:
+            snapshots.append(aggregate)
+            skip.update(f'{pid}.json' for pid in aggregate['merged'])
+        for filename in os.listdir(directory):
+            if not filename.endswith('.json') or filename in skip:
+                continue
+            snapshot = read_snapshot(os.path.join(directory, filename))
+            if snapshot is not None:
+                snapshots.append(snapshot)
+    return total(snapshots)
+
+
+def merge_worker(pid):
+    """
+    Прибавляет файл завершившегося воркера pid к aggregate.json и удаляет
+    его. Вызывается мастером gunicorn (child_exit), по одному воркеру за
+    раз. Пока файл не удалён, pid записан в merged, и collect не считает
+    его дважды.
+    """
+    directory = getattr(settings, 'METRICS_DIR', None)
+    if not directory:
+        return
+    path = os.path.join(directory, f'{pid}.json')
+    snapshot = read_snapshot(path)
+    if snapshot is None:
+        return
+    aggregate_path = os.path.join(directory, AGGREGATE)
+    aggregate = read_snapshot(aggregate_path) or {
+        'counters': [], 'histograms': [], 'merged': [],
+    }
+    counters, histograms = total([aggregate, snapshot])
+    merged = [
+        merged_pid for merged_pid in aggregate['merged']
+        if os.path.exists(os.path.join(directory, f'{merged_pid}.json'))
+    ]
+    write_snapshot(aggregate_path, {
+        'counters': [
+            [name, list(labels), value]
+            for (name, labels), value in counters.items()
+        ],
+        'histograms': [
+            [name, list(labels), values]
+            for (name, labels), values in histograms.items()
+        ],
+        'merged': merged + [pid],
+    })
+    os.remove(path)
+
+
+def format_labels(labels, **extra):
+    pairs = [*labels, *extra.items()]
+    if not pairs:
+        return ''
+    return '{%s}' % ','.join(
+        '{}="{}"'.format(
+            name,
+            str(value).replace('\\', '\\\\').replace('"', '\\"')
+            .replace('\n', '\\n'),
+        )
+        for name, value in pairs
+    )
+
+
+def exposition():
+    """Текст для Prometheus (text format 0.0.4)."""
+    counters, histograms = collect()
+    lines = []
+    for name, (kind, help_text) in METRICS.items():
+        lines += [f'# HELP {name} {help_text}', f'# TYPE {name} {kind}']
+        for (metric, labels), value in sorted(counters.items()):
+            if metric == name:
+                lines.append(f'{name}{format_labels(labels)} {value}')
+        for (metric, labels), values in sorted(histograms.items()):
+            if metric != name:
+                continue
+            cumulative = 0
+            for bound, count in zip((*BUCKETS, '+Inf'), values):
+                cumulative += count
+                lines.append(
+                    f'{name}_bucket{format_labels(labels, le=bound)} '
+                    f'{cumulative}'
+                )
+            lines.append(f'{name}_sum{format_labels(labels)} {values[-2]}')
+            lines.append(f'{name}_count{format_labels(labels)} {values[-1]}')
+    return '\n'.join(lines) + '\n'
+
+
+class CacheMetricsMixin:
+    """Считает операции бэкенда кеша, а у get - попадания и промахи."""
+
+    def _timed(self, operation, call, *args, **kwargs):
+        started = time.perf_counter()
+        try:
+            return call(*args, **kwargs)
+        finally:
+            registry.inc(
+                'yatube_cache_seconds_total', (('operation', operation),),
+                time.perf_counter() - started,
+            )
+
+    def _count(self, operation, result, amount=1):
+        registry.inc(
+            'yatube_cache_operations_total',
+            (('operation', operation), ('result', result)), amount,
+        )
+
+    def get(self, key, default=None, version=None):
+        missing = object()
+        value = self._timed('get', super().get, key, missing, version)
+        if value is missing:
+            self._count('get', 'miss')
+            return default
+        self._count('get', 'hit')
+        return value
+
+    def get_many(self, keys, version=None):
+        keys = list(keys)
+        values = self._timed('get_many', super().get_many, keys, version)
+        # BaseCache.get_many сам вызывает get, и ключи уже посчитаны.
+        if super().get_many.__func__ is not BaseCache.get_many:
+            self._count('get', 'hit', len(values))
+            self._count('get', 'miss', len(keys) - len(values))
+        return values
+
+    def set(self, *args, **kwargs):
+        self._count('set', 'ok')
+        return self._timed('set', super().set, *args, **kwargs)
+
+    def add(self, *args, **kwargs):
+        added = self._timed('add', super().add, *args, **kwargs)
+        self._count('add', 'ok' if added else 'exists')
+        return added
+
+    def incr(self, *args, **kwargs):
+        self._count('incr', 'ok')
+        return self._timed('incr', super().incr, *args, **kwargs)
+
+    def delete(self, *args, **kwargs):
+        self._count('delete', 'ok')
+        return self._timed('delete', super().delete, *args, **kwargs)
+
+
+class InstrumentedLocMemCache(CacheMetricsMixin, LocMemCache):
+    pass
+
+
+class InstrumentedMemcachedCache(CacheMetricsMixin, MemcachedCache):
+    pass
+
+
+class QueryTimer:
+    """Обёртка connection.execute_wrapper: время SQL-запросов запроса."""
+
+    def __init__(self):
+        self.queries = 0
+        self.seconds = 0
+
+    def __call__(self, execute, sql, params, many, context):
+        started = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            self.queries += 1
+            self.seconds += time.perf_counter() - started
+
+
+def view_label(request):
+    """
+    Имя view из METRICS_NAMESPACES ('posts:index'); остальные адреса
+    (админка, статика, 404) сводятся в 'other', чтобы число рядов
+    метрик не зависело от адресов, которые придумают боты.
+    """
+    match = getattr(request, 'resolver_match', None)
+    if match is not None and match.namespace in getattr(
+        settings, 'METRICS_NAMESPACES', ()
+    ):
+        return match.view_name
+    return 'other'
+
+
+def record_request(request, response, seconds, timer):
+    view = view_label(request)
+    method = request.method if request.method in METHODS else 'other'
+    registry.inc('yatube_requests_total', (
+        ('view', view), ('method', method),
+        ('status', str(response.status_code)),
+    ))
+    registry.observe(
+        'yatube_request_duration_seconds', (('view', view),), seconds
+    )
+    registry.inc('yatube_db_queries_total', (('view', view),), timer.queries)
+    registry.inc(
+        'yatube_db_query_seconds_total', (('view', view),), timer.seconds
+    )
+    registry.dump()
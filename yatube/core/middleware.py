@@ -0,0 +1,198 @@
+import json
+import mimetypes
+import os
+import time
+from contextlib import ExitStack
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import connections
+from django.http import (
+    FileResponse, HttpResponseNotFound, HttpResponseNotModified,
+)
+from django.utils.cache import patch_vary_headers
+from django.utils.http import http_date
+from django.views.static import was_modified_since
+
+from . import metrics, not_found, prerender
+
+IMMUTABLE_CACHE_CONTROL = 'public, max-age=31536000, immutable'
+DEFAULT_CACHE_CONTROL = 'public, max-age=60'
+ENCODINGS = (('br', '.br'), ('gzip', '.gz'))
+
+
+class StaticFilesMiddleware:
+    """
+    Раздаёт собранную collectstatic статику до сессий и аутентификации.
+
+    Файлы с хешем в имени отдаются с вечным кешем, поэтому повторный визит
+    не делает ни одного запроса за статикой. Если рядом лежат .br или .gz
+    копии и клиент их принимает, отдаётся сжатая версия.
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        self.prefix = settings.STATIC_URL
+        self.root = settings.STATIC_ROOT
+        self.files = self.scan()
+        self.immutable = self.hashed_names()
+
+    def scan(self):
+        """Индекс файлов строится один раз на процесс, без stat на запрос."""
+        files = {}
+        if not self.root or not os.path.isdir(self.root):
+            return files
+        for root, _, filenames in os.walk(self.root):
+            for filename in filenames:
+                path = os.path.join(root, filename)
+                name = os.path.relpath(path, self.root).replace(os.sep, '/')
+                if name.endswith(tuple(suffix for _, suffix in ENCODINGS)):
+                    continue
+                files[name] = (path, os.stat(path).st_mtime, {
+                    encoding: path + suffix
+                    for encoding, suffix in ENCODINGS
+                    if os.path.exists(path + suffix)
+                })
+        return files
+
+    def hashed_names(self):
+        manifest = os.path.join(self.root or '', 'staticfiles.json')
+        if not os.path.exists(manifest):
+            return set()
+        with open(manifest) as manifest_file:
+            return set(json.load(manifest_file)['paths'].values())
+
+    def __call__(self, request):
+        if (
+            request.method in ('GET', 'HEAD')
+            and request.path_info.startswith(self.prefix)
+        ):
+            name = request.path_info[len(self.prefix):]
+            if name in self.files:
+                return self.serve(request, name)
+        return self.get_response(request)
+
+    def serve(self, request, name):
+        path, mtime, variants = self.files[name]
+        if not was_modified_since(
+            request.META.get('HTTP_IF_MODIFIED_SINCE'), mtime
+        ):
+            return HttpResponseNotModified()
+
+        accepted = request.META.get('HTTP_ACCEPT_ENCODING', '')
+        encoding = next(
+            (encoding for encoding, _ in ENCODINGS
+             if encoding in variants and encoding in accepted),
+            None,
+        )
+        response = FileResponse(
+            open(variants[encoding] if encoding else path, 'rb')
+        )
+        # FileResponse угадывает text/html заново по имени файла, а для
+        # .gz-копии - application/gzip.
+        response['Content-Type'] = self.content_type(name)
+        if encoding:
+            response['Content-Encoding'] = encoding
+        if variants:
+            response['Vary'] = 'Accept-Encoding'
+        response['Last-Modified'] = http_date(mtime)
+        response['Cache-Control'] = self.cache_control(name)
+        return response
+
+    def content_type(self, name):
+        return mimetypes.guess_type(name)[0] or 'application/octet-stream'
+
+    def cache_control(self, name):
+        if name in self.immutable:
+            return IMMUTABLE_CACHE_CONTROL
+        return DEFAULT_CACHE_CONTROL
+
+
+class PrerenderedPagesMiddleware(StaticFilesMiddleware):
+    """
+    Отдаёт страницы, заранее отрендеренные командой prerender, до сессий,
+    аутентификации и шаблонов.
+
+    Страницы отрендерены для гостя, поэтому пользователь с cookie сессии
+    проходит дальше к обычному view и видит свою шапку.
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        self.root = settings.PRERENDER_ROOT
+        self.files = self.scan()
+        self.immutable = set()
+
+    def __call__(self, request):
+        if (
+            request.method in ('GET', 'HEAD')
+            and settings.SESSION_COOKIE_NAME not in request.COOKIES
+        ):
+            name = prerender.page_name(request.path_info)
+            if name in self.files:
+                response = self.serve(request, name)
+                patch_vary_headers(response, ('Cookie',))
+                return response
+        return self.get_response(request)
+
+    def content_type(self, name):
+        return f'{super().content_type(name)}; charset=utf-8'
+
+    def cache_control(self, name):
+        return f'public, max-age={settings.PRERENDER_MAX_AGE}'
+
+
+class NotFoundMiddleware:
+    """
+    Считает ответы 404 по адресам и запоминает несуществующие адреса на
+    NOT_FOUND_CACHE_TIMEOUT секунд (см. core.not_found).
+
+    Повторный запрос гостя на такой адрес получает готовую страницу 404
+    раньше сессий, аутентификации и резолвера URL.
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        timeout = settings.NOT_FOUND_CACHE_TIMEOUT
+        cacheable = (
+            timeout
+            and not settings.DEBUG
+            and request.method in ('GET', 'HEAD')
+            and settings.SESSION_COOKIE_NAME not in request.COOKIES
+        )
+        if cacheable and cache.get(not_found.key(request.path)):
+            not_found.record(request.path)
+            return HttpResponseNotFound(
+                prerender.error_content(request, '404', request.path)
+            )
+        response = self.get_response(request)
+        if response.status_code == 404:
+            not_found.record(request.path)
+            if cacheable:
+                cache.set(not_found.key(request.path), 1, timeout)
+        return response
+
+
+class MetricsMiddleware:
+    """
+    Время ответа, статус и SQL-запросы каждого запроса по имени view
+    (см. core.metrics). Стоит первым, чтобы замер включал остальные
+    middleware.
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        timer = metrics.QueryTimer()
+        started = time.perf_counter()
+        with ExitStack() as stack:
+            for connection in connections.all():
+                stack.enter_context(connection.execute_wrapper(timer))
+            response = self.get_response(request)
+        metrics.record_request(
+            request, response, time.perf_counter() - started, timer
+        )
+        return response
@@ -0,0 +1,25 @@
+# Generated by Django 2.2.28 on 2026-10-19 11:48
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    initial = True
+
+    dependencies = [
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='NotFoundPath',
+            fields=[
+                ('id', models.CharField(max_length=32, primary_key=True, serialize=False)),
+                ('path', models.TextField(verbose_name='Адрес')),
+                ('hits', models.PositiveIntegerField(default=0, verbose_name='Ответов 404')),
+            ],
+            options={
+                'ordering': ['-hits'],
+            },
+        ),
+    ]
@@ -0,0 +1,19 @@
+# Generated by Django 2.2.28 on 2026-10-19 12:10
+
+from django.db import migrations, models
+import django.utils.timezone
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='notfoundpath',
+            name='last_seen',
+            field=models.DateTimeField(db_index=True, default=django.utils.timezone.now, verbose_name='Последний ответ 404'),
+        ),
+    ]
@@ -1,4 +1,5 @@
 from django.db import models
+from django.utils import timezone
 
 
 class CreatedModel(models.Model):
@@ -11,3 +12,23 @@ class CreatedModel(models.Model):
 
     class Meta:
         abstract = True
+
+
+class NotFoundPath(models.Model):
+    """
+    Адрес, отвечавший 404, и число таких ответов (см. core.not_found).
+
+    Ключ - md5 адреса: по нему счётчик пишет приращения, не зная id строки.
+    """
+    class Meta:
+        ordering = ['-hits']
+
+    id = models.CharField(primary_key=True, max_length=32)
+    path = models.TextField('Адрес')
+    hits = models.PositiveIntegerField('Ответов 404', default=0)
+    last_seen = models.DateTimeField(
+        'Последний ответ 404', default=timezone.now, db_index=True
+    )
+
+    def __str__(self):
+        return self.path
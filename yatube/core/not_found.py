@@ -0,0 +1,89 @@
+"""
+Адреса, отвечающие 404.
+
+Боты раз за разом приходят на одни и те же несуществующие адреса.
+NotFoundMiddleware запоминает такой адрес в кеше, и следующий запрос гостя
+получает готовую страницу 404 без сессии, резолвера и базы. Новый пост
+убирает из кеша свой адрес (forget), а новые пользователи и группы, смена
+имени или slug увеличивают поколение GENERATION, в которое входят все
+ключи отрицательного кеша.
+
+Ответы 404 засчитываются адресу в буферизованном счётчике, самые частые
+показывает manage.py top_404. Адрес попадает в счётчик, только если
+отвечал 404 хотя бы дважды за NOT_FOUND_ADMIT_WINDOW, а в базе хранится
+не больше NOT_FOUND_MAX_PATHS адресов: адреса, которые бот придумывает
+по одному разу, не копятся ни в кеше, ни в таблице.
+"""
+import hashlib
+
+from django.conf import settings
+from django.core.cache import cache
+from django.utils import timezone
+
+from . import generations
+from .counters import BUFFER_TIMEOUT, BufferedCounter, cache_incr
+from .models import NotFoundPath
+
+GENERATION = 'not_found'
+MAX_PATH_LENGTH = 500
+
+
+def path_hash(path):
+    return hashlib.md5(path.encode()).hexdigest()
+
+
+def key(path):
+    """Ключ отрицательного кеша адреса path."""
+    return f'not_found:{generations.get(GENERATION)}:{path_hash(path)}'
+
+
+def forget(*paths):
+    """Убирает адреса из отрицательного кеша: они больше не 404."""
+    cache.delete_many([key(path) for path in paths])
+
+
+class PathCounter(BufferedCounter):
+    """Счётчик по адресам: строка адреса создаётся при первом сбросе."""
+
+    def incr_path(self, path, amount=1):
+        pk = path_hash(path)
+        cache.add(self.key('path', pk), path[:MAX_PATH_LENGTH], BUFFER_TIMEOUT)
+        self.incr(pk, amount)
+
+    def write(self, pks):
+        """
+        Создаёт строки новых адресов, пока их меньше NOT_FOUND_MAX_PATHS;
+        приращения адресов, не попавших в таблицу, пропадают.
+        """
+        objects = self.model.objects
+        new = sorted(set(pks) - set(
+            objects.filter(pk__in=pks).values_list('pk', flat=True)
+        ))
+        room = getattr(settings, 'NOT_FOUND_MAX_PATHS', 10000)
+        if new and room:
+            new = new[:max(0, room - objects.count())]
+        paths = cache.get_many([self.key('path', pk) for pk in new])
+        objects.bulk_create([
+            self.model(pk=pk, path=paths.get(self.key('path', pk), ''))
+            for pk in new
+        ], ignore_conflicts=True)
+        deltas = super().write(pks)
+        if deltas:
+            objects.filter(pk__in=deltas).update(last_seen=timezone.now())
+        return deltas
+
+
+hits = PathCounter('not_found', NotFoundPath, 'hits')
+
+
+def record(path):
+    """
+    Засчитывает ответ 404 адресу path. Первый ответ только запоминается,
+    второй за окно засчитывается вместе с первым.
+    """
+    seen = cache_incr(
+        f'not_found:seen:{path_hash(path)}', 1,
+        getattr(settings, 'NOT_FOUND_ADMIT_WINDOW', 3600),
+    )
+    if seen > 1:
+        hits.incr_path(path, 2 if seen == 2 else 1)
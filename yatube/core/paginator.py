@@ -0,0 +1,52 @@
+"""
+Пагинатор для больших таблиц, который не делает полный COUNT(*).
+
+Без фильтров число строк берётся из статистики планировщика
+(sqlite_stat1 после ANALYZE, pg_class.reltuples в PostgreSQL). С фильтром
+или поиском строки считаются, но не больше MAX_EXACT_COUNT: дальше
+последней страницы в такой выборке всё равно никто не листает.
+"""
+from django.core.paginator import Paginator
+from django.db import DatabaseError, connections
+from django.utils.functional import cached_property
+
+# Таблицы меньше этого размера дешевле посчитать точно.
+ESTIMATE_THRESHOLD = 10000
+MAX_EXACT_COUNT = 10000
+
+
+def estimate_count(model, using='default'):
+    """Оценка числа строк таблицы model или None, если её негде взять."""
+    connection = connections[using]
+    table = model._meta.db_table
+    if connection.vendor == 'postgresql':
+        sql = 'SELECT reltuples FROM pg_class WHERE relname = %s'
+    elif connection.vendor == 'sqlite':
+        # Первое число в stat любого индекса - число строк таблицы.
+        sql = 'SELECT stat FROM sqlite_stat1 WHERE tbl = %s LIMIT 1'
+    else:
+        return None
+    try:
+        with connection.cursor() as cursor:
+            cursor.execute(sql, [table])
+            row = cursor.fetchone()
+    except DatabaseError:
+        # sqlite_stat1 появляется только после первого ANALYZE.
+        return None
+    if row is None:
+        return None
+    estimate = int(float(str(row[0]).split()[0]))
+    return estimate if estimate >= 0 else None
+
+
+class EstimatedCountPaginator(Paginator):
+
+    @cached_property
+    def count(self):
+        queryset = self.object_list
+        if queryset.query.where:
+            return queryset.order_by()[:MAX_EXACT_COUNT].count()
+        estimate = estimate_count(queryset.model, queryset.db)
+        if estimate is None or estimate < ESTIMATE_THRESHOLD:
+            return queryset.count()
+        return estimate
@@ -0,0 +1,117 @@
+"""
+Страницы, отрендеренные заранее командой manage.py prerender.
+
+Страницы из PRERENDER_PAGES и страницы ошибок рендерятся при деплое для
+гостя и кладутся в PRERENDER_ROOT вместе с .gz/.br копиями:
+
+    about/author/index.html
+    errors/404.html
+
+Гостям их отдаёт PrerenderedPagesMiddleware (или фронтенд-сервер прямо из
+каталога, по адресу страницы + index.html), а страницы ошибок -
+обработчики core.views без рендера шаблонов. Если команду не запускали,
+страница ошибки рендерится один раз на процесс и язык.
+"""
+import os
+from functools import lru_cache
+
+from django.conf import settings
+from django.contrib.auth.models import AnonymousUser
+from django.template.loader import render_to_string
+from django.urls import resolve, reverse
+from django.utils import translation
+from django.utils.html import escape
+
+from .staticfiles import write_brotli, write_gzip
+
+ERRORS_DIRECTORY = 'errors'
+# На этом месте в странице 404 окажется запрошенный адрес.
+PATH_MARKER = 'prerender-path-marker'
+ERROR_PAGES = {
+    '404': ('core/404.html', {'path': PATH_MARKER}),
+    '403csrf': ('core/403csrf.html', {}),
+}
+
+
+def page_name(path):
+    """Файл заранее отрендеренной страницы по адресу path."""
+    return f'{path.strip("/")}/index.html'.lstrip('/')
+
+
+def guest_request(path):
+    # django.test нужен только при рендере, не в каждом воркере.
+    from django.test import RequestFactory
+
+    request = RequestFactory().get(path)
+    request.user = AnonymousUser()
+    request.resolver_match = resolve(path)
+    return request
+
+
+def render_page(url_name):
+    """(адрес, HTML) страницы url_name так, как её увидит гость."""
+    path = reverse(url_name)
+    request = guest_request(path)
+    response = request.resolver_match.func(
+        request, *request.resolver_match.args,
+        **request.resolver_match.kwargs
+    )
+    if hasattr(response, 'render'):
+        response.render()
+    if response.status_code != 200:
+        raise ValueError(f'{path} ответил {response.status_code}')
+    return path, response.content.decode(response.charset)
+
+
+def render_error(name):
+    template_name, context = ERROR_PAGES[name]
+    request = guest_request('/')
+    request.resolver_match = None
+    return render_to_string(template_name, context, request)
+
+
+def write(name, content):
+    path = os.path.join(settings.PRERENDER_ROOT, name)
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path, 'w') as target:
+        target.write(content)
+    write_gzip(path)
+    write_brotli(path)
+    return path
+
+
+def prerender_all():
+    """Рендерит все страницы; возвращает список записанных файлов."""
+    written = []
+    for url_name in settings.PRERENDER_PAGES:
+        path, content = render_page(url_name)
+        written.append(write(page_name(path), content))
+    for name in ERROR_PAGES:
+        written.append(
+            write(f'{ERRORS_DIRECTORY}/{name}.html', render_error(name))
+        )
+    error_page.cache_clear()
+    return written
+
+
+@lru_cache(maxsize=None)
+def error_page(name, language):
+    """Страница ошибки для гостя: из PRERENDER_ROOT или отрендеренная."""
+    path = os.path.join(
+        settings.PRERENDER_ROOT, ERRORS_DIRECTORY, f'{name}.html'
+    )
+    if not os.path.exists(path):
+        return render_error(name)
+    with open(path) as source:
+        return source.read()
+
+
+def error_content(request, name, path=''):
+    """
+    HTML страницы ошибки name для гостя или None, если её нужно
+    рендерить обычным образом.
+    """
+    if settings.DEBUG or settings.SESSION_COOKIE_NAME in request.COOKIES:
+        return None
+    content = error_page(name, translation.get_language())
+    return content.replace(PATH_MARKER, escape(path))
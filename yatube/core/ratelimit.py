@@ -0,0 +1,135 @@
+"""
+Ограничение частоты запросов на запись.
+
+Каждому пользователю (или IP для гостя) на каждый view разрешено limit
+запросов за скользящее окно в period секунд. Окно оценивается по двум
+соседним периодам: счётчик текущего плюс доля предыдущего, ещё не
+вышедшая из окна. Так на стыке периодов нельзя успеть 2 * limit запросов,
+как при простом счётчике периода. Счётчики живут в кеше и увеличиваются
+атомарным cache.incr: проверка стоит incr и get на запрос (плюс
+cache.add на первый запрос периода).
+"""
+import math
+import time
+from functools import wraps
+
+from django.conf import settings
+from django.core.cache import cache
+from django.shortcuts import render
+
+PERIODS = {'s': 1, 'm': 60, 'h': 3600, 'd': 86400}
+
+
+def parse_rate(rate):
+    """'10/m' -> (10, 60): не больше 10 запросов в минуту."""
+    limit, period = rate.split('/')
+    return int(limit), PERIODS[period]
+
+
+def client_ip(request):
+    """
+    Адрес клиента с учётом RATELIMIT_TRUSTED_PROXIES доверенных прокси.
+
+    Каждый прокси дописывает в X-Forwarded-For адрес, от которого получил
+    запрос, поэтому клиентом считается N-й адрес справа. Всё левее
+    прислал сам клиент, и верить этому нельзя.
+    """
+    proxies = getattr(settings, 'RATELIMIT_TRUSTED_PROXIES', 0)
+    if proxies:
+        hops = [
+            hop.strip()
+            for hop in request.META.get('HTTP_X_FORWARDED_FOR', '').split(',')
+            if hop.strip()
+        ]
+        if len(hops) >= proxies:
+            return hops[-proxies]
+    return request.META.get('REMOTE_ADDR', '')
+
+
+def user_key(request):
+    if request.user.is_authenticated:
+        return f'user:{request.user.pk}'
+    return None
+
+
+def ip_key(request):
+    return f'ip:{client_ip(request)}'
+
+
+def user_or_ip_key(request):
+    return user_key(request) or ip_key(request)
+
+
+KEYS = {
+    'user': user_key,
+    'ip': ip_key,
+    'user_or_ip': user_or_ip_key,
+}
+
+
+def consume(scope, ident, limit, period):
+    """
+    Учитывает запрос в окне. Возвращает None, если запрос разрешён,
+    иначе число секунд, через которое окно освободится.
+    """
+    now = time.time()
+    window, elapsed = divmod(now, period)
+    window = int(window)
+    key = f'ratelimit:{scope}:{ident}:{window}'
+    try:
+        count = cache.incr(key)
+    except ValueError:
+        # Первый запрос в периоде: ключа ещё нет. Ключ нужен и весь
+        # следующий период, как предыдущий.
+        if cache.add(key, 1, 2 * period + 1):
+            count = 1
+        else:
+            count = cache.incr(key)
+    previous = cache.get(f'ratelimit:{scope}:{ident}:{window - 1}', 0)
+    # Доля предыдущего периода, которая ещё входит в окно.
+    if previous * (1 - elapsed / period) + count <= limit:
+        return None
+    if count > limit:
+        # Хватит только нового периода, и то не целиком.
+        return max(1, math.ceil(period - elapsed))
+    # Ждём, пока из окна выйдет достаточная часть предыдущего периода.
+    share = 1 - (limit - count) / previous
+    return max(1, math.ceil(share * period - elapsed))
+
+
+def too_many_requests(request, retry_after):
+    response = render(
+        request, 'core/429.html', {'retry_after': retry_after}, status=429
+    )
+    response['Retry-After'] = str(retry_after)
+    return response
+
+
+def exceeded(request, scope, rate, key='user_or_ip'):
+    """
+    Учитывает запрос в лимите scope. Возвращает None, если запрос
+    разрешён, иначе число секунд до следующей попытки.
+
+    Лимит переопределяется в settings.RATELIMITS по имени scope,
+    None там отключает ограничение.
+    """
+    key_func = KEYS[key] if isinstance(key, str) else key
+    rate = getattr(settings, 'RATELIMITS', {}).get(scope, rate)
+    ident = key_func(request)
+    if not rate or not ident:
+        return None
+    return consume(scope, ident, *parse_rate(rate))
+
+
+def ratelimit(scope, rate, key='user_or_ip', methods=('POST',)):
+    """Ограничивает view до rate запросов ('5/m') на ключ key."""
+    def decorator(view):
+        @wraps(view)
+        def wrapped(request, *args, **kwargs):
+            if request.method in methods:
+                retry_after = exceeded(request, scope, rate, key)
+                if retry_after:
+                    return too_many_requests(request, retry_after)
+            return view(request, *args, **kwargs)
+        return wrapped
+    return decorator
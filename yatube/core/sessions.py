@@ -0,0 +1,52 @@
+"""
+Движок сессий: cached_db с кешированием промахов.
+
+Залогиненные пользователи читают сессию из кеша, в базу запрос уходит
+только при промахе. Запрос без cookie сессии вообще не трогает хранилище,
+а cookie с несуществующей сессией проверяется в базе один раз за
+SESSION_MISS_TIMEOUT, а не на каждый запрос.
+"""
+from django.conf import settings
+from django.contrib.sessions.backends.cached_db import (
+    SessionStore as CachedDBStore,
+)
+
+MISSING = '__missing__'
+
+
+class SessionStore(CachedDBStore):
+    cache_key_prefix = 'core.sessions'
+
+    def load(self):
+        session_key = self.session_key
+        try:
+            data = self._cache.get(self.cache_key)
+        except Exception:
+            # Memcached не принимает некоторые ключи, сессию сбрасываем.
+            data = None
+
+        if data == MISSING:
+            self._session_key = None
+            return {}
+        if data is not None:
+            return data
+
+        session = self._get_session_from_db()
+        if session is None:
+            try:
+                self._cache.set(
+                    self.cache_key_prefix + session_key,
+                    MISSING,
+                    getattr(settings, 'SESSION_MISS_TIMEOUT', 60),
+                )
+            except Exception:
+                # Поддельная cookie с пробелом или длиннее 250 символов:
+                # такой ключ memcached не примет, промах не запоминаем.
+                pass
+            return {}
+        data = self.decode(session.session_data)
+        self._cache.set(
+            self.cache_key, data,
+            self.get_expiry_age(expiry=session.expire_date)
+        )
+        return data
@@ -0,0 +1,200 @@
+import gzip
+import os
+import re
+
+from django.conf import settings
+from django.contrib.staticfiles.storage import ManifestStaticFilesStorage
+from django.core.files.base import ContentFile
+from django.template import engines
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+# Уже сжатые форматы повторно жать бессмысленно.
+COMPRESS_EXTENSIONS = ('.css', '.js', '.svg', '.html', '.txt', '.ico', '.json')
+
+TEMPLATE_TOKEN_RE = re.compile(r'[\w-]+')
+SELECTOR_NAME_RE = re.compile(r'([.#])((?:\\.|[\w-])+)')
+# Внутри :not() и [атрибутов] классы не обязаны встречаться на странице.
+SELECTOR_IGNORED_RE = re.compile(r':not\([^)]*\)|\[[^\]]*\]')
+
+
+def write_gzip(path):
+    """Кладёт рядом с файлом его gzip-копию path.gz."""
+    with open(path, 'rb') as source:
+        content = source.read()
+    with gzip.open(f'{path}.gz', 'wb', compresslevel=9) as target:
+        target.write(content)
+
+
+def write_brotli(path):
+    """Кладёт рядом с файлом brotli-копию path.br, если brotli установлен."""
+    if brotli is None:
+        return
+    with open(path, 'rb') as source:
+        content = brotli.compress(source.read())
+    with open(f'{path}.br', 'wb') as target:
+        target.write(content)
+
+
+def collect_template_tokens():
+    """Все слова из шаблонов проекта: кандидаты в используемые классы."""
+    tokens = set(getattr(settings, 'STATIC_PURGE_SAFELIST', ()))
+    for engine in engines.all():
+        for directory in engine.template_dirs:
+            for root, _, files in os.walk(directory):
+                for filename in files:
+                    if not filename.endswith(('.html', '.txt', '.xml')):
+                        continue
+                    path = os.path.join(root, filename)
+                    with open(path) as template:
+                        tokens.update(
+                            TEMPLATE_TOKEN_RE.findall(template.read())
+                        )
+    return tokens
+
+
+def _skip_string_or_comment(css, pos):
+    """Возвращает позицию после строки или комментария, начинающихся в pos."""
+    if css.startswith('/*', pos):
+        end = css.find('*/', pos + 2)
+        return len(css) if end == -1 else end + 2
+    quote = css[pos]
+    pos += 1
+    while pos < len(css) and css[pos] != quote:
+        pos += 2 if css[pos] == '\\' else 1
+    return pos + 1
+
+
+def _find(css, chars, pos):
+    """Ищет первый из символов chars вне строк и комментариев."""
+    while pos < len(css):
+        char = css[pos]
+        if char in '"\'' or css.startswith('/*', pos):
+            pos = _skip_string_or_comment(css, pos)
+        elif char in chars:
+            return pos
+        else:
+            pos += 1
+    return -1
+
+
+def _block_end(css, pos):
+    """Позиция закрывающей скобки блока, открытого перед pos."""
+    depth = 1
+    while depth:
+        pos = _find(css, '{}', pos)
+        if pos == -1:
+            return len(css)
+        depth += 1 if css[pos] == '{' else -1
+        pos += 1
+    return pos - 1
+
+
+def _split_selectors(prelude):
+    selectors, depth, start = [], 0, 0
+    for index, char in enumerate(prelude):
+        if char in '([':
+            depth += 1
+        elif char in ')]':
+            depth -= 1
+        elif char == ',' and not depth:
+            selectors.append(prelude[start:index])
+            start = index + 1
+    selectors.append(prelude[start:])
+    return selectors
+
+
+def _selector_used(selector, tokens):
+    selector = SELECTOR_IGNORED_RE.sub('', selector)
+    return all(
+        name.replace('\\', '') in tokens
+        for _, name in SELECTOR_NAME_RE.findall(selector)
+    )
+
+
+def purge_css(css, tokens):
+    """
+    Удаляет правила, селекторы которых ссылаются на классы и id,
+    не встречающиеся в tokens. Правила без классов, @font-face и
+    @keyframes сохраняются как есть, @media и @supports чистятся рекурсивно.
+    """
+    result = []
+    pos = 0
+    while pos < len(css):
+        start = _find(css, '{;', pos)
+        if start == -1:
+            break
+        prelude = css[pos:start].strip()
+        if css[start] == ';':
+            # @charset, @import и прочие однострочные правила.
+            result.append(css[pos:start + 1].strip())
+            pos = start + 1
+            continue
+        end = _block_end(css, start + 1)
+        body = css[start + 1:end]
+        pos = end + 1
+        while prelude.startswith('/*'):
+            comment_end = prelude.find('*/') + 2
+            if prelude.startswith('/*!'):
+                result.append(prelude[:comment_end])
+            prelude = prelude[comment_end:].strip()
+        if prelude.startswith(('@media', '@supports')):
+            body = purge_css(body, tokens)
+            if body:
+                result.append(f'{prelude}{{{body}}}')
+        elif prelude.startswith('@'):
+            result.append(f'{prelude}{{{body}}}')
+        else:
+            selectors = [
+                selector.strip() for selector in _split_selectors(prelude)
+                if _selector_used(selector, tokens)
+            ]
+            if selectors:
+                result.append(f'{",".join(selectors)}{{{body}}}')
+    return ''.join(result)
+
+
+class CompressedManifestStaticFilesStorage(ManifestStaticFilesStorage):
+    """
+    Хеширует имена файлов и сохраняет сжатые копии рядом с ними.
+
+    Файлы из STATIC_PURGE_CSS перед хешированием очищаются от селекторов,
+    не используемых в шаблонах проекта.
+    """
+
+    def purge(self, paths):
+        purge_names = getattr(settings, 'STATIC_PURGE_CSS', ())
+        tokens = None
+        for name in purge_names:
+            if name not in paths:
+                continue
+            if tokens is None:
+                tokens = collect_template_tokens()
+            storage, path = paths[name]
+            with storage.open(path) as source:
+                css = source.read().decode()
+            self.delete(name)
+            self._save(name, ContentFile(purge_css(css, tokens).encode()))
+            paths[name] = (self, name)
+
+    def post_process(self, paths, dry_run=False, **options):
+        if not dry_run:
+            self.purge(paths)
+
+        processed = set()
+        for name, hashed_name, result in super().post_process(
+            paths, dry_run, **options
+        ):
+            if result and hashed_name:
+                processed.add(hashed_name)
+            yield name, hashed_name, result
+
+        if dry_run:
+            return
+        for name in processed:
+            if name.endswith(COMPRESS_EXTENSIONS):
+                write_gzip(self.path(name))
+                write_brotli(self.path(name))
@@ -0,0 +1,79 @@
+"""
+Хранилища медиафайлов с адресацией по содержимому.
+
+Имя файла - sha256 его содержимого, разложенный по подкаталогам
+(posts/ab/cd/abcd...ef.jpg), поэтому одинаковые картинки хранятся один раз,
+а в одном каталоге не оказывается миллионов файлов. Файлы удалённых и
+отредактированных постов не удаляются сразу (на них могут ссылаться другие
+посты) - их собирает команда manage.py gc_media.
+"""
+import hashlib
+import os
+import posixpath
+
+from django.core.files.base import File
+from django.core.files.storage import FileSystemStorage
+
+try:
+    from storages.backends.s3boto3 import S3Boto3Storage
+except ImportError:
+    S3Boto3Storage = None
+
+SHARD_DEPTH = 2
+SHARD_WIDTH = 2
+
+
+class ContentAddressedMixin:
+    """Подмешивается к любому Storage: имя файла берётся из его содержимого."""
+
+    def hashed_name(self, name, content):
+        digest = hashlib.sha256()
+        content.seek(0)
+        for chunk in content.chunks():
+            digest.update(chunk)
+        content.seek(0)
+        digest = digest.hexdigest()
+
+        directory, filename = posixpath.split(name)
+        shards = [
+            digest[level * SHARD_WIDTH:(level + 1) * SHARD_WIDTH]
+            for level in range(SHARD_DEPTH)
+        ]
+        extension = os.path.splitext(filename)[1].lower()
+        return posixpath.join(directory, *shards, digest + extension)
+
+    def save(self, name, content, max_length=None):
+        if name is None:
+            name = content.name
+        if not hasattr(content, 'chunks'):
+            content = File(content, name)
+        name = self.hashed_name(name, content)
+        if self.exists(name):
+            # Такое содержимое уже загружено: повторно не пишем, но
+            # освежаем время файла, чтобы gc_media не удалил его, пока
+            # новый пост ещё сохраняется.
+            self.touch(name)
+            return name
+        return self._save(name, content)
+
+    def touch(self, name):
+        """Обновляет время изменения файла, если хранилище это умеет."""
+
+
+class ContentAddressedFileSystemStorage(
+    ContentAddressedMixin, FileSystemStorage
+):
+    """Локальный каталог MEDIA_ROOT."""
+
+    def touch(self, name):
+        os.utime(self.path(name))
+
+
+if S3Boto3Storage is not None:
+    class ContentAddressedS3Storage(ContentAddressedMixin, S3Boto3Storage):
+        """
+        S3-совместимое объектное хранилище (django-storages).
+
+        Для локальной проверки подойдёт MinIO: AWS_S3_ENDPOINT_URL
+        указывает на него, остальные AWS_* настройки - как для S3.
+        """
@@ -0,0 +1,100 @@
+"""
+Потоковая отдача длинных списков.
+
+Страница рендерится один раз с меткой на месте списка, делится по ней
+на начало и конец, а элементы между ними рендерятся и отдаются пачками
+по STREAM_CHUNK_ITEMS. Элементы читаются из базы такими же пачками по
+ключу сортировки: каждая пачка - короткий запрос с условием "после
+последнего отданного" (keyset), выбранный целиком до отдачи. Медленный
+клиент не держит открытым курсор, а с ним и блокировку чтения SQLite,
+а в памяти лежит одна пачка, а не весь список.
+"""
+import uuid
+
+from django.db.models import Q
+from django.http import StreamingHttpResponse
+from django.template.context import make_context
+from django.template.loader import get_template, render_to_string
+
+STREAM_CHUNK_ITEMS = 50
+
+
+def keyset_chunks(queryset, ordering, size):
+    """
+    Элементы queryset в порядке ordering, пачками по size.
+
+    Каждая пачка выбирается отдельным запросом с условием после
+    последнего элемента предыдущей, поэтому ordering должен однозначно
+    упорядочивать строки (заканчиваться на pk).
+    """
+    queryset = queryset.order_by(*ordering)
+    last = None
+    while True:
+        batch = queryset if last is None else queryset.filter(
+            after(last, ordering)
+        )
+        items = list(batch[:size])
+        yield from items
+        if len(items) < size:
+            return
+        last = items[-1]
+
+
+def after(item, ordering):
+    """Условие "строка идёт после item" для сортировки ordering."""
+    condition = Q()
+    equal = {}
+    for field in ordering:
+        name = field.lstrip('-')
+        lookup = 'lt' if field.startswith('-') else 'gt'
+        value = getattr(item, name)
+        condition |= Q(**equal, **{f'{name}__{lookup}': value})
+        equal[name] = value
+    return condition
+
+
+def stream_items(request, template_name, items, item_name, context,
+                 separator):
+    template = get_template(template_name).template
+    # Один контекст на весь список: процессоры контекста выполняются
+    # один раз, а не для каждого элемента.
+    context = make_context(context, request)
+    with context.bind_template(template):
+        chunk = []
+        for number, item in enumerate(items):
+            if number:
+                chunk.append(separator)
+            with context.push({item_name: item}):
+                chunk.append(template.render(context))
+            if len(chunk) >= STREAM_CHUNK_ITEMS:
+                yield ''.join(chunk)
+                chunk = []
+        if chunk:
+            yield ''.join(chunk)
+
+
+def stream_render(request, template_name, context, items, item_template,
+                  item_name='object', item_context=None, separator='',
+                  ordering=('-pk',)):
+    """
+    StreamingHttpResponse со страницей template_name, в которой на месте
+    {{ stream_marker }} выводятся все элементы queryset items в порядке
+    ordering, каждый шаблоном item_template под именем item_name.
+    """
+    marker = f'stream-{uuid.uuid4().hex}'
+    # Начало и конец страницы рендерятся сразу, пока запрос ещё не
+    # завершён: шапке нужны сессия и пользователь.
+    head, tail = render_to_string(
+        template_name, {**context, 'stream_marker': marker}, request
+    ).split(marker, 1)
+
+    def content():
+        yield head
+        yield from stream_items(
+            request, item_template,
+            keyset_chunks(items, ordering, STREAM_CHUNK_ITEMS), item_name,
+            item_context or {}, separator,
+        )
+        yield tail
+
+    return StreamingHttpResponse(content())
@@ -0,0 +1,57 @@
+"""
+Тестовый раннер проекта.
+
+    python manage.py test --parallel
+
+Каждый процесс пишет загруженные файлы в свой временный MEDIA_ROOT,
+поэтому тесты с картинками не мешают друг другу и не мусорят в media
+проекта. SQLite-база в памяти достаётся процессам-воркерам копией при
+fork вместе с миграциями, поэтому схема строится один раз на весь прогон.
+Трассировки упавших тестов из воркеров передаются только с пакетом tblib.
+"""
+import os
+import shutil
+import tempfile
+
+from django.conf import settings
+from django.test import runner
+from django.test.utils import override_settings
+
+# Пароли в тестах проверяют логику, а не стойкость хеша.
+TEST_PASSWORD_HASHERS = ['django.contrib.auth.hashers.MD5PasswordHasher']
+
+
+def media_root(parent, name):
+    path = os.path.join(parent, name)
+    os.makedirs(path, exist_ok=True)
+    return path
+
+
+def init_worker(counter):
+    runner._init_worker(counter)
+    parent = os.path.dirname(settings.MEDIA_ROOT)
+    override_settings(
+        MEDIA_ROOT=media_root(parent, f'worker-{runner._worker_id}')
+    ).enable()
+
+
+class ParallelTestSuite(runner.ParallelTestSuite):
+    init_worker = init_worker
+
+
+class YatubeTestRunner(runner.DiscoverRunner):
+    parallel_test_suite = ParallelTestSuite
+
+    def setup_test_environment(self, **kwargs):
+        super().setup_test_environment(**kwargs)
+        self.media_parent = tempfile.mkdtemp(prefix='yatube-test-media-')
+        self.test_settings = override_settings(
+            MEDIA_ROOT=media_root(self.media_parent, 'main'),
+            PASSWORD_HASHERS=TEST_PASSWORD_HASHERS,
+        )
+        self.test_settings.enable()
+
+    def teardown_test_environment(self, **kwargs):
+        self.test_settings.disable()
+        shutil.rmtree(self.media_parent, ignore_errors=True)
+        super().teardown_test_environment(**kwargs)
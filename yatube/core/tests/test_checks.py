@@ -0,0 +1,60 @@
+from django.test import SimpleTestCase, override_settings
+
+from core import checks
+
+FAST_SETTINGS = {
+    'DEBUG': False,
+    'DATABASES': {
+        'default': {
+            'ENGINE': 'django.db.backends.sqlite3',
+            'NAME': ':memory:',
+            'CONN_MAX_AGE': 600,
+        }
+    },
+    'CACHES': {
+        'default': {
+            'BACKEND': 'django.core.cache.backends.memcached.MemcachedCache',
+        }
+    },
+    'SESSION_ENGINE': 'django.contrib.sessions.backends.cached_db',
+    'STATICFILES_STORAGE':
+        'core.staticfiles.CompressedManifestStaticFilesStorage',
+}
+
+ALL_CHECKS = (
+    checks.check_debug,
+    checks.check_persistent_connections,
+    checks.check_cached_templates,
+    checks.check_shared_cache,
+    checks.check_session_engine,
+    checks.check_static_storage,
+)
+
+
+def run_checks():
+    return [
+        error.id for check in ALL_CHECKS for error in check(None)
+    ]
+
+
+class PerformanceChecksTest(SimpleTestCase):
+
+    @override_settings(**FAST_SETTINGS)
+    def test_fast_settings_pass(self):
+        """Боевой набор настроек не вызывает предупреждений."""
+        self.assertEqual(run_checks(), [])
+
+    def test_dev_settings_are_flagged(self):
+        """Настройки разработки помечаются как медленные."""
+        with self.settings(
+            DEBUG=True,
+            SESSION_ENGINE='django.contrib.sessions.backends.db',
+        ):
+            self.assertEqual(run_checks(), [
+                'core.W001',
+                'core.W002',
+                'core.W003',
+                'core.W004',
+                'core.W005',
+                'core.W006',
+            ])
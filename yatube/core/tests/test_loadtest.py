@@ -0,0 +1,24 @@
+from django.test import SimpleTestCase
+
+from core import loadtest
+
+
+class CompareTest(SimpleTestCase):
+
+    def test_percentile(self):
+        values = list(range(1, 101))
+        self.assertEqual(loadtest.percentile(values, 0.5), 51)
+        self.assertEqual(loadtest.percentile(values, 0.99), 100)
+        self.assertEqual(loadtest.percentile([], 0.99), 0)
+
+    def test_regressions_beyond_tolerance(self):
+        """Падение пропускной способности и рост p99 сверх допуска."""
+        baseline = {
+            'throughput': 100, 'p99': 0.2, 'error_rate': 0, 'write_p99': 0.01
+        }
+        report = {
+            'throughput': 85, 'p99': 0.21, 'error_rate': 0.01,
+            'write_p99': 0.005,
+        }
+        _, regressions = loadtest.compare(report, baseline, 0.1)
+        self.assertEqual(regressions, ['throughput', 'error_rate'])
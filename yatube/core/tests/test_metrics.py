@@ -0,0 +1,172 @@
+import json
+import os
+import shutil
+import tempfile
+
+from django.core.cache import cache
+from django.test import TestCase, override_settings
+from django.urls import reverse
+
+from core import metrics
+
+TEMP_METRICS_DIR = tempfile.mkdtemp()
+METRICS_TOKEN = 'test-metrics-token'
+
+INDEX_LABELS = (('view', 'posts:main_menu'), ('method', 'GET'),
+                ('status', '200'))
+
+
+def counter(name, labels):
+    return metrics.collect()[0].get((name, labels), 0)
+
+
+@override_settings(METRICS_TOKEN=METRICS_TOKEN)
+class MetricsTest(TestCase):
+
+    @classmethod
+    def tearDownClass(cls):
+        super().tearDownClass()
+        shutil.rmtree(TEMP_METRICS_DIR, ignore_errors=True)
+
+    def setUp(self):
+        # Ленты кешируются (core.holes): каждому тесту нужен промах.
+        cache.clear()
+
+    def test_requests_counted_by_view(self):
+        """Запрос засчитывается своему view с временем и SQL-запросами."""
+        before = counter('yatube_requests_total', INDEX_LABELS)
+        queries = counter(
+            'yatube_db_queries_total', (('view', 'posts:main_menu'),)
+        )
+        self.client.get(reverse('posts:main_menu'))
+        self.assertEqual(
+            counter('yatube_requests_total', INDEX_LABELS), before + 1
+        )
+        self.assertGreater(counter(
+            'yatube_db_queries_total', (('view', 'posts:main_menu'),)
+        ), queries)
+        response = self.client.get(
+            reverse('metrics'), HTTP_AUTHORIZATION=f'Bearer {METRICS_TOKEN}'
+        )
+        self.assertContains(
+            response,
+            'yatube_request_duration_seconds_bucket'
+            '{view="posts:main_menu",le="+Inf"}'
+        )
+        self.assertContains(
+            response, 'yatube_requests_total{view="posts:main_menu",'
+                      'method="GET",status="200"}'
+        )
+
+    def test_unknown_paths_share_one_label(self):
+        """Адреса вне METRICS_NAMESPACES не плодят отдельные ряды."""
+        labels = (('view', 'other'), ('method', 'GET'), ('status', '404'))
+        before = counter('yatube_requests_total', labels)
+        self.client.get('/no-such-page/')
+        self.assertEqual(counter('yatube_requests_total', labels), before + 1)
+
+    def test_cache_hits_and_misses(self):
+        hit = (('operation', 'get'), ('result', 'hit'))
+        miss = (('operation', 'get'), ('result', 'miss'))
+        name = 'yatube_cache_operations_total'
+        before = counter(name, hit), counter(name, miss)
+        cache.set('metrics-test', 1)
+        cache.get('metrics-test')
+        cache.get_many(['metrics-test', 'metrics-missing'])
+        self.assertEqual(
+            (counter(name, hit), counter(name, miss)),
+            (before[0] + 2, before[1] + 1),
+        )
+
+    def test_metrics_require_token(self):
+        """Ни локальный адрес, ни X-Forwarded-For доступа не дают."""
+        for headers in (
+            {},
+            {'HTTP_X_FORWARDED_FOR': '127.0.0.1'},
+            {'HTTP_AUTHORIZATION': 'Bearer wrong'},
+        ):
+            with self.subTest(headers=headers):
+                response = self.client.get(
+                    reverse('metrics'), REMOTE_ADDR='127.0.0.1', **headers
+                )
+                self.assertEqual(response.status_code, 404)
+
+    @override_settings(METRICS_TOKEN=None)
+    def test_metrics_closed_without_token_setting(self):
+        response = self.client.get(
+            reverse('metrics'), HTTP_AUTHORIZATION='Bearer None'
+        )
+        self.assertEqual(response.status_code, 404)
+
+    @override_settings(METRICS_DIR=TEMP_METRICS_DIR)
+    def test_workers_summed_from_directory(self):
+        """Значения других воркеров берутся из их файлов и суммируются."""
+        labels = (('view', 'posts:popular'),)
+        own = counter('yatube_db_queries_total', labels)
+        with open(os.path.join(TEMP_METRICS_DIR, '1.json'), 'w') as other:
+            json.dump({
+                'counters': [['yatube_db_queries_total', labels, 5]],
+                'histograms': [],
+            }, other)
+        metrics.registry.dump(force=True)
+        self.assertTrue(os.path.exists(
+            os.path.join(TEMP_METRICS_DIR, f'{os.getpid()}.json')
+        ))
+        self.assertEqual(
+            counter('yatube_db_queries_total', labels), own + 5
+        )
+
+    def test_dead_worker_merged_into_aggregate(self):
+        """Файл завершившегося воркера вливается в общий и удаляется."""
+        directory = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, directory, ignore_errors=True)
+        labels = (('view', 'posts:groups'),)
+        own = counter('yatube_db_queries_total', labels)
+        with override_settings(METRICS_DIR=directory):
+            for pid, value in ((101, 2), (102, 3)):
+                path = os.path.join(directory, f'{pid}.json')
+                with open(path, 'w') as dead:
+                    json.dump({'counters': [
+                        ['yatube_db_queries_total', labels, value],
+                    ], 'histograms': []}, dead)
+            metrics.merge_worker(101)
+            self.assertEqual(
+                counter('yatube_db_queries_total', labels), own + 5
+            )
+            metrics.merge_worker(102)
+            self.assertEqual(
+                sorted(os.listdir(directory)), [metrics.AGGREGATE]
+            )
+            self.assertEqual(
+                counter('yatube_db_queries_total', labels), own + 5
+            )
+
+    def test_merged_file_not_counted_twice(self):
+        """Пока файл воркера не удалён после слияния, он не считается."""
+        directory = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, directory, ignore_errors=True)
+        labels = (('view', 'posts:groups'),)
+        own = counter('yatube_db_queries_total', labels)
+        snapshot = {
+            'counters': [['yatube_db_queries_total', labels, 4]],
+            'histograms': [],
+        }
+        with open(os.path.join(directory, '103.json'), 'w') as dead:
+            json.dump(snapshot, dead)
+        with open(os.path.join(directory, metrics.AGGREGATE), 'w') as total:
+            json.dump({**snapshot, 'merged': [103]}, total)
+        with override_settings(METRICS_DIR=directory):
+            self.assertEqual(
+                counter('yatube_db_queries_total', labels), own + 4
+            )
+
+    def test_unknown_methods_share_one_label(self):
+        """Нестандартные методы сводятся в method="other"."""
+        labels = (('view', 'posts:main_menu'), ('method', 'other'),
+                  ('status', '200'))
+        before = counter('yatube_requests_total', labels)
+        self.client.generic('BREW', reverse('posts:main_menu'))
+        self.client.generic('PROPFIND', reverse('posts:main_menu'))
+        self.assertEqual(
+            counter('yatube_requests_total', labels), before + 2
+        )
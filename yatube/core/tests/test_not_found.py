@@ -0,0 +1,110 @@
+from datetime import timedelta
+from io import StringIO
+
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.core.management import call_command
+from django.test import TestCase, override_settings
+from django.utils import timezone
+
+from core import not_found
+from core.models import NotFoundPath
+from posts.models import Post
+from posts.tests.fixtures import create_posts
+
+User = get_user_model()
+
+
+@override_settings(NOT_FOUND_CACHE_TIMEOUT=60)
+class NotFoundTest(TestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create_user(username='auth')
+
+    def setUp(self):
+        cache.clear()
+
+    def test_repeated_404_served_from_cache(self):
+        """Повторный 404 гостю отдаётся без запросов к базе и шаблонов."""
+        missing = f'/profile/{self.user.username}/missing/'
+        self.client.get(missing)
+        with self.assertNumQueries(0):
+            response = self.client.get(missing)
+        self.assertEqual(response.status_code, 404)
+        self.assertEqual(response.templates, [])
+        self.assertContains(response, missing, status_code=404)
+
+    def test_new_objects_invalidate_cache(self):
+        """Новый пользователь и смена имени сбрасывают отрицательный кеш."""
+        address = '/profile/newcomer/'
+        self.assertEqual(self.client.get(address).status_code, 404)
+        newcomer = User.objects.create_user(username='newcomer')
+        self.assertEqual(self.client.get(address).status_code, 200)
+        self.assertEqual(self.client.get('/profile/renamed/').status_code, 404)
+        newcomer.username = 'renamed'
+        newcomer.save()
+        self.assertEqual(self.client.get('/profile/renamed/').status_code, 200)
+
+    def test_new_post_forgets_only_its_address(self):
+        """Новый пост убирает из кеша свой адрес, а не все сразу."""
+        last = Post.objects.order_by('-pk').values_list('pk', flat=True)
+        next_pk = (last.first() or 0) + 1
+        address = f'/posts/{next_pk}/'
+        self.client.get(address)
+        self.client.get('/posts/lost/')
+        post, = create_posts(self.user)
+        self.assertEqual(post.pk, next_pk)
+        self.assertIsNone(cache.get(not_found.key(address)))
+        self.assertTrue(cache.get(not_found.key('/posts/lost/')))
+
+    def test_logged_in_user_not_cached(self):
+        """Пользователь с сессией всегда получает 404 от view."""
+        self.client.force_login(self.user)
+        self.client.get('/posts/lost/')
+        response = self.client.get('/posts/lost/')
+        self.assertEqual(response.status_code, 404)
+        self.assertTemplateUsed(response, 'core/404.html')
+
+    def test_top_404(self):
+        """top_404 сбрасывает счётчики и выводит адреса по числу ответов."""
+        for address in ('/lost/', '/lost/', '/lost/', '/gone/'):
+            self.client.get(address)
+        out = StringIO()
+        call_command('top_404', limit=1, stdout=out)
+        self.assertEqual(out.getvalue().split(), ['3', '/lost/'])
+        call_command('top_404', reset=True, stdout=StringIO())
+        self.assertFalse(NotFoundPath.objects.exists())
+
+    def test_single_hits_not_stored(self):
+        """Адреса, отвечавшие 404 один раз, не попадают в базу."""
+        for number in range(5):
+            self.client.get(f'/scan-{number}/')
+        not_found.hits.flush()
+        self.assertFalse(NotFoundPath.objects.exists())
+
+    @override_settings(NOT_FOUND_MAX_PATHS=2)
+    def test_paths_capped(self):
+        """Адресов в базе не больше NOT_FOUND_MAX_PATHS."""
+        for number in range(4):
+            for _ in range(2):
+                not_found.record(f'/scan-{number}/')
+        not_found.hits.flush()
+        self.assertEqual(NotFoundPath.objects.count(), 2)
+        not_found.record('/scan-0/')
+        not_found.hits.flush()
+        self.assertEqual(NotFoundPath.objects.count(), 2)
+
+    def test_prune(self):
+        """--prune удаляет адреса, давно не отвечавшие 404."""
+        for address in ('/old/', '/old/', '/recent/', '/recent/'):
+            not_found.record(address)
+        not_found.hits.flush()
+        NotFoundPath.objects.filter(path='/old/').update(
+            last_seen=timezone.now() - timedelta(days=31)
+        )
+        call_command('top_404', prune=30, stdout=StringIO())
+        self.assertQuerysetEqual(
+            NotFoundPath.objects.values_list('path', flat=True),
+            ['/recent/'], transform=str,
+        )
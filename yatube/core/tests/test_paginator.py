@@ -0,0 +1,43 @@
+from unittest import mock
+
+from django.contrib.auth import get_user_model
+from django.db import connection
+from django.test import TestCase
+
+from core import paginator
+from core.paginator import EstimatedCountPaginator
+
+User = get_user_model()
+
+
+class EstimatedCountPaginatorTests(TestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        User.objects.bulk_create(
+            User(username=f'user{number}') for number in range(5)
+        )
+
+    def test_small_table_counted_exactly(self):
+        self.assertEqual(
+            EstimatedCountPaginator(User.objects.all(), 2).count, 5
+        )
+
+    def test_large_table_uses_estimate(self):
+        with mock.patch.object(
+            paginator, 'estimate_count', return_value=10 ** 6
+        ):
+            self.assertEqual(
+                EstimatedCountPaginator(User.objects.all(), 2).count, 10 ** 6
+            )
+
+    def test_filtered_count_is_capped(self):
+        users = User.objects.filter(username__startswith='user')
+        with mock.patch.object(paginator, 'MAX_EXACT_COUNT', 3):
+            self.assertEqual(EstimatedCountPaginator(users, 2).count, 3)
+
+    def test_sqlite_stat(self):
+        """После ANALYZE оценка берётся из sqlite_stat1."""
+        with connection.cursor() as cursor:
+            cursor.execute('ANALYZE')
+        self.assertEqual(paginator.estimate_count(User), 5)
@@ -0,0 +1,87 @@
+import os
+import shutil
+import tempfile
+
+from django.conf import settings
+from django.http import HttpResponse
+from django.test import RequestFactory, TestCase, override_settings
+
+from core import prerender
+from core.middleware import PrerenderedPagesMiddleware
+from core.views import csrf_failure
+
+TEMP_PRERENDER_ROOT = tempfile.mkdtemp()
+
+
+@override_settings(PRERENDER_ROOT=TEMP_PRERENDER_ROOT)
+class PrerenderTest(TestCase):
+
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        prerender.prerender_all()
+
+    @classmethod
+    def tearDownClass(cls):
+        super().tearDownClass()
+        shutil.rmtree(TEMP_PRERENDER_ROOT, ignore_errors=True)
+        prerender.error_page.cache_clear()
+
+    def setUp(self):
+        self.middleware = PrerenderedPagesMiddleware(
+            lambda request: HttpResponse('view')
+        )
+
+    def test_pages_written(self):
+        """Страницы и ошибки лежат по своим адресам со сжатыми копиями."""
+        for name in ('about/author/index.html', 'about/tech/index.html',
+                     'errors/404.html', 'errors/403csrf.html'):
+            with self.subTest(name=name):
+                path = os.path.join(TEMP_PRERENDER_ROOT, name)
+                self.assertTrue(os.path.exists(path))
+                self.assertTrue(os.path.exists(path + '.gz'))
+
+    def test_guest_gets_prerendered_page(self):
+        """Гость получает страницу из файла с долгим кешем."""
+        response = self.middleware(RequestFactory().get('/about/author/'))
+        self.assertEqual(
+            b''.join(response.streaming_content),
+            self.client.get('/about/author/').content,
+        )
+        self.assertEqual(
+            response['Cache-Control'],
+            f'public, max-age={settings.PRERENDER_MAX_AGE}'
+        )
+        self.assertEqual(response['Content-Type'], 'text/html; charset=utf-8')
+        self.assertIn('Cookie', response['Vary'])
+
+    def test_session_and_unknown_pages_passed_to_view(self):
+        """С cookie сессии и на другие адреса работает обычный view."""
+        factory = RequestFactory()
+        with_session = factory.get('/about/author/')
+        with_session.COOKIES[settings.SESSION_COOKIE_NAME] = 'key'
+        for request in (with_session, factory.get('/about/'),
+                        factory.post('/about/author/')):
+            with self.subTest(path=request.path, method=request.method):
+                self.assertEqual(self.middleware(request).content, b'view')
+
+    def test_prerendered_404_substitutes_escaped_path(self):
+        """В готовую страницу 404 подставляется экранированный адрес."""
+        response = self.client.get('/no-such-page/<b>/')
+        self.assertEqual(response.status_code, 404)
+        self.assertEqual(response.templates, [])
+        self.assertContains(
+            response, '/no-such-page/&lt;b&gt;/', status_code=404
+        )
+        self.assertNotContains(
+            response, prerender.PATH_MARKER, status_code=404
+        )
+
+    def test_csrf_failure_is_forbidden(self):
+        """Страница ошибки CSRF отвечает 403 и из файла, и из шаблона."""
+        factory = RequestFactory()
+        with_session = factory.post('/create/')
+        with_session.COOKIES[settings.SESSION_COOKIE_NAME] = 'key'
+        for request in (factory.post('/create/'), with_session):
+            with self.subTest(session=bool(request.COOKIES)):
+                self.assertEqual(csrf_failure(request).status_code, 403)
@@ -0,0 +1,23 @@
+from unittest import mock
+
+from django.test import TestCase
+
+from core.sessions import SessionStore
+
+
+class SessionStoreTest(TestCase):
+
+    def test_missing_session_cached(self):
+        """Несуществующая сессия проверяется в базе один раз."""
+        SessionStore('missing-session-key').load()
+        with self.assertNumQueries(0):
+            self.assertEqual(SessionStore('missing-session-key').load(), {})
+
+    def test_rejected_key_is_not_an_error(self):
+        """Ключ, который кеш не принимает, даёт пустую сессию, а не 500."""
+        store = SessionStore('forged key ' + 'x' * 300)
+        with mock.patch.object(
+            store._cache, 'get', side_effect=ValueError
+        ), mock.patch.object(store._cache, 'set', side_effect=ValueError):
+            self.assertEqual(store.load(), {})
+        self.assertIsNone(store.session_key)
@@ -0,0 +1,90 @@
+import gzip
+import json
+import os
+import shutil
+import tempfile
+
+from django.http import HttpResponse
+from django.test import RequestFactory, SimpleTestCase, override_settings
+
+from core.middleware import IMMUTABLE_CACHE_CONTROL, StaticFilesMiddleware
+from core.staticfiles import purge_css
+
+TEMP_STATIC_ROOT = tempfile.mkdtemp()
+
+CSS = 'body{margin:0}.used{color:red}.unused{color:blue}'
+
+
+class PurgeCssTest(SimpleTestCase):
+
+    def test_unused_selectors_removed(self):
+        """Правила с неиспользуемыми классами удаляются."""
+        css = (
+            '@charset "UTF-8";/*! license */:root{--a:1}'
+            '.used,.unused{color:red}.unused>.used{margin:0}'
+            '@media (min-width:576px){.unused{top:0}.used{top:1px}}'
+            '@keyframes spin{to{transform:rotate(360deg)}}'
+            '.used:not(.unused){left:0}'
+        )
+        self.assertEqual(
+            purge_css(css, {'used'}),
+            '@charset "UTF-8";/*! license */:root{--a:1}'
+            '.used{color:red}'
+            '@media (min-width:576px){.used{top:1px}}'
+            '@keyframes spin{to{transform:rotate(360deg)}}'
+            '.used:not(.unused){left:0}'
+        )
+
+
+@override_settings(STATIC_ROOT=TEMP_STATIC_ROOT, STATIC_URL='/static/')
+class StaticFilesMiddlewareTest(SimpleTestCase):
+
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        os.makedirs(os.path.join(TEMP_STATIC_ROOT, 'css'), exist_ok=True)
+        hashed = os.path.join(TEMP_STATIC_ROOT, 'css', 'app.0123456789ab.css')
+        for path in (hashed, os.path.join(TEMP_STATIC_ROOT, 'css', 'app.css')):
+            with open(path, 'w') as css_file:
+                css_file.write(CSS)
+        with gzip.open(hashed + '.gz', 'wt') as css_file:
+            css_file.write(CSS)
+        with open(
+            os.path.join(TEMP_STATIC_ROOT, 'staticfiles.json'), 'w'
+        ) as manifest:
+            json.dump({'paths': {'css/app.css': 'css/app.0123456789ab.css'}},
+                      manifest)
+
+    @classmethod
+    def tearDownClass(cls):
+        super().tearDownClass()
+        shutil.rmtree(TEMP_STATIC_ROOT, ignore_errors=True)
+
+    def setUp(self):
+        self.middleware = StaticFilesMiddleware(
+            lambda request: HttpResponse('view')
+        )
+        self.factory = RequestFactory()
+
+    def test_hashed_file_cached_forever(self):
+        """Файл с хешем в имени отдаётся сжатым и с вечным кешем."""
+        response = self.middleware(self.factory.get(
+            '/static/css/app.0123456789ab.css', HTTP_ACCEPT_ENCODING='gzip'
+        ))
+        self.assertEqual(response['Cache-Control'], IMMUTABLE_CACHE_CONTROL)
+        self.assertEqual(response['Content-Encoding'], 'gzip')
+        self.assertEqual(
+            gzip.decompress(b''.join(response.streaming_content)).decode(),
+            CSS
+        )
+
+    def test_unhashed_file_short_cache(self):
+        """Файл без хеша кешируется ненадолго и отдаётся как есть."""
+        response = self.middleware(self.factory.get('/static/css/app.css'))
+        self.assertNotEqual(response['Cache-Control'], IMMUTABLE_CACHE_CONTROL)
+        self.assertFalse(response.has_header('Content-Encoding'))
+
+    def test_other_paths_pass_through(self):
+        """Остальные запросы уходят дальше по цепочке middleware."""
+        response = self.middleware(self.factory.get('/static/missing.css'))
+        self.assertEqual(response.content, b'view')
@@ -0,0 +1,72 @@
+import hashlib
+import shutil
+import tempfile
+
+from django.core.files.base import ContentFile
+from django.core.files.storage import Storage
+from django.test import SimpleTestCase
+
+from core.storage import (
+    ContentAddressedFileSystemStorage, ContentAddressedMixin,
+)
+
+CONTENT = b'GIF89a picture'
+DIGEST = hashlib.sha256(CONTENT).hexdigest()
+EXPECTED_NAME = f'posts/{DIGEST[:2]}/{DIGEST[2:4]}/{DIGEST}.gif'
+
+
+class MemoryObjectStorage(Storage):
+    """Замена объектного хранилища: плоский словарь ключ - байты."""
+
+    def __init__(self):
+        self.objects = {}
+        self.writes = 0
+
+    def _save(self, name, content):
+        self.writes += 1
+        self.objects[name] = content.read()
+        return name
+
+    def _open(self, name, mode='rb'):
+        return ContentFile(self.objects[name], name=name)
+
+    def exists(self, name):
+        return name in self.objects
+
+    def delete(self, name):
+        self.objects.pop(name, None)
+
+
+class ContentAddressedObjectStorage(
+    ContentAddressedMixin, MemoryObjectStorage
+):
+    pass
+
+
+class ContentAddressedStorageTest(SimpleTestCase):
+
+    def setUp(self):
+        self.media_root = tempfile.mkdtemp()
+        self.storages = (
+            ContentAddressedFileSystemStorage(location=self.media_root),
+            ContentAddressedObjectStorage(),
+        )
+
+    def tearDown(self):
+        shutil.rmtree(self.media_root, ignore_errors=True)
+
+    def test_name_is_sharded_content_hash(self):
+        """Имя файла - хеш содержимого, разложенный по подкаталогам."""
+        for storage in self.storages:
+            with self.subTest(storage=type(storage).__name__):
+                name = storage.save('posts/Small.GIF', ContentFile(CONTENT))
+                self.assertEqual(name, EXPECTED_NAME)
+                self.assertEqual(storage.open(name).read(), CONTENT)
+
+    def test_identical_uploads_deduplicated(self):
+        """Повторная загрузка того же содержимого не создаёт копию."""
+        storage = ContentAddressedObjectStorage()
+        first = storage.save('posts/a.gif', ContentFile(CONTENT))
+        second = storage.save('posts/b.gif', ContentFile(CONTENT))
+        self.assertEqual(first, second)
+        self.assertEqual(storage.writes, 1)
@@ -1,11 +1,73 @@
+import hmac
+from urllib.parse import urlsplit
+
+from django.conf import settings
+from django.http import Http404, HttpResponse, HttpResponseForbidden
 from django.shortcuts import render
+from django.urls import Resolver404, resolve
+from django.utils.cache import patch_cache_control, patch_vary_headers
+
+from . import metrics as metrics_registry
+from . import prerender
+
+# Персональные фрагменты страниц (см. core.holes), доступные клиенту.
+FRAGMENTS = {
+    'header': 'includes/header.html',
+}
 
 
 def page_not_found(request, exception):
     # Переменная exception содержит отладочную информацию;
     # выводить её в шаблон пользовательской страницы 404 мы не станем
+    content = prerender.error_content(request, '404', request.path)
+    if content is not None:
+        return HttpResponse(content, status=404)
     return render(request, 'core/404.html', {'path': request.path}, status=404)
 
 
 def csrf_failure(request, reason=''):
-    return render(request, 'core/403csrf.html')
+    content = prerender.error_content(request, '403csrf')
+    if content is not None:
+        return HttpResponseForbidden(content)
+    return render(request, 'core/403csrf.html', status=403)
+
+
+def fragment(request, name):
+    """
+    Фрагмент для текущего пользователя, например
+    /fragments/header/?path=/group/cats/ - шапка с активным пунктом меню
+    для страницы path.
+    """
+    if name not in FRAGMENTS:
+        raise Http404
+    path = request.GET.get('path')
+    if path:
+        try:
+            request.resolver_match = resolve(urlsplit(path).path)
+        except Resolver404:
+            pass
+    response = render(request, FRAGMENTS[name])
+    patch_cache_control(response, private=True, max_age=0)
+    patch_vary_headers(response, ('Cookie',))
+    return response
+
+
+def metrics(request):
+    """
+    Метрики всех воркеров для Prometheus; только с заголовком
+    Authorization: Bearer <METRICS_TOKEN>. Без токена в настройках
+    адреса как будто нет.
+
+    Адрес клиента для доступа не годится: за локальным прокси все
+    запросы приходят с 127.0.0.1, а X-Forwarded-For подделывается.
+    """
+    token = getattr(settings, 'METRICS_TOKEN', None)
+    if not token or not hmac.compare_digest(
+        request.META.get('HTTP_AUTHORIZATION', '').encode(),
+        f'Bearer {token}'.encode(),
+    ):
+        raise Http404
+    return HttpResponse(
+        metrics_registry.exposition(),
+        content_type='text/plain; version=0.0.4; charset=utf-8',
+    )
@@ -0,0 +1,41 @@
+"""
+Прогрев процесса до первого запроса.
+
+Вызывается из yatube.wsgi. Под gunicorn с preload_app прогрев выполняется
+один раз в мастере, и воркеры наследуют загруженные модули и шаблоны при
+fork; без preload он переносит ту же работу с первого запроса на старт.
+"""
+from django.conf import settings
+from django.template import TemplateDoesNotExist, engines
+from django.template.loaders.cached import Loader as CachedLoader
+from django.template.loader import get_template
+from django.urls import get_resolver
+
+# Шаблоны самых частых страниц; кешируются, если включён cached.Loader.
+WARM_UP_TEMPLATES = (
+    'posts/index.html',
+    'posts/group_list.html',
+    'posts/profile.html',
+    'posts/post_detail.html',
+)
+
+
+def uses_cached_loader():
+    return any(
+        isinstance(loader, CachedLoader)
+        for engine in engines.all()
+        for loader in getattr(engine, 'engine', engine).template_loaders
+    )
+
+
+def warm_up():
+    # Загружает urlconf, а с ним все модули views и формы.
+    get_resolver().url_patterns
+    if not uses_cached_loader():
+        # Без кеша шаблон всё равно перечитается на каждом запросе.
+        return
+    for name in getattr(settings, 'WARM_UP_TEMPLATES', WARM_UP_TEMPLATES):
+        try:
+            get_template(name)
+        except TemplateDoesNotExist:
+            pass
@@ -0,0 +1,65 @@
+"""
+Настройки gunicorn для боевого сервера. Запуск из каталога с manage.py:
+
+    YATUBE_ENV=prod gunicorn yatube.wsgi
+
+Время старта воркера: manage.py profile_startup. Django 2.2 импортирует
+distutils, и setuptools подменяет его медленной копией с pkg_resources;
+до Python 3.12 это отключается переменной окружения сервиса
+SETUPTOOLS_USE_DISTUTILS=stdlib (задать её можно только до запуска
+интерпретатора, не здесь).
+"""
+import gc
+import glob
+import multiprocessing
+import os
+
+bind = os.environ.get('GUNICORN_BIND', '127.0.0.1:8000')
+workers = int(os.environ.get(
+    'GUNICORN_WORKERS', multiprocessing.cpu_count() * 2 + 1
+))
+
+# Приложение загружается и прогревается (core.warmup) один раз в мастере.
+# Воркеры получают модули, urlconf и шаблоны через fork общими страницами
+# памяти, поэтому новый или перезапущенный воркер готов сразу.
+preload_app = True
+
+# Перезапуск воркеров ограничивает рост памяти; с preload_app он дешёвый.
+max_requests = 1000
+max_requests_jitter = 100
+
+
+def on_starting(server):
+    # Метрики прошлого запуска (core.metrics) не должны попасть в сумму.
+    directory = os.environ.get(
+        'DJANGO_METRICS_DIR',
+        os.path.join(os.path.dirname(os.path.abspath(__file__)), 'metrics'),
+    )
+    for path in glob.glob(os.path.join(directory, '*.json')):
+        os.remove(path)
+
+
+def when_ready(server):
+    # Сборщик мусора, обходя объекты, пишет в их заголовки и этим
+    # копирует общие страницы в каждый воркер. Загруженное до fork
+    # выводим из-под сборки.
+    gc.freeze()
+
+
+def worker_exit(server, worker):
+    # Последние метрики воркера, накопленные после периодического сброса.
+    from core.metrics import registry
+    registry.dump(force=True)
+
+
+def child_exit(server, worker):
+    # Файл метрик завершившегося воркера вливается в общую сумму, а не
+    # копится рядом с файлами живых воркеров.
+    from core.metrics import merge_worker
+    merge_worker(worker.pid)
+
+
+def post_fork(server, worker):
+    # Соединения, открытые мастером при загрузке, воркерам не делятся.
+    from django.db import connections
+    connections.close_all()
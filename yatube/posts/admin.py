@@ -1,9 +1,31 @@
+from django import forms
 from django.contrib import admin
+from django.contrib.admin import helpers
+from django.contrib.admin.models import CHANGE, DELETION, LogEntry
+from django.contrib.auth import get_user_model
+from django.contrib.contenttypes.models import ContentType
+from django.template.response import TemplateResponse
 
-from .models import Group, Post, Comment
+from core.paginator import EstimatedCountPaginator
+
+from . import bulk
+from .models import Group, Like, Post, Comment
+
+User = get_user_model()
+
+
+class MoveToGroupForm(forms.Form):
+    group = forms.ModelChoiceField(
+        Group.objects.all(), required=False, label='Группа',
+        empty_label='без группы',
+    )
 
 
 class PostAdmin(admin.ModelAdmin):
+    """
+    Действия над выбранными постами выполняются набором UPDATE/DELETE
+    пачками (posts.bulk), а не циклом по объектам с сигналами.
+    """
 
     list_display = (
         'pk',
@@ -11,15 +33,149 @@ class PostAdmin(admin.ModelAdmin):
         'created',
         'author',
         'group',
+        'likes_count',
     )
     list_editable = ('group',)
+    list_select_related = ('author', 'group')
     search_fields = ('text',)
     list_filter = ('created',)
     empty_value_display = '-пусто-'
+    paginator = EstimatedCountPaginator
+    show_full_result_count = False
+    actions = [
+        'move_to_group', 'clear_images', 'purge_authors', 'delete_posts',
+    ]
+
+    def get_actions(self, request):
+        actions = super().get_actions(request)
+        # Стандартное удаление грузит и удаляет каждый объект отдельно.
+        actions.pop('delete_selected', None)
+        return actions
+
+    def formfield_for_foreignkey(self, db_field, request, **kwargs):
+        field = super().formfield_for_foreignkey(db_field, request, **kwargs)
+        if db_field.name == 'group' and field is not None:
+            # Список групп выбирается один раз, а не в каждой строке
+            # редактируемого списка.
+            field.choices = list(field.choices)
+        return field
+
+    def confirm(self, request, queryset, description, form=None):
+        """Промежуточная страница действия; None, если уже подтверждено."""
+        if 'apply' in request.POST and (form is None or form.is_valid()):
+            return None
+        selected = request.POST.getlist(helpers.ACTION_CHECKBOX_NAME)
+        select_across = request.POST.get('select_across') == '1'
+        count = queryset.count() if select_across else len(selected)
+        context = {
+            **self.admin_site.each_context(request),
+            'title': description,
+            'description': f'{description}: выбрано постов - {count}.',
+            'opts': self.model._meta,
+            'form': form,
+            'selected': selected,
+            'select_across': int(select_across),
+            'action': request.POST['action'],
+            'action_checkbox_name': helpers.ACTION_CHECKBOX_NAME,
+        }
+        return TemplateResponse(
+            request, 'admin/posts/post/bulk_action.html', context
+        )
+
+    def log_action(self, request, action_flag, message):
+        """
+        Одна запись журнала админки на действие: посты удаляются пачками,
+        и запись на каждый объект стоила бы столько же, сколько удаление.
+        """
+        LogEntry.objects.log_action(
+            user_id=request.user.pk,
+            content_type_id=ContentType.objects.get_for_model(self.model).pk,
+            object_id=None,
+            object_repr=message[:200],
+            action_flag=action_flag,
+            change_message=message,
+        )
+
+    def move_to_group(self, request, queryset):
+        form = MoveToGroupForm(
+            request.POST if 'apply' in request.POST else None
+        )
+        response = self.confirm(
+            request, queryset, 'Перенести посты в группу', form
+        )
+        if response is not None:
+            return response
+        group = form.cleaned_data['group']
+        moved = bulk.in_chunks(bulk.move_posts, queryset, group)
+        message = f'Перенесено постов: {moved} в «{group or "без группы"}»'
+        self.log_action(request, CHANGE, message)
+        self.message_user(request, message)
+    move_to_group.short_description = 'Перенести в группу'
+    move_to_group.allowed_permissions = ('change',)
+
+    def clear_images(self, request, queryset):
+        response = self.confirm(request, queryset, 'Убрать картинки постов')
+        if response is not None:
+            return response
+        cleared = bulk.in_chunks(bulk.clear_images, queryset)
+        message = f'Картинки убраны у постов: {cleared}'
+        self.log_action(request, CHANGE, message)
+        self.message_user(request, message)
+    clear_images.short_description = 'Убрать картинки'
+    clear_images.allowed_permissions = ('change',)
+
+    def purge_authors(self, request, queryset):
+        response = self.confirm(
+            request, queryset,
+            'Удалить все посты и комментарии авторов выбранных постов'
+        )
+        if response is not None:
+            return response
+        authors = list(User.objects.filter(
+            pk__in=queryset.order_by().values('author')
+        ))
+        posts, comments = bulk.purge_authors(authors)
+        message = f'Удалено постов: {posts}, комментариев: {comments}'
+        self.log_action(request, DELETION, '{} (авторы: {})'.format(
+            message, ', '.join(author.username for author in authors)
+        ))
+        self.message_user(request, message)
+    purge_authors.short_description = 'Удалить всё от авторов'
+    purge_authors.allowed_permissions = ('delete',)
+
+    def delete_posts(self, request, queryset):
+        response = self.confirm(request, queryset, 'Удалить посты')
+        if response is not None:
+            return response
+        deleted = bulk.in_chunks(bulk.delete_posts, queryset)
+        message = f'Удалено постов: {deleted}'
+        self.log_action(request, DELETION, message)
+        self.message_user(request, message)
+    delete_posts.short_description = 'Удалить выбранные посты'
+    delete_posts.allowed_permissions = ('delete',)
+
+
+class CommentAdmin(admin.ModelAdmin):
+
+    def delete_queryset(self, request, queryset):
+        # Одним DELETE на пачку, с пересчётом comment_count постов.
+        bulk.in_chunks(bulk.delete_comments, queryset)
+
+
+class LikeAdmin(admin.ModelAdmin):
+    """Удаление лайков вычитает их из likes_count постов."""
+
+    def delete_model(self, request, obj):
+        bulk.delete_likes([obj.pk])
+
+    def delete_queryset(self, request, queryset):
+        bulk.in_chunks(bulk.delete_likes, queryset)
 
 
 admin.site.register(Post, PostAdmin)
 
 admin.site.register(Group)
 
-admin.site.register(Comment)
+admin.site.register(Comment, CommentAdmin)
+
+admin.site.register(Like, LikeAdmin)
@@ -0,0 +1,38 @@
+"""
+Перенос старых постов с комментариями в архивные таблицы.
+
+Пачка постов сначала копируется в архив и фиксируется там, затем
+удаляется из живых таблиц набором DELETE без загрузки объектов (см.
+posts.bulk) в отдельной транзакции. Архив может лежать в другой базе, и
+общей транзакции у них нет: если удаление не пройдёт, повторный перенос
+той же пачки безопасен - уже скопированные строки пропускаются. Обратный
+порядок терял бы посты, удалённые до фиксации архива. Каждая транзакция
+короткая, чтобы не держать блокировку SQLite на весь перенос.
+"""
+from django.db import router, transaction
+
+from .bulk import delete_posts
+from .models import ArchivedComment, ArchivedPost, Comment, Post
+
+
+def archive_batch(ids):
+    """Переносит в архив посты с первичными ключами ids."""
+    posts = list(Post.objects.filter(pk__in=ids))
+    if not posts:
+        return 0
+    ids = [post.pk for post in posts]
+    comments = Comment.objects.filter(post_id__in=ids)
+    archive_db = router.db_for_write(ArchivedPost)
+    live_db = router.db_for_write(Post)
+    with transaction.atomic(using=archive_db):
+        ArchivedPost.objects.bulk_create(
+            [ArchivedPost.from_post(post) for post in posts],
+            ignore_conflicts=True,
+        )
+        ArchivedComment.objects.bulk_create(
+            [ArchivedComment.from_comment(comment) for comment in comments],
+            ignore_conflicts=True,
+        )
+    with transaction.atomic(using=live_db):
+        delete_posts(ids)
+    return len(posts)
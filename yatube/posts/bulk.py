@@ -0,0 +1,164 @@
+"""
+Массовые операции над постами набором запросов, а не циклом по объектам.
+
+QuerySet.update и _raw_delete не вызывают сигналы, поэтому всё, что
+сигналы поддерживают (статистика групп, last_post, поколение кеша лент),
+пересчитывается здесь явно. Большие выборки обрабатываются пачками по
+CHUNK_SIZE строк, каждая в своей транзакции: блокировка базы не держится
+дольше одной пачки.
+"""
+from collections import Counter, defaultdict
+from functools import partial
+
+from django.db import router, transaction
+from django.db.models import F
+
+from core import generations
+from core.holes import COMMENTS_GENERATION
+from core.holes import GENERATION as FEED_GENERATION
+
+from . import counters, feeds, group_stats, sitemaps
+from .models import Comment, Group, Like, Post
+
+CHUNK_SIZE = 1000
+
+
+def chunked_ids(queryset, size=CHUNK_SIZE):
+    """
+    Первичные ключи queryset пачками по size, по возрастанию.
+
+    Следующая пачка выбирается условием pk > последнего, поэтому строки
+    предыдущей пачки можно удалять или менять на ходу.
+    """
+    queryset = queryset.order_by('pk').values_list('pk', flat=True)
+    last = None
+    while True:
+        batch = queryset if last is None else queryset.filter(pk__gt=last)
+        ids = list(batch[:size])
+        if not ids:
+            return
+        yield ids
+        last = ids[-1]
+
+
+def group_ids(ids):
+    return set(
+        Post.objects.filter(pk__in=ids)
+        .exclude(group=None)
+        .values_list('group_id', flat=True)
+        .distinct()
+    )
+
+
+def delete_posts(ids):
+    """Удаляет посты ids вместе с лайками и комментариями."""
+    db = router.db_for_write(Post)
+    groups = group_ids(ids)
+    authors = set(
+        Post.objects.filter(pk__in=ids).values_list('author_id', flat=True)
+    )
+    Like.objects.filter(post_id__in=ids)._raw_delete(db)
+    Comment.objects.filter(post_id__in=ids)._raw_delete(db)
+    Group.objects.filter(last_post_id__in=ids).update(last_post=None)
+    deleted = Post.objects.filter(pk__in=ids)._raw_delete(db)
+    group_stats.rebuild(Group.objects.filter(pk__in=groups))
+    generations.bump(FEED_GENERATION)
+    feeds.groups_changed(groups)
+    feeds.authors_changed(authors)
+    sitemaps.groups_changed()
+    sitemaps.posts_removed()
+    return deleted
+
+
+def move_posts(ids, group):
+    """Переносит посты ids в группу group (None - убрать из группы)."""
+    groups = group_ids(ids)
+    if group is not None:
+        groups.add(group.pk)
+    moved = Post.objects.filter(pk__in=ids).update(group=group)
+    group_stats.rebuild(Group.objects.filter(pk__in=groups))
+    generations.bump(FEED_GENERATION)
+    feeds.groups_changed(groups)
+    sitemaps.groups_changed()
+    return moved
+
+
+def clear_images(ids):
+    """Отвязывает картинки; сами файлы удалит gc_media."""
+    cleared = (
+        Post.objects.filter(pk__in=ids).exclude(image='').update(image='')
+    )
+    generations.bump(FEED_GENERATION)
+    return cleared
+
+
+def uncount_comments(post_ids):
+    """
+    Вычитает удаляемые комментарии из comment_count постов; post_ids -
+    пост каждого комментария. Одно UPDATE на каждое различное число
+    комментариев, а не на пост.
+    """
+    posts_by_count = defaultdict(list)
+    for post_id, count in Counter(post_ids).items():
+        posts_by_count[count].append(post_id)
+    for count, post_ids in posts_by_count.items():
+        Post.objects.filter(pk__in=post_ids).update(
+            comment_count=F('comment_count') - count
+        )
+    if posts_by_count:
+        generations.bump(COMMENTS_GENERATION)
+
+
+def delete_comments(ids):
+    """Удаляет комментарии ids и уменьшает comment_count их постов."""
+    using = router.db_for_write(Comment)
+    with transaction.atomic(using=using):
+        comments = Comment.objects.filter(pk__in=ids)
+        # Строки заблокированы до удаления: параллельное удаление тех же
+        # комментариев не вычтет их из счётчика второй раз.
+        uncount_comments(
+            comments.select_for_update().values_list('post_id', flat=True)
+        )
+        return comments._raw_delete(using)
+
+
+def uncount_likes(post_ids):
+    """
+    Вычитает удаляемые лайки из likes_count постов через буфер
+    счётчика; post_ids - пост каждого лайка. Вычитание ставится после
+    фиксации транзакции, чтобы откат удаления не уменьшил счётчик.
+    """
+    for post_id, count in Counter(post_ids).items():
+        transaction.on_commit(
+            partial(counters.likes.incr, post_id, -count),
+            using=router.db_for_write(Like),
+        )
+
+
+def delete_likes(ids):
+    """Удаляет лайки ids и уменьшает likes_count их постов."""
+    using = router.db_for_write(Like)
+    with transaction.atomic(using=using):
+        likes = Like.objects.filter(pk__in=ids)
+        uncount_likes(
+            likes.select_for_update().values_list('post_id', flat=True)
+        )
+        return likes._raw_delete(using)
+
+
+def in_chunks(operation, queryset, *args):
+    """Применяет operation(ids, *args) к queryset пачками."""
+    total = 0
+    for ids in chunked_ids(queryset):
+        with transaction.atomic(using=router.db_for_write(queryset.model)):
+            total += operation(ids, *args) or 0
+    return total
+
+
+def purge_authors(authors):
+    """Удаляет все посты и комментарии авторов authors."""
+    posts = in_chunks(delete_posts, Post.objects.filter(author__in=authors))
+    comments = in_chunks(
+        delete_comments, Comment.objects.filter(author__in=authors)
+    )
+    return posts, comments
@@ -0,0 +1,48 @@
+"""Счётчики постов, которые пишутся в базу пачками (см. core.counters)."""
+import hashlib
+
+from django.conf import settings
+from django.core.cache import cache
+
+from core.counters import BufferedCounter
+from core.ratelimit import client_ip
+
+from . import trending
+from .models import Post
+
+
+def views_flushed(deltas):
+    """Сброшенные просмотры поднимают посты в популярных."""
+    trending.record_many({
+        pk: trending.VIEW_WEIGHT * delta for pk, delta in deltas.items()
+    })
+
+
+likes = BufferedCounter('likes', Post, 'likes_count')
+views = BufferedCounter(
+    'views', Post, 'views_count', on_flush=views_flushed
+)
+
+COUNTERS = (likes, views)
+
+
+def viewer_key(request):
+    """
+    Кто смотрит: ключ сессии, а без неё - хеш IP и User-Agent.
+
+    session_key берётся из cookie, сессия при этом не загружается и не
+    создаётся.
+    """
+    if request.session.session_key:
+        return request.session.session_key
+    fingerprint = '{}|{}'.format(
+        client_ip(request), request.META.get('HTTP_USER_AGENT', '')
+    )
+    return hashlib.md5(fingerprint.encode()).hexdigest()
+
+
+def record_view(request, post_id):
+    """Засчитывает просмотр, если этот зритель не видел пост за окно."""
+    key = f'views:seen:{post_id}:{viewer_key(request)}'
+    if cache.add(key, 1, getattr(settings, 'VIEWS_DEDUP_WINDOW', 1800)):
+        views.incr(post_id)
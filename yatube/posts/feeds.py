@@ -0,0 +1,156 @@
+"""
+RSS и Atom: последние посты группы и автора.
+
+Описание записи - отрывок поста (excerpt_html), полный текст из базы не
+читается. Ответы кешируются (core.conditional) до изменения постов своей
+группы или своего автора: у каждой ленты своё поколение, и новый пост
+не сбрасывает ленты остальных групп и авторов.
+"""
+from html import unescape
+
+from django.contrib.auth import get_user_model
+from django.contrib.syndication.views import Feed
+from django.core.cache import cache
+from django.shortcuts import get_object_or_404
+from django.urls import reverse
+from django.utils.feedgenerator import Atom1Feed
+from django.utils.html import strip_tags
+from django.utils.text import Truncator
+
+from core import generations
+
+from .models import FEED_DEFERRED_FIELDS, Group, Post
+
+User = get_user_model()
+
+FEED_ITEMS = 20
+TITLE_LENGTH = 60
+
+# Поколения всех лент групп и всех лент авторов: смена slug или имени
+# пользователя сбрасывает и ленту под старым адресом, и запомненные pk.
+GROUPS_GENERATION = 'feeds:groups'
+AUTHORS_GENERATION = 'feeds:authors'
+
+
+def group_generation(group_id):
+    return f'feeds:group:{group_id}'
+
+
+def author_generation(author_id):
+    return f'feeds:author:{author_id}'
+
+
+def object_id(model, field, value, scope):
+    """
+    pk объекта model по полю адреса. Запоминается в кеше до смены
+    поколения scope, чтобы ответ из кеша не стоил запроса к базе.
+    """
+    key = ':'.join((
+        'feeds:ids', model._meta.model_name,
+        str(generations.get(scope)), value,
+    ))
+    pk = cache.get(key)
+    if pk is None:
+        pk = model.objects.filter(**{field: value}).values_list(
+            'pk', flat=True
+        ).first()
+        if pk is not None:
+            cache.set(key, pk)
+    return pk
+
+
+def generation(request, slug=None, username=None):
+    """Поколения ленты для core.conditional по аргументам её адреса."""
+    if slug is not None:
+        return GROUPS_GENERATION, group_generation(
+            object_id(Group, 'slug', slug, GROUPS_GENERATION)
+        )
+    return AUTHORS_GENERATION, author_generation(
+        object_id(User, 'username', username, AUTHORS_GENERATION)
+    )
+
+
+def groups_changed(group_ids):
+    """Сбрасывает ленты групп group_ids."""
+    for group_id in group_ids:
+        generations.bump(group_generation(group_id))
+
+
+def authors_changed(author_ids):
+    """Сбрасывает ленты авторов author_ids."""
+    for author_id in author_ids:
+        generations.bump(author_generation(author_id))
+
+
+class PostFeed(Feed):
+    """
+    Общая часть лент: записи - посты, у которых поле post_field равно
+    объекту ленты.
+    """
+    post_field = None
+
+    def items(self, obj):
+        return (
+            Post.objects.filter(**{self.post_field: obj})
+            .select_related('author')
+            .defer(*FEED_DEFERRED_FIELDS)
+            .order_by('-created')[:FEED_ITEMS]
+        )
+
+    def item_title(self, post):
+        text = unescape(strip_tags(post.excerpt_html))
+        return Truncator(text).chars(TITLE_LENGTH)
+
+    def item_description(self, post):
+        return post.excerpt_html
+
+    def item_link(self, post):
+        return reverse('posts:post_detail', kwargs={'post_id': post.pk})
+
+    def item_pubdate(self, post):
+        return post.created
+
+    def item_author_name(self, post):
+        return post.author.get_full_name() or post.author.username
+
+
+class GroupFeed(PostFeed):
+    post_field = 'group'
+
+    def get_object(self, request, slug):
+        return get_object_or_404(Group, slug=slug)
+
+    def title(self, group):
+        return group.title
+
+    def link(self, group):
+        return reverse('posts:group_list', kwargs={'slug': group.slug})
+
+    def description(self, group):
+        return group.description
+
+
+class GroupAtomFeed(GroupFeed):
+    feed_type = Atom1Feed
+    subtitle = GroupFeed.description
+
+
+class AuthorFeed(PostFeed):
+    post_field = 'author'
+
+    def get_object(self, request, username):
+        return get_object_or_404(User, username=username)
+
+    def title(self, author):
+        return f'Посты {author.get_full_name() or author.username}'
+
+    def link(self, author):
+        return reverse('posts:profile', kwargs={'username': author.username})
+
+    def description(self, author):
+        return f'Последние посты {author.username} на Yatube'
+
+
+class AuthorAtomFeed(AuthorFeed):
+    feed_type = Atom1Feed
+    subtitle = AuthorFeed.description
@@ -0,0 +1,55 @@
+"""
+Денормализованная статистика групп: число постов и последний пост.
+
+Поддерживается сигналами posts.signals при сохранении и удалении поста,
+в том числе когда post_edit переносит пост в другую группу. Массовые
+операции в обход сигналов (QuerySet.update/delete) должны после себя
+вызвать rebuild() для затронутых групп; полный пересчёт - команда
+manage.py rebuild_group_stats.
+"""
+from django.db.models import Count, F, OuterRef, Q, Subquery, Value
+from django.db.models.functions import Coalesce
+
+from .models import Group, Post
+
+
+def post_added(group_id, post):
+    groups = Group.objects.filter(pk=group_id)
+    groups.update(posts_count=F('posts_count') + 1)
+    if post.created is not None:
+        groups.filter(
+            Q(last_post_at__isnull=True) | Q(last_post_at__lte=post.created)
+        ).update(last_post=post, last_post_at=post.created)
+
+
+def post_removed(group_id, post):
+    # При удалении поста last_post уже обнулён через SET_NULL.
+    groups = Group.objects.filter(pk=group_id)
+    groups.update(posts_count=F('posts_count') - 1)
+    if groups.filter(
+        Q(last_post_id=post.pk) | Q(last_post__isnull=True)
+    ).exists():
+        rebuild(groups, counts=False)
+
+
+def rebuild(groups, counts=True):
+    """Пересчитывает статистику групп из queryset groups одним UPDATE."""
+    latest = (
+        Post.objects.filter(group=OuterRef('pk'))
+        .exclude(created=None)
+        .order_by('-created', '-pk')
+    )
+    stats = {
+        'last_post': Subquery(latest.values('pk')[:1]),
+        'last_post_at': Subquery(latest.values('created')[:1]),
+    }
+    if counts:
+        counted = (
+            Post.objects.filter(group=OuterRef('pk'))
+            .order_by()
+            .values('group')
+            .annotate(count=Count('pk'))
+            .values('count')
+        )
+        stats['posts_count'] = Coalesce(Subquery(counted), Value(0))
+    return groups.update(**stats)
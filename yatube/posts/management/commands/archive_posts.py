@@ -0,0 +1,64 @@
+import time
+from datetime import timedelta
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from django.utils import timezone
+
+from posts.archive import archive_batch
+from posts.counters import COUNTERS
+from posts.models import Post
+
+
+class Command(BaseCommand):
+    help = (
+        'Переносит посты старше --days дней вместе с комментариями в '
+        'архивные таблицы. Страницы постов остаются доступны по старым '
+        'адресам, ленты читают только живые данные.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--days', type=int,
+            default=getattr(settings, 'ARCHIVE_AFTER_DAYS', 365),
+            help='Возраст поста, после которого он уходит в архив.'
+        )
+        parser.add_argument(
+            '--batch-size', type=int, default=100,
+            help='Постов в одной транзакции.'
+        )
+        parser.add_argument(
+            '--pause', type=float, default=0.1,
+            help='Пауза между пачками в секундах: даёт записать '
+                 'сайту, пока база не заблокирована.'
+        )
+        parser.add_argument(
+            '--dry-run', action='store_true',
+            help='Только посчитать посты для архивации.'
+        )
+
+    def handle(self, *args, **options):
+        cutoff = timezone.now() - timedelta(days=options['days'])
+        old_posts = Post.objects.filter(created__lt=cutoff)
+        if options['dry_run']:
+            self.stdout.write(f'Постов для архивации: {old_posts.count()}')
+            return
+        # Несброшенные лайки и просмотры иначе потерялись бы вместе
+        # с живой строкой поста.
+        for counter in COUNTERS:
+            counter.flush()
+        archived = 0
+        while True:
+            ids = list(
+                old_posts.order_by('created', 'pk')
+                .values_list('pk', flat=True)[:options['batch_size']]
+            )
+            if not ids:
+                break
+            archived += archive_batch(ids)
+            if options['verbosity'] > 1:
+                self.stdout.write(f'Перенесено {archived}')
+            time.sleep(options['pause'])
+        self.stdout.write(self.style.SUCCESS(
+            f'Перенесено в архив постов: {archived}'
+        ))
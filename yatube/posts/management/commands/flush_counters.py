@@ -0,0 +1,62 @@
+import time
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from django.db.models import Count, OuterRef, Subquery, Value
+from django.db.models.functions import Coalesce
+
+from core import not_found
+from posts.counters import COUNTERS
+from posts.models import Like, Post
+
+
+class Command(BaseCommand):
+    help = (
+        'Сбрасывает накопленные в кеше приращения счётчиков в базу. '
+        'Запросы только копят приращения, поэтому команду запускают по '
+        'расписанию или воркером с --every.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--every', type=float, nargs='?', metavar='SECONDS',
+            const=settings.COUNTERS_FLUSH_INTERVAL,
+            help='Не выходить, а сбрасывать раз в SECONDS секунд '
+                 '(по умолчанию COUNTERS_FLUSH_INTERVAL).'
+        )
+        parser.add_argument(
+            '--reconcile', action='store_true',
+            help='После сброса пересчитать likes_count по таблице лайков.'
+        )
+
+    def handle(self, *args, **options):
+        self.flush(options['verbosity'])
+        if options['reconcile']:
+            self.reconcile()
+        while options['every']:
+            time.sleep(options['every'])
+            self.flush(options['verbosity'] - 1)
+
+    def flush(self, verbosity):
+        for counter in (*COUNTERS, not_found.hits):
+            flushed = counter.flush()
+            if verbosity > 0:
+                self.stdout.write(
+                    f'{counter.name}: записано приращений для '
+                    f'{len(flushed)} объектов'
+                )
+
+    def reconcile(self):
+        likes = (
+            Like.objects.filter(post=OuterRef('pk'))
+            .order_by()
+            .values('post')
+            .annotate(count=Count('pk'))
+            .values('count')
+        )
+        updated = Post.objects.update(
+            likes_count=Coalesce(Subquery(likes), Value(0))
+        )
+        self.stdout.write(self.style.SUCCESS(
+            f'likes_count пересчитан для {updated} постов'
+        ))
@@ -0,0 +1,78 @@
+import posixpath
+from datetime import timedelta
+
+from django.core.files.storage import default_storage
+from django.core.management.base import BaseCommand
+from django.utils import timezone
+
+from posts.models import ArchivedPost, Post
+
+UPLOAD_DIRECTORY = 'posts'
+
+
+def walk(storage, directory):
+    """Все файлы каталога хранилища, включая вложенные."""
+    directories, files = storage.listdir(directory)
+    for name in files:
+        yield posixpath.join(directory, name)
+    for name in directories:
+        yield from walk(storage, posixpath.join(directory, name))
+
+
+class Command(BaseCommand):
+    help = (
+        'Удаляет загруженные картинки, на которые не ссылается ни один пост, '
+        'включая архивные.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--grace-hours', type=int, default=24,
+            help='Не трогать файлы моложе этого возраста: их пост может '
+                 'ещё сохраняться.'
+        )
+        parser.add_argument(
+            '--dry-run', action='store_true',
+            help='Только показать, что будет удалено.'
+        )
+
+    def referenced(self):
+        return {
+            name
+            for model in (Post, ArchivedPost)
+            for name in model.objects.exclude(image='')
+            .values_list('image', flat=True)
+        }
+
+    def still_orphaned(self, name):
+        """
+        Перепроверка перед удалением: обход большого каталога долгий, и
+        за это время файл могли загрузить для нового поста.
+        """
+        return not any(
+            model.objects.filter(image=name).exists()
+            for model in (Post, ArchivedPost)
+        )
+
+    def handle(self, *args, **options):
+        if not default_storage.exists(UPLOAD_DIRECTORY):
+            return
+        referenced = self.referenced()
+        deadline = timezone.now() - timedelta(hours=options['grace_hours'])
+        removed = 0
+        for name in walk(default_storage, UPLOAD_DIRECTORY):
+            if name in referenced:
+                continue
+            if default_storage.get_modified_time(name) > deadline:
+                continue
+            if not self.still_orphaned(name):
+                continue
+            removed += 1
+            if options['dry_run']:
+                self.stdout.write(name)
+            else:
+                default_storage.delete(name)
+        self.stdout.write(self.style.SUCCESS(
+            f'Осиротевших файлов: {removed}'
+            + (' (не удалены, --dry-run)' if options['dry_run'] else '')
+        ))
@@ -0,0 +1,25 @@
+from django.core.management.base import BaseCommand
+
+from posts import group_stats
+from posts.models import Group
+
+
+class Command(BaseCommand):
+    help = (
+        'Пересчитывает число постов и последний пост групп по таблице постов.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            'slugs', nargs='*',
+            help='Слаги групп; без них пересчитываются все группы.'
+        )
+
+    def handle(self, *args, **options):
+        groups = Group.objects.all()
+        if options['slugs']:
+            groups = groups.filter(slug__in=options['slugs'])
+        updated = group_stats.rebuild(groups)
+        self.stdout.write(self.style.SUCCESS(
+            f'Статистика пересчитана для {updated} групп'
+        ))
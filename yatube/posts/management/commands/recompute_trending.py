@@ -0,0 +1,46 @@
+from django.core.management.base import BaseCommand
+from django.db import transaction
+
+from posts import trending
+from posts.models import Comment, Post
+
+BATCH_SIZE = 500
+
+
+class Command(BaseCommand):
+    help = (
+        'Пересчитывает рейтинг популярных постов по истории комментариев. '
+        'Нужен после смены TRENDING_HALF_LIFE_HOURS или потери событий. '
+        'Просмотры хранятся только суммой без времени и в пересчёт не входят.'
+    )
+
+    def collect_scores(self):
+        scores = {}
+        comments = (
+            Comment.objects.order_by()
+            .values_list('post_id', 'created')
+            .iterator()
+        )
+        for post_id, created in comments:
+            scores[post_id] = trending.combine(
+                scores.get(post_id),
+                trending.event_score(trending.COMMENT_WEIGHT, created),
+            )
+        return scores
+
+    def handle(self, *args, **options):
+        scores = self.collect_scores()
+        posts = [
+            Post(pk=post_id, trending_score=score)
+            for post_id, score in scores.items()
+        ]
+        with transaction.atomic():
+            Post.objects.exclude(trending_score=None).update(
+                trending_score=None
+            )
+            Post.objects.bulk_update(
+                posts, ['trending_score'], batch_size=BATCH_SIZE
+            )
+        self.stdout.write(self.style.SUCCESS(
+            f'Рейтинг пересчитан для {len(posts)} постов'
+        ))
@@ -0,0 +1,38 @@
+from django.core.management.base import BaseCommand
+from django.db.models import Count, F, OuterRef, Subquery, Value
+from django.db.models.functions import Coalesce
+
+from core import generations
+from core.holes import COMMENTS_GENERATION
+from posts.models import Comment, Post
+
+
+class Command(BaseCommand):
+    help = (
+        'Пересчитывает comment_count постов по таблице комментариев. '
+        'Нужен после правок базы в обход сигналов и bulk.'
+    )
+
+    def handle(self, *args, **options):
+        counted = Coalesce(
+            Subquery(
+                Comment.objects.filter(post=OuterRef('pk'))
+                .order_by()
+                .values('post')
+                .annotate(count=Count('pk'))
+                .values('count')
+            ),
+            Value(0),
+        )
+        # Обновляются только разошедшиеся посты, чтобы не переписывать
+        # всю таблицу ради нескольких строк.
+        updated = (
+            Post.objects.annotate(counted=counted)
+            .exclude(comment_count=F('counted'))
+            .update(comment_count=counted)
+        )
+        if updated:
+            generations.bump(COMMENTS_GENERATION)
+        self.stdout.write(self.style.SUCCESS(
+            f'comment_count исправлен у {updated} постов'
+        ))
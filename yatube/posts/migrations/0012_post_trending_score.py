@@ -0,0 +1,18 @@
+# Generated by Django 2.2.28 on 2026-10-19 11:27
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('posts', '0011_like'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='post',
+            name='trending_score',
+            field=models.FloatField(db_index=True, editable=False, help_text='Логарифм затухающего рейтинга, см. posts.trending', null=True, verbose_name='Популярность'),
+        ),
+    ]
@@ -0,0 +1,18 @@
+# Generated by Django 2.2.28 on 2026-10-19 11:28
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('posts', '0012_post_trending_score'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='post',
+            name='views_count',
+            field=models.IntegerField(default=0, editable=False, help_text='Обновляется пачками из posts.counters.views', verbose_name='Просмотры'),
+        ),
+    ]
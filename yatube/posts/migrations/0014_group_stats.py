@@ -0,0 +1,54 @@
+# Generated by Django 2.2.28 on 2026-10-19 11:29
+
+from django.db import migrations, models
+from django.db.models import Count, OuterRef, Subquery, Value
+from django.db.models.functions import Coalesce
+import django.db.models.deletion
+
+
+def fill_group_stats(apps, schema_editor):
+    Group = apps.get_model('posts', 'Group')
+    Post = apps.get_model('posts', 'Post')
+    latest = (
+        Post.objects.filter(group=OuterRef('pk'))
+        .exclude(created=None)
+        .order_by('-created', '-pk')
+    )
+    counted = (
+        Post.objects.filter(group=OuterRef('pk'))
+        .order_by()
+        .values('group')
+        .annotate(count=Count('pk'))
+        .values('count')
+    )
+    Group.objects.update(
+        posts_count=Coalesce(Subquery(counted), Value(0)),
+        last_post=Subquery(latest.values('pk')[:1]),
+        last_post_at=Subquery(latest.values('created')[:1]),
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('posts', '0013_post_views_count'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='group',
+            name='last_post',
+            field=models.ForeignKey(editable=False, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='+', to='posts.Post'),
+        ),
+        migrations.AddField(
+            model_name='group',
+            name='last_post_at',
+            field=models.DateTimeField(editable=False, null=True, verbose_name='Последний пост'),
+        ),
+        migrations.AddField(
+            model_name='group',
+            name='posts_count',
+            field=models.IntegerField(default=0, editable=False, verbose_name='Число постов'),
+        ),
+        migrations.RunPython(fill_group_stats, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,40 @@
+# Generated by Django 2.2.28 on 2026-10-19 11:30
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('posts', '0014_group_stats'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ArchivedComment',
+            fields=[
+                ('id', models.IntegerField(primary_key=True, serialize=False)),
+                ('post_id', models.IntegerField(db_index=True, verbose_name='Пост')),
+                ('author_id', models.IntegerField(verbose_name='Автор')),
+                ('text', models.CharField(max_length=200, verbose_name='Текст комментария')),
+                ('created', models.DateTimeField(verbose_name='Дата публикации')),
+            ],
+        ),
+        migrations.CreateModel(
+            name='ArchivedPost',
+            fields=[
+                ('id', models.IntegerField(primary_key=True, serialize=False)),
+                ('created', models.DateTimeField(null=True, verbose_name='Дата создания')),
+                ('archived', models.DateTimeField(auto_now_add=True, verbose_name='Дата архивации')),
+                ('text', models.TextField(verbose_name='Текст поста')),
+                ('author_id', models.IntegerField(db_index=True, verbose_name='Автор')),
+                ('group_id', models.IntegerField(null=True, verbose_name='Группа')),
+                ('image', models.ImageField(blank=True, upload_to='posts/', verbose_name='Картинка')),
+                ('likes_count', models.IntegerField(default=0, verbose_name='Лайки')),
+                ('views_count', models.IntegerField(default=0, verbose_name='Просмотры')),
+            ],
+            options={
+                'ordering': ['-created'],
+            },
+        ),
+    ]
@@ -0,0 +1,66 @@
+# Generated by Django 2.2.28 on 2026-10-19 11:50
+
+from django.db import migrations, models, router
+from django.utils.html import conditional_escape, linebreaks
+
+BATCH_SIZE = 1000
+
+
+def render_post_text(text):
+    return linebreaks(text, autoescape=True)
+
+
+RENDERERS = {
+    'Post': render_post_text,
+    'ArchivedPost': render_post_text,
+    'Comment': conditional_escape,
+    'ArchivedComment': conditional_escape,
+}
+
+
+def fill_text_html(apps, schema_editor):
+    alias = schema_editor.connection.alias
+    for model_name, render in RENDERERS.items():
+        model = apps.get_model('posts', model_name)
+        if not router.allow_migrate_model(alias, model):
+            continue
+        batch = []
+        rows = model.objects.using(alias).only('pk', 'text').order_by('pk')
+        for obj in rows.iterator(chunk_size=BATCH_SIZE):
+            obj.text_html = render(obj.text)
+            batch.append(obj)
+            if len(batch) == BATCH_SIZE:
+                model.objects.using(alias).bulk_update(batch, ['text_html'])
+                batch = []
+        model.objects.using(alias).bulk_update(batch, ['text_html'])
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('posts', '0015_archive'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='archivedcomment',
+            name='text_html',
+            field=models.TextField(blank=True, verbose_name='HTML комментария'),
+        ),
+        migrations.AddField(
+            model_name='archivedpost',
+            name='text_html',
+            field=models.TextField(blank=True, verbose_name='HTML текста'),
+        ),
+        migrations.AddField(
+            model_name='comment',
+            name='text_html',
+            field=models.TextField(blank=True, editable=False, verbose_name='HTML комментария'),
+        ),
+        migrations.AddField(
+            model_name='post',
+            name='text_html',
+            field=models.TextField(blank=True, editable=False, verbose_name='HTML текста'),
+        ),
+        migrations.RunPython(fill_text_html, migrations.RunPython.noop),
+    ]
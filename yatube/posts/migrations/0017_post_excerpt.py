@@ -0,0 +1,46 @@
+# Generated by Django 2.2.28 on 2026-10-19 11:51
+
+from django.db import migrations, models
+from django.utils.html import linebreaks
+from django.utils.text import Truncator
+
+BATCH_SIZE = 1000
+EXCERPT_LENGTH = 500
+
+
+def fill_excerpts(apps, schema_editor):
+    Post = apps.get_model('posts', 'Post')
+    posts = Post.objects.using(schema_editor.connection.alias)
+    batch = []
+    rows = posts.only('pk', 'text', 'text_html').order_by('pk')
+    for post in rows.iterator(chunk_size=BATCH_SIZE):
+        post.truncated = len(post.text) > EXCERPT_LENGTH
+        post.excerpt_html = linebreaks(
+            Truncator(post.text).chars(EXCERPT_LENGTH), autoescape=True
+        ) if post.truncated else post.text_html
+        batch.append(post)
+        if len(batch) == BATCH_SIZE:
+            posts.bulk_update(batch, ['excerpt_html', 'truncated'])
+            batch = []
+    posts.bulk_update(batch, ['excerpt_html', 'truncated'])
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('posts', '0016_text_html'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='post',
+            name='excerpt_html',
+            field=models.TextField(blank=True, editable=False, verbose_name='HTML отрывка для лент'),
+        ),
+        migrations.AddField(
+            model_name='post',
+            name='truncated',
+            field=models.BooleanField(default=False, editable=False, verbose_name='Отрывок короче текста'),
+        ),
+        migrations.RunPython(fill_excerpts, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,39 @@
+# Generated by Django 2.2.28 on 2026-10-19 11:57
+
+from django.db import migrations, models, router
+from django.db.models import Count, OuterRef, Subquery, Value
+from django.db.models.functions import Coalesce
+
+
+def fill_comment_count(apps, schema_editor):
+    alias = schema_editor.connection.alias
+    Post = apps.get_model('posts', 'Post')
+    Comment = apps.get_model('posts', 'Comment')
+    if not router.allow_migrate_model(alias, Post):
+        return
+    counted = (
+        Comment.objects.filter(post=OuterRef('pk'))
+        .order_by()
+        .values('post')
+        .annotate(count=Count('pk'))
+        .values('count')
+    )
+    Post.objects.using(alias).update(
+        comment_count=Coalesce(Subquery(counted), Value(0))
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('posts', '0017_post_excerpt'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='post',
+            name='comment_count',
+            field=models.IntegerField(default=0, editable=False, help_text='Обновляется сигналами комментариев, см. posts.signals', verbose_name='Комментарии'),
+        ),
+        migrations.RunPython(fill_comment_count, migrations.RunPython.noop),
+    ]
@@ -1,18 +1,80 @@
 from django.contrib.auth import get_user_model
-from django.db import models
+from django.db import models, router, transaction
+from django.db.models import F
+from django.utils.functional import cached_property
+from django.utils.html import conditional_escape, linebreaks
+from django.utils.text import Truncator
+from core import generations
+from core.holes import COMMENTS_GENERATION
 from core.models import CreatedModel
 
 User = get_user_model()
 
+# Сколько символов текста поста показывают ленты.
+EXCERPT_LENGTH = 500
+# Ленты выводят отрывок и не читают из базы полный текст.
+FEED_DEFERRED_FIELDS = ('text', 'text_html')
 
-class Post(CreatedModel):
+
+def render_post_text(text):
+    """HTML тела поста: то же, что {{ text|linebreaks }} в шаблоне."""
+    return linebreaks(text, autoescape=True)
+
+
+def render_comment_text(text):
+    """HTML комментария: то же, что {{ text }} в шаблоне."""
+    return conditional_escape(text)
+
+
+class RenderedTextMixin:
+    """
+    Хранит готовый HTML поля text в text_html: шаблоны выводят его как
+    есть, не обрабатывая текст на каждом показе. HTML пересчитывается при
+    сохранении, если сохраняется text.
+    """
+    render_text = None
+    rendered_fields = ('text_html',)
+
+    def render(self):
+        self.text_html = self.render_text(self.text)
+
+    def save(self, *args, update_fields=None, **kwargs):
+        if update_fields is None:
+            # Объект без загруженного text (ленты) текст не менял.
+            if 'text' not in self.get_deferred_fields():
+                self.render()
+        elif 'text' in update_fields:
+            self.render()
+            update_fields = {*update_fields, *self.rendered_fields}
+        super().save(*args, update_fields=update_fields, **kwargs)
+
+
+class Post(RenderedTextMixin, CreatedModel):
     class Meta:
         ordering = ['-created']
 
+    render_text = staticmethod(render_post_text)
+    rendered_fields = ('text_html', 'excerpt_html', 'truncated')
+
     text = models.TextField(
         'Текст поста',
         help_text='Введите текст поста'
     )
+    text_html = models.TextField(
+        'HTML текста',
+        blank=True,
+        editable=False
+    )
+    excerpt_html = models.TextField(
+        'HTML отрывка для лент',
+        blank=True,
+        editable=False
+    )
+    truncated = models.BooleanField(
+        'Отрывок короче текста',
+        default=False,
+        editable=False
+    )
     author = models.ForeignKey(
         User,
         on_delete=models.CASCADE,
@@ -33,21 +95,81 @@ class Post(CreatedModel):
         upload_to='posts/',
         blank=True
     )
+    likes_count = models.IntegerField(
+        'Лайки',
+        default=0,
+        editable=False,
+        help_text='Обновляется пачками из posts.counters.likes'
+    )
+    views_count = models.IntegerField(
+        'Просмотры',
+        default=0,
+        editable=False,
+        help_text='Обновляется пачками из posts.counters.views'
+    )
+    comment_count = models.IntegerField(
+        'Комментарии',
+        default=0,
+        editable=False,
+        help_text='Обновляется сигналами комментариев, см. posts.signals'
+    )
+    trending_score = models.FloatField(
+        'Популярность',
+        null=True,
+        editable=False,
+        db_index=True,
+        help_text='Логарифм затухающего рейтинга, см. posts.trending'
+    )
 
     def __str__(self):
         return self.text[:15]
 
+    def render(self):
+        super().render()
+        self.truncated = len(self.text) > EXCERPT_LENGTH
+        self.excerpt_html = self.render_text(
+            Truncator(self.text).chars(EXCERPT_LENGTH)
+        ) if self.truncated else self.text_html
+
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        # Группа на момент загрузки: по ней сигналы поймут, что пост
+        # перенесли в другую группу (см. posts.group_stats).
+        if 'group_id' in instance.__dict__:
+            instance._loaded_group_id = instance.group_id
+        return instance
+
 
 class Group(models.Model):
     title = models.CharField(max_length=200)
     slug = models.SlugField(max_length=50, unique=True)
     description = models.TextField()
+    posts_count = models.IntegerField(
+        'Число постов',
+        default=0,
+        editable=False
+    )
+    last_post_at = models.DateTimeField(
+        'Последний пост',
+        null=True,
+        editable=False
+    )
+    last_post = models.ForeignKey(
+        'Post',
+        null=True,
+        editable=False,
+        on_delete=models.SET_NULL,
+        related_name='+'
+    )
 
     def __str__(self):
         return self.title
 
 
-class Comment(models.Model):
+class Comment(RenderedTextMixin, models.Model):
+    render_text = staticmethod(render_comment_text)
+
     post = models.ForeignKey(
         'Post',
         on_delete=models.CASCADE,
@@ -64,6 +186,11 @@ class Comment(models.Model):
         verbose_name='Текст комментария',
         help_text='Оставьте свой комментарий'
     )
+    text_html = models.TextField(
+        'HTML комментария',
+        blank=True,
+        editable=False
+    )
     created = models.DateTimeField(
         verbose_name='Дата публикации',
         auto_now_add=True
@@ -71,3 +198,127 @@ class Comment(models.Model):
 
     def __str__(self):
         return self.text
+
+    def delete(self, using=None, keep_parents=False):
+        """
+        Удаляет комментарий и уменьшает comment_count поста.
+
+        Сигнала post_delete у комментариев нет: с ним комментарии
+        удалялись бы вместе с постом по одному, а не одним DELETE.
+        Каскад от автора учитывает posts.signals.author_deleting, массовое
+        удаление - posts.bulk.delete_comments.
+        """
+        using = using or router.db_for_write(Comment, instance=self)
+        with transaction.atomic(using=using):
+            deleted = super().delete(using, keep_parents)
+            if not deleted[0]:
+                # Комментарий уже удалили параллельно: его вычли там.
+                return deleted
+            Post.objects.using(using).filter(pk=self.post_id).update(
+                comment_count=F('comment_count') - 1
+            )
+        generations.bump(COMMENTS_GENERATION)
+        return deleted
+
+
+class Like(models.Model):
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(
+                fields=['post', 'user'], name='unique_post_like'
+            ),
+        ]
+
+    post = models.ForeignKey(
+        'Post',
+        on_delete=models.CASCADE,
+        related_name='likes'
+    )
+    user = models.ForeignKey(
+        User,
+        on_delete=models.CASCADE,
+        verbose_name='Пользователь',
+        related_name='likes'
+    )
+    created = models.DateTimeField(
+        verbose_name='Дата',
+        auto_now_add=True
+    )
+
+    def __str__(self):
+        return f'{self.user} -> {self.post}'
+
+
+class ArchivedPost(models.Model):
+    """
+    Пост, перенесённый из posts_post командой archive_posts.
+
+    Связи хранятся простыми числами: таблица может жить в отдельной
+    базе 'archive' (см. posts.routers), а между базами внешних ключей нет.
+    """
+    class Meta:
+        ordering = ['-created']
+
+    id = models.IntegerField(primary_key=True)
+    created = models.DateTimeField('Дата создания', null=True)
+    archived = models.DateTimeField('Дата архивации', auto_now_add=True)
+    text = models.TextField('Текст поста')
+    text_html = models.TextField('HTML текста', blank=True)
+    author_id = models.IntegerField('Автор', db_index=True)
+    group_id = models.IntegerField('Группа', null=True)
+    image = models.ImageField('Картинка', upload_to='posts/', blank=True)
+    likes_count = models.IntegerField('Лайки', default=0)
+    views_count = models.IntegerField('Просмотры', default=0)
+
+    def __str__(self):
+        return self.text[:15]
+
+    @classmethod
+    def from_post(cls, post):
+        return cls(
+            id=post.pk,
+            created=post.created,
+            text=post.text,
+            text_html=post.text_html,
+            author_id=post.author_id,
+            group_id=post.group_id,
+            image=post.image.name,
+            likes_count=post.likes_count,
+            views_count=post.views_count,
+        )
+
+    @cached_property
+    def author(self):
+        return User.objects.get(pk=self.author_id)
+
+    @cached_property
+    def group(self):
+        return Group.objects.filter(pk=self.group_id).first()
+
+
+class ArchivedComment(models.Model):
+    """Комментарий архивного поста."""
+    id = models.IntegerField(primary_key=True)
+    post_id = models.IntegerField('Пост', db_index=True)
+    author_id = models.IntegerField('Автор')
+    text = models.CharField('Текст комментария', max_length=200)
+    text_html = models.TextField('HTML комментария', blank=True)
+    created = models.DateTimeField('Дата публикации')
+
+    def __str__(self):
+        return self.text
+
+    @classmethod
+    def from_comment(cls, comment):
+        return cls(
+            id=comment.pk,
+            post_id=comment.post_id,
+            author_id=comment.author_id,
+            text=comment.text,
+            text_html=comment.text_html,
+            created=comment.created,
+        )
+
+    @cached_property
+    def author(self):
+        return User.objects.get(pk=self.author_id)
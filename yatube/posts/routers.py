@@ -0,0 +1,42 @@
+"""
+Маршрутизация архивных моделей в отдельную базу.
+
+Если в DATABASES есть псевдоним ARCHIVE_DATABASE ('archive' по
+умолчанию), таблицы ArchivedPost и ArchivedComment создаются и читаются
+только там: архив растёт, не раздувая основной файл SQLite и не
+конкурируя с живыми данными за его блокировку. Без такого псевдонима
+роутер ничего не решает, и архив лежит в основной базе.
+"""
+from django.conf import settings
+
+ARCHIVE_MODELS = {'archivedpost', 'archivedcomment'}
+
+
+def archive_alias():
+    alias = getattr(settings, 'ARCHIVE_DATABASE', 'archive')
+    return alias if alias in settings.DATABASES else None
+
+
+def is_archive_model(app_label, model_name):
+    return app_label == 'posts' and model_name in ARCHIVE_MODELS
+
+
+class ArchiveRouter:
+
+    def db_for_read(self, model, **hints):
+        if is_archive_model(model._meta.app_label, model._meta.model_name):
+            return archive_alias()
+        return None
+
+    db_for_write = db_for_read
+
+    def allow_relation(self, obj1, obj2, **hints):
+        return None
+
+    def allow_migrate(self, db, app_label, model_name=None, **hints):
+        alias = archive_alias()
+        if alias is None:
+            return None
+        if is_archive_model(app_label, model_name):
+            return db == alias
+        return db != alias
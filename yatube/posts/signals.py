@@ -0,0 +1,144 @@
+from django.conf import settings
+from django.db.models import F
+from django.db.models.signals import (
+    post_delete, post_save, pre_delete, pre_save,
+)
+from django.dispatch import receiver
+from django.urls import reverse
+
+from core import generations, not_found
+from core.holes import COMMENTS_GENERATION
+from core.holes import GENERATION as FEED_GENERATION
+from core.not_found import GENERATION as NOT_FOUND_GENERATION
+
+from . import bulk, feeds, group_stats, sitemaps, trending
+from .models import (
+    ArchivedComment, ArchivedPost, Comment, Group, Like, Post,
+)
+
+
+@receiver(post_save, sender=Comment)
+def comment_created(sender, instance, created, **kwargs):
+    """Комментарий поднимает пост в популярных и в счётчике поста."""
+    if created:
+        trending.record(
+            instance.post_id, trending.COMMENT_WEIGHT, instance.created
+        )
+        Post.objects.filter(pk=instance.post_id).update(
+            comment_count=F('comment_count') + 1
+        )
+        generations.bump(COMMENTS_GENERATION)
+
+
+@receiver(pre_save, sender=Post)
+def post_saving(sender, instance, **kwargs):
+    """Запоминает группу поста, если он загружен без group_id."""
+    if not instance._state.adding and not hasattr(
+        instance, '_loaded_group_id'
+    ):
+        instance._loaded_group_id = (
+            Post.objects.filter(pk=instance.pk)
+            .values_list('group_id', flat=True)
+            .first()
+        )
+
+
+@receiver(post_save, sender=Post)
+def post_saved(sender, instance, created, **kwargs):
+    """Обновляет статистику групп при создании поста и смене группы."""
+    old_group_id = (
+        None if created else getattr(instance, '_loaded_group_id', None)
+    )
+    if old_group_id != instance.group_id:
+        if old_group_id is not None:
+            group_stats.post_removed(old_group_id, instance)
+        if instance.group_id is not None:
+            group_stats.post_added(instance.group_id, instance)
+        sitemaps.groups_changed()
+    instance._loaded_group_id = instance.group_id
+    generations.bump(FEED_GENERATION)
+    feeds.groups_changed({old_group_id, instance.group_id} - {None})
+    feeds.authors_changed([instance.author_id])
+    if created:
+        sitemaps.post_added(instance)
+        # Новый пост делает существующим только свой адрес.
+        not_found.forget(
+            reverse('posts:post_detail', kwargs={'post_id': instance.pk})
+        )
+
+
+@receiver(post_delete, sender=Post)
+def post_deleted(sender, instance, **kwargs):
+    if instance.group_id is not None:
+        group_stats.post_removed(instance.group_id, instance)
+        feeds.groups_changed([instance.group_id])
+        sitemaps.groups_changed()
+    generations.bump(FEED_GENERATION)
+    feeds.authors_changed([instance.author_id])
+    sitemaps.posts_removed()
+
+
+@receiver(post_save, sender=Group)
+def group_saved(sender, instance, created, **kwargs):
+    """
+    Название и описание группы видны в закешированных лентах. При правке
+    мог смениться slug, поэтому сбрасываются ленты всех групп: лента под
+    старым адресом не должна отдаваться.
+    """
+    generations.bump(FEED_GENERATION)
+    generations.bump(NOT_FOUND_GENERATION)
+    if not created:
+        generations.bump(feeds.GROUPS_GENERATION)
+    sitemaps.groups_changed(added=created)
+
+
+@receiver(post_delete, sender=Group)
+def group_deleted(sender, instance, **kwargs):
+    feeds.groups_changed([instance.pk])
+    sitemaps.groups_changed()
+
+
+@receiver(post_save, sender=settings.AUTH_USER_MODEL)
+def user_saved(sender, instance, created, update_fields=None, **kwargs):
+    """
+    У нового пользователя появляется страница профиля, а при смене имени
+    она переезжает. Вход сохраняет только last_login и кеш не трогает.
+    """
+    renamed = update_fields is None or 'username' in update_fields
+    if created or renamed:
+        generations.bump(NOT_FOUND_GENERATION)
+    if renamed and not created:
+        # Имя автора видно в его ленте, а лента под старым username
+        # должна перестать отдаваться.
+        generations.bump(feeds.AUTHORS_GENERATION)
+
+
+@receiver(pre_delete, sender=settings.AUTH_USER_MODEL)
+def author_deleting(sender, instance, **kwargs):
+    """
+    Комментарии и лайки автора удаляются каскадом одним DELETE, без
+    сигналов: заранее вычитаем их из счётчиков чужих постов. Посты самого
+    автора удаляются тем же каскадом, их счётчики не нужны.
+    """
+    bulk.uncount_comments(
+        Comment.objects.filter(author=instance)
+        .exclude(post__author=instance)
+        .values_list('post_id', flat=True)
+    )
+    bulk.uncount_likes(
+        Like.objects.filter(user=instance)
+        .exclude(post__author=instance)
+        .values_list('post_id', flat=True)
+    )
+
+
+@receiver(post_delete, sender=settings.AUTH_USER_MODEL)
+def author_deleted(sender, instance, **kwargs):
+    """Архив не связан с пользователями внешним ключом: чистим вручную."""
+    feeds.authors_changed([instance.pk])
+    post_ids = ArchivedPost.objects.filter(author_id=instance.pk)
+    ArchivedComment.objects.filter(post_id__in=list(
+        post_ids.values_list('pk', flat=True)
+    )).delete()
+    ArchivedComment.objects.filter(author_id=instance.pk).delete()
+    post_ids.delete()
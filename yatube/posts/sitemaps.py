@@ -0,0 +1,116 @@
+"""
+Карта сайта для поисковых роботов: посты, группы и постоянные страницы.
+
+Роботы находят посты по карте, а не обходом всех страниц лент. Разделы
+длиннее SITEMAP_LIMIT адресов делятся на страницы ?p=N, которые
+перечисляет индекс /sitemap.xml. Ответы кешируются (core.conditional)
+по поколениям: у индекса, у каждого раздела и у каждой страницы
+раздела постов - своё. Посты идут по pk, поэтому новый пост меняет
+только последнюю страницу постов (и индекс, если она новая); удаление
+сдвигает все страницы раздела.
+"""
+from django.contrib.sitemaps import Sitemap
+from django.urls import reverse
+
+from core import generations
+
+from .models import Group, Post
+
+# Больше адресов в одном файле протокол sitemaps не допускает.
+SITEMAP_LIMIT = 50000
+# Страницы дальше этой считаются одной: номер из ?p= входит в имя
+# поколения, и случайные p не должны плодить ключи.
+MAX_PAGE = 10000
+
+INDEX_GENERATION = 'sitemap:index'
+
+
+def section_generation(section):
+    return f'sitemap:{section}'
+
+
+def page_generation(section, page):
+    return f'sitemap:{section}:{page}'
+
+
+def generation(request, sitemaps, section=None, **kwargs):
+    """Поколения документа карты для core.conditional."""
+    if section is None:
+        return (INDEX_GENERATION,)
+    try:
+        page = int(request.GET.get('p', 1))
+    except ValueError:
+        page = 0
+    if not 0 < page <= MAX_PAGE:
+        page = 'other'
+    return section_generation(section), page_generation(section, page)
+
+
+class PostSitemap(Sitemap):
+    limit = SITEMAP_LIMIT
+    changefreq = 'monthly'
+
+    def items(self):
+        # По pk: новые посты дописываются в последнюю страницу раздела.
+        return Post.objects.only('pk', 'created').order_by('pk')
+
+    def location(self, post):
+        return reverse('posts:post_detail', kwargs={'post_id': post.pk})
+
+    def lastmod(self, post):
+        return post.created
+
+
+class GroupSitemap(Sitemap):
+    limit = SITEMAP_LIMIT
+    changefreq = 'daily'
+
+    def items(self):
+        return Group.objects.only('slug', 'last_post_at').order_by('pk')
+
+    def location(self, group):
+        return reverse('posts:group_list', kwargs={'slug': group.slug})
+
+    def lastmod(self, group):
+        return group.last_post_at
+
+
+class StaticSitemap(Sitemap):
+    changefreq = 'weekly'
+
+    def items(self):
+        return ['posts:main_menu', 'posts:groups', 'about:author',
+                'about:tech']
+
+    def location(self, name):
+        return reverse(name)
+
+
+SITEMAPS = {
+    'posts': PostSitemap,
+    'groups': GroupSitemap,
+    'pages': StaticSitemap,
+}
+
+
+def post_added(post):
+    """Новый пост дописан в последнюю страницу раздела постов."""
+    position = Post.objects.filter(pk__lte=post.pk).count()
+    limit = PostSitemap.limit
+    generations.bump(page_generation('posts', (position - 1) // limit + 1))
+    if position > 1 and (position - 1) % limit == 0:
+        # Пост открыл новую страницу: её должен перечислить индекс.
+        generations.bump(INDEX_GENERATION)
+
+
+def posts_removed():
+    """Удаление сдвигает посты по всем страницам и меняет их число."""
+    generations.bump(section_generation('posts'))
+    generations.bump(INDEX_GENERATION)
+
+
+def groups_changed(added=False):
+    """Изменились группы или их last_post_at; added - появилась новая."""
+    generations.bump(section_generation('groups'))
+    if added:
+        generations.bump(INDEX_GENERATION)
@@ -0,0 +1,62 @@
+"""
+Общие заготовки данных для тестов posts.
+
+Вызываются из setUpTestData: данные класса создаются один раз, а каждый
+тест откатывается к ним транзакцией, не пересоздавая их заново.
+"""
+import hashlib
+
+from django.contrib.auth import get_user_model
+from django.core.files.uploadedfile import SimpleUploadedFile
+
+from posts.models import Group, Post
+
+User = get_user_model()
+
+SMALL_GIF = (
+    b'\x47\x49\x46\x38\x39\x61\x02\x00'
+    b'\x01\x00\x80\x00\x00\x00\x00\x00'
+    b'\xFF\xFF\xFF\x21\xF9\x04\x00\x00'
+    b'\x00\x00\x00\x2C\x00\x00\x00\x00'
+    b'\x02\x00\x01\x00\x00\x02\x02\x0C'
+    b'\x0A\x00\x3B'
+)
+
+
+def create_group(number=1):
+    """Тестовая группа; number > 1 даёт следующие группы с другим slug."""
+    if number == 1:
+        return Group.objects.create(
+            title='Test group',
+            slug='test_slug',
+            description='This is test description'
+        )
+    return Group.objects.create(
+        title=f'Test group №{number}',
+        slug=f'test{number}_slug',
+        description=f'This is test {number} description'
+    )
+
+
+def create_posts(author, group=None, count=1, text='Test post text'):
+    """count постов автора; при count > 1 к тексту добавляется номер."""
+    return [
+        Post.objects.create(
+            text=text if count == 1 else f'{text}{number}',
+            group=group,
+            author=author,
+        )
+        for number in range(1, count + 1)
+    ]
+
+
+def uploaded_gif(name='small.gif', content=SMALL_GIF):
+    return SimpleUploadedFile(
+        name=name, content=content, content_type='image/gif'
+    )
+
+
+def stored_image_name(content=SMALL_GIF, extension='.gif'):
+    """Имя, под которым картинку сохранит content-addressed хранилище."""
+    digest = hashlib.sha256(content).hexdigest()
+    return f'posts/{digest[:2]}/{digest[2:4]}/{digest}{extension}'
@@ -0,0 +1,55 @@
+import os
+import time
+
+from django.core.cache import cache
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+# Время ответа проверяется, только если задан множитель бюджета времени
+# (1 - как есть, 2 - вдвое мягче): на загруженной машине или с --parallel
+# замеры времени нестабильны, а число запросов от нагрузки не зависит.
+TIME_BUDGET_FACTOR = os.environ.get('QUERY_BUDGET_TIME_FACTOR')
+
+
+class QueryBudgetMixin:
+    """
+    Проверки числа запросов и времени ответа страницы.
+
+    assertBudget проверяет страницу на каждом размере данных из
+    dataset_sizes: число запросов не превышает max_queries и не меняется с
+    размером данных (иначе это N+1), а с QUERY_BUDGET_TIME_FACTOR ещё и
+    что ответ укладывается в max_seconds. Класс теста определяет
+    seed(size) - догружает данные до size постов.
+    """
+    dataset_sizes = (10, 1000)
+
+    def measure(self, client, url):
+        """Ответ, выполненные запросы и время запроса к url с пустым кешем."""
+        cache.clear()
+        with CaptureQueriesContext(connection) as queries:
+            start = time.perf_counter()
+            response = client.get(url)
+            elapsed = time.perf_counter() - start
+        return response, queries.captured_queries, elapsed
+
+    def assertBudget(self, client, url, max_queries, max_seconds=0.5):
+        counts = {}
+        for size in self.dataset_sizes:
+            self.seed(size)
+            with self.subTest(url=url, size=size):
+                response, queries, elapsed = self.measure(client, url)
+                self.assertEqual(response.status_code, 200)
+                counts[size] = len(queries)
+                self.assertLessEqual(
+                    len(queries), max_queries,
+                    '\n'.join(query['sql'] for query in queries)
+                )
+                if TIME_BUDGET_FACTOR:
+                    self.assertLessEqual(
+                        elapsed, max_seconds * float(TIME_BUDGET_FACTOR),
+                        f'{url} отвечал {elapsed:.3f} с'
+                    )
+        self.assertEqual(
+            len(set(counts.values())), 1,
+            f'Число запросов {url} растёт с данными: {counts}'
+        )
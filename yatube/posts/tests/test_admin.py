@@ -0,0 +1,123 @@
+from django.contrib.admin import helpers
+from django.contrib.admin.models import DELETION, LogEntry
+from django.contrib.auth import get_user_model
+from django.contrib.auth.models import Permission
+from django.test import Client, TestCase
+from django.urls import reverse
+
+from posts.models import Comment, Group, Like, Post
+
+User = get_user_model()
+
+
+class PostAdminActionsTests(TestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.admin = User.objects.create_superuser(
+            'admin', 'admin@example.com', 'password'
+        )
+        cls.user = User.objects.create_user(username='HasNoName')
+        cls.other = User.objects.create_user(username='Other')
+        cls.group = Group.objects.create(
+            title='Test group',
+            slug='test_slug',
+            description='This is test description'
+        )
+        cls.other_group = Group.objects.create(
+            title='Test group №2',
+            slug='test2_slug',
+            description='This is test 2 description'
+        )
+
+    def setUp(self):
+        self.client = Client()
+        self.client.force_login(self.admin)
+        self.posts = [
+            Post.objects.create(
+                text=f'Пост {number}', author=self.user, group=self.group
+            )
+            for number in range(3)
+        ]
+        self.kept = Post.objects.create(text='Чужой пост', author=self.other)
+        Comment.objects.create(
+            post=self.kept, author=self.user, text='Комментарий'
+        )
+        Like.objects.create(post=self.posts[0], user=self.other)
+
+    def action(self, action, posts, **data):
+        return self.client.post(reverse('admin:posts_post_changelist'), {
+            'action': action,
+            helpers.ACTION_CHECKBOX_NAME: [post.pk for post in posts],
+            **data,
+        })
+
+    def test_action_asks_confirmation(self):
+        """Без подтверждения действие показывает промежуточную страницу."""
+        response = self.action('delete_posts', self.posts)
+        self.assertTemplateUsed(response, 'admin/posts/post/bulk_action.html')
+        self.assertEqual(Post.objects.count(), 4)
+
+    def test_delete_posts(self):
+        """Удаление убирает посты, их лайки и обновляет группу."""
+        self.action('delete_posts', self.posts[1:], apply=1)
+        self.assertEqual(Post.objects.filter(group=self.group).count(), 1)
+        self.assertEqual(Like.objects.count(), 1)
+        self.group.refresh_from_db()
+        self.assertEqual(self.group.posts_count, 1)
+        self.assertEqual(self.group.last_post, self.posts[0])
+        entry = LogEntry.objects.get()
+        self.assertEqual(entry.action_flag, DELETION)
+        self.assertEqual(entry.user, self.admin)
+
+    def test_view_only_staff_has_no_actions(self):
+        """Без прав на изменение и удаление массовых действий нет."""
+        viewer = User.objects.create_user(username='Viewer', is_staff=True)
+        viewer.user_permissions.add(
+            Permission.objects.get(codename='view_post')
+        )
+        self.client.force_login(viewer)
+        response = self.client.get(reverse('admin:posts_post_changelist'))
+        self.assertEqual(response.status_code, 200)
+        self.assertIsNone(response.context['action_form'])
+        for action in ('delete_posts', 'purge_authors', 'move_to_group'):
+            self.action(action, self.posts, apply=1, group=self.other_group.pk)
+        self.assertEqual(Post.objects.filter(group=self.group).count(), 3)
+        self.assertFalse(LogEntry.objects.exists())
+
+    def test_move_to_group(self):
+        """Перенос меняет группу постов и статистику обеих групп."""
+        self.action(
+            'move_to_group', self.posts[:2],
+            apply=1, group=self.other_group.pk
+        )
+        self.assertEqual(
+            Post.objects.filter(group=self.other_group).count(), 2
+        )
+        self.group.refresh_from_db()
+        self.other_group.refresh_from_db()
+        self.assertEqual(self.group.posts_count, 1)
+        self.assertEqual(self.other_group.posts_count, 2)
+        self.assertEqual(self.other_group.last_post, self.posts[1])
+
+    def test_purge_authors(self):
+        """Чистка удаляет все посты и комментарии автора."""
+        self.action('purge_authors', self.posts[:1], apply=1)
+        self.assertFalse(Post.objects.filter(author=self.user).exists())
+        self.assertFalse(Comment.objects.filter(author=self.user).exists())
+        self.assertTrue(Post.objects.filter(pk=self.kept.pk).exists())
+        self.kept.refresh_from_db()
+        self.assertEqual(self.kept.comment_count, 0)
+
+    def test_changelist_queries_do_not_grow_with_rows(self):
+        """Список постов не делает запрос на каждую строку."""
+        url = reverse('admin:posts_post_changelist')
+        self.client.get(url)
+        with self.assertNumQueries(7):
+            self.client.get(url)
+        Post.objects.bulk_create(
+            Post(text='Ещё', author=self.other, group=self.other_group)
+            for _ in range(20)
+        )
+        with self.assertNumQueries(7):
+            self.client.get(url)
@@ -0,0 +1,128 @@
+from datetime import timedelta
+from io import StringIO
+from unittest import mock
+
+from django.contrib.auth import get_user_model
+from django.core.management import call_command
+from django.db import DatabaseError
+from django.test import Client, TestCase
+from django.urls import reverse
+from django.utils import timezone
+
+from posts.models import (
+    ArchivedComment, ArchivedPost, Comment, Group, Like, Post,
+)
+
+User = get_user_model()
+
+
+class ArchivePostsTests(TestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create_user(username='HasNoName')
+        cls.group = Group.objects.create(
+            title='Test group',
+            slug='test_slug',
+            description='This is test description'
+        )
+
+    def setUp(self):
+        self.old = Post.objects.create(
+            text='Старый пост', author=self.user, group=self.group
+        )
+        self.fresh = Post.objects.create(
+            text='Свежий пост', author=self.user, group=self.group
+        )
+        Post.objects.filter(pk=self.old.pk).update(
+            created=timezone.now() - timedelta(days=400)
+        )
+        self.comment = Comment.objects.create(
+            post=self.old, author=self.user, text='Комментарий'
+        )
+        Like.objects.create(post=self.old, user=self.user)
+        self.client = Client()
+
+    def archive(self):
+        call_command(
+            'archive_posts', days=365, batch_size=1, pause=0,
+            stdout=StringIO()
+        )
+
+    def test_moves_old_posts_only(self):
+        """Архивируются старые посты с комментариями, свежие остаются."""
+        self.archive()
+        self.assertFalse(Post.objects.filter(pk=self.old.pk).exists())
+        self.assertTrue(Post.objects.filter(pk=self.fresh.pk).exists())
+        self.assertFalse(Comment.objects.filter(pk=self.comment.pk).exists())
+        self.assertFalse(Like.objects.exists())
+        archived = ArchivedPost.objects.get(pk=self.old.pk)
+        self.assertEqual(archived.text, self.old.text)
+        self.assertEqual(archived.group, self.group)
+        self.assertEqual(
+            ArchivedComment.objects.get(pk=self.comment.pk).post_id,
+            self.old.pk
+        )
+
+    def test_group_stats_follow_archive(self):
+        """После архивации статистика группы считает только живые посты."""
+        self.archive()
+        self.group.refresh_from_db()
+        self.assertEqual(self.group.posts_count, 1)
+        self.assertEqual(self.group.last_post, self.fresh)
+
+    def test_post_detail_resolves_archived(self):
+        """Архивный пост открывается по старому адресу без формы."""
+        self.archive()
+        self.client.force_login(self.user)
+        response = self.client.get(
+            reverse('posts:post_detail', kwargs={'post_id': self.old.pk})
+        )
+        self.assertEqual(response.status_code, 200)
+        self.assertTrue(response.context['archived'])
+        self.assertContains(response, 'Комментарий')
+        self.assertNotContains(
+            response,
+            reverse('posts:add_comment', kwargs={'post_id': self.old.pk})
+        )
+
+    def test_failed_delete_keeps_archive_and_retries(self):
+        """
+        Архив фиксируется до удаления: сбой удаления оставляет пост в
+        обеих таблицах, а повторный перенос его доделывает.
+        """
+        with mock.patch(
+            'posts.archive.delete_posts', side_effect=DatabaseError
+        ), self.assertRaises(DatabaseError):
+            self.archive()
+        self.assertTrue(ArchivedPost.objects.filter(pk=self.old.pk).exists())
+        self.assertTrue(Post.objects.filter(pk=self.old.pk).exists())
+        self.archive()
+        self.assertFalse(Post.objects.filter(pk=self.old.pk).exists())
+        self.assertEqual(
+            ArchivedPost.objects.filter(pk=self.old.pk).count(), 1
+        )
+
+    def test_archived_comment_authors_in_one_query(self):
+        """Число запросов не растёт с числом архивных комментариев."""
+        for number in range(5):
+            Comment.objects.create(
+                post=self.old,
+                author=User.objects.create_user(username=f'user{number}'),
+                text=f'Комментарий {number}',
+            )
+        self.archive()
+        url = reverse('posts:post_detail', kwargs={'post_id': self.old.pk})
+        # Пост, архивный пост, комментарии, все авторы одним запросом,
+        # число постов автора и группа.
+        with self.assertNumQueries(6):
+            response = self.client.get(url)
+        self.assertContains(response, 'user4')
+
+    def test_feeds_skip_archived(self):
+        """Главная лента не показывает архивные посты."""
+        self.archive()
+        response = self.client.get(reverse('posts:main_menu'))
+        self.assertNotIn(
+            self.old.pk, [post.pk for post in response.context['page_obj']]
+        )
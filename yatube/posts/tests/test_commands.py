@@ -0,0 +1,95 @@
+import os
+import shutil
+import tempfile
+import time
+from io import StringIO
+from unittest import mock
+
+from django.contrib.auth import get_user_model
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.core.management import call_command
+from django.test import TestCase, override_settings
+
+from posts.models import Post
+
+TEMP_MEDIA_ROOT = tempfile.mkdtemp(prefix='yatube-gc-media-')
+
+User = get_user_model()
+
+
+@override_settings(MEDIA_ROOT=TEMP_MEDIA_ROOT)
+class GcMediaTests(TestCase):
+
+    @classmethod
+    def tearDownClass(cls):
+        super().tearDownClass()
+        shutil.rmtree(TEMP_MEDIA_ROOT, ignore_errors=True)
+
+    def setUp(self):
+        self.user = User.objects.create_user(username='HasNoName')
+
+    def create_post(self, content):
+        return Post.objects.create(
+            text='Тестовый пост',
+            author=self.user,
+            image=SimpleUploadedFile('small.gif', content, 'image/gif'),
+        )
+
+    def age_files(self):
+        """Делает все файлы старше периода ожидания."""
+        old = time.time() - 48 * 3600
+        for root, _, files in os.walk(TEMP_MEDIA_ROOT):
+            for filename in files:
+                os.utime(os.path.join(root, filename), (old, old))
+
+    def test_same_image_stored_once(self):
+        """Одинаковые картинки двух постов лежат в одном файле."""
+        first = self.create_post(b'GIF89a same')
+        second = self.create_post(b'GIF89a same')
+        self.assertEqual(first.image.name, second.image.name)
+
+    def test_orphaned_files_removed(self):
+        """Удаляются только файлы, на которые не ссылается ни один пост."""
+        kept = self.create_post(b'GIF89a kept')
+        orphan = self.create_post(b'GIF89a orphan')
+        orphan_path = orphan.image.path
+        orphan.delete()
+        self.age_files()
+
+        call_command('gc_media', stdout=StringIO())
+
+        self.assertTrue(os.path.exists(kept.image.path))
+        self.assertFalse(os.path.exists(orphan_path))
+
+    def test_reupload_refreshes_file(self):
+        """Повторная загрузка старого осиротевшего файла спасает его."""
+        orphan = self.create_post(b'GIF89a again')
+        orphan.delete()
+        self.age_files()
+        again = self.create_post(b'GIF89a again')
+        Post.objects.filter(pk=again.pk).delete()
+
+        call_command('gc_media', stdout=StringIO())
+
+        self.assertTrue(os.path.exists(again.image.path))
+
+    def test_references_rechecked_before_delete(self):
+        """Файл, на который сослались во время обхода, не удаляется."""
+        post = self.create_post(b'GIF89a during walk')
+        self.age_files()
+        with mock.patch(
+            'posts.management.commands.gc_media.Command.referenced',
+            return_value=set(),
+        ):
+            call_command('gc_media', stdout=StringIO())
+        self.assertTrue(os.path.exists(post.image.path))
+
+    def test_fresh_files_kept(self):
+        """Свежие файлы не удаляются: их пост может ещё сохраняться."""
+        orphan = self.create_post(b'GIF89a fresh')
+        orphan_path = orphan.image.path
+        orphan.delete()
+
+        call_command('gc_media', stdout=StringIO())
+
+        self.assertTrue(os.path.exists(orphan_path))
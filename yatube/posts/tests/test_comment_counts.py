@@ -0,0 +1,136 @@
+from io import StringIO
+
+from django.contrib.admin import helpers
+from django.contrib.auth import get_user_model
+from django.core.management import call_command
+from django.db import connection
+from django.test import Client, TestCase
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+
+from core import generations
+from core.holes import GENERATION as FEED_GENERATION
+from posts import bulk
+from posts.models import Comment, Post
+
+User = get_user_model()
+
+
+class CommentCountTests(TestCase):
+    """comment_count поста следует за таблицей комментариев."""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create_user(username='HasNoName')
+        cls.commenter = User.objects.create_user(username='Commenter')
+
+    def setUp(self):
+        self.post = Post.objects.create(text='Тестовый пост', author=self.user)
+        self.client = Client()
+        self.client.force_login(self.commenter)
+
+    def comment(self, author=None):
+        return Comment.objects.create(
+            post=self.post, author=author or self.user, text='Комментарий'
+        )
+
+    def assertCount(self, expected):
+        self.post.refresh_from_db()
+        self.assertEqual(self.post.comment_count, expected)
+
+    def test_add_comment_view(self):
+        """Комментарий через форму увеличивает счётчик."""
+        self.client.post(
+            reverse('posts:add_comment', kwargs={'post_id': self.post.pk}),
+            {'text': 'Новый комментарий'},
+        )
+        self.assertCount(1)
+
+    def test_delete_comment(self):
+        """Удаление комментария, в том числе каскадом от автора."""
+        first = self.comment()
+        spammer = User.objects.create_user(username='Spammer')
+        self.comment(spammer)
+        self.comment(spammer)
+        self.assertCount(3)
+        first.delete()
+        self.assertCount(2)
+        spammer.delete()
+        self.assertCount(0)
+
+    def test_concurrent_delete_counted_once(self):
+        """Второе удаление того же комментария счётчик не трогает."""
+        comment = self.comment()
+        self.comment()
+        stale = Comment.objects.get(pk=comment.pk)
+        comment.delete()
+        stale.delete()
+        self.assertCount(1)
+
+    def test_post_cascade_is_one_delete(self):
+        """Комментарии удаляются вместе с постом одним DELETE."""
+        for _ in range(5):
+            self.comment()
+        with CaptureQueriesContext(connection) as context:
+            self.post.delete()
+        queries = [query['sql'] for query in context.captured_queries]
+        self.assertEqual(
+            sum(sql.startswith('DELETE FROM "posts_comment"')
+                for sql in queries), 1
+        )
+        self.assertFalse(
+            [sql for sql in queries if sql.startswith('UPDATE "posts_post"')]
+        )
+
+    def test_admin_bulk_delete(self):
+        """Удаление выбранных комментариев в админке правит счётчик."""
+        comments = [self.comment(), self.comment()]
+        self.comment()
+        admin = User.objects.create_superuser(
+            'admin', 'admin@example.com', 'password'
+        )
+        self.client.force_login(admin)
+        self.client.post(reverse('admin:posts_comment_changelist'), {
+            'action': 'delete_selected',
+            helpers.ACTION_CHECKBOX_NAME: [
+                comment.pk for comment in comments
+            ],
+            'post': 'yes',
+        })
+        self.assertEqual(Comment.objects.count(), 1)
+        self.assertCount(1)
+
+    def test_comment_keeps_feed_generation(self):
+        """Комментарий не сбрасывает карту сайта и RSS."""
+        before = generations.get(FEED_GENERATION)
+        self.comment()
+        self.comment().delete()
+        self.assertEqual(generations.get(FEED_GENERATION), before)
+
+    def test_bulk_delete_comments(self):
+        """bulk.delete_comments обходит сигналы, но счётчик правит сам."""
+        other = Post.objects.create(text='Другой пост', author=self.user)
+        ids = [self.comment().pk, self.comment().pk]
+        Comment.objects.create(post=other, author=self.user, text='Ещё')
+        ids.append(Comment.objects.latest('pk').pk)
+        self.comment()
+        bulk.delete_comments(ids)
+        self.assertCount(1)
+        other.refresh_from_db()
+        self.assertEqual(other.comment_count, 0)
+
+    def test_reconcile(self):
+        """Команда исправляет разошедшиеся счётчики."""
+        self.comment()
+        Post.objects.filter(pk=self.post.pk).update(comment_count=7)
+        out = StringIO()
+        call_command('reconcile_comment_counts', stdout=out)
+        self.assertCount(1)
+        self.assertIn('у 1 постов', out.getvalue())
+
+    def test_feed_shows_count(self):
+        """Лента показывает число комментариев без запросов к ним."""
+        self.comment()
+        self.comment()
+        response = Client().get(reverse('posts:main_menu'))
+        self.assertContains(response, 'комментариев: 2')
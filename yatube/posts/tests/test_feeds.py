@@ -0,0 +1,186 @@
+from http import HTTPStatus
+from unittest import mock
+
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.test import TestCase
+from django.urls import reverse
+
+from posts.sitemaps import PostSitemap
+from posts.tests.fixtures import create_group, create_posts
+
+User = get_user_model()
+
+
+class SitemapTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.group = create_group()
+        cls.user = User.objects.create_user(username='HasNoName')
+        cls.posts = create_posts(cls.user, cls.group, count=3)
+
+    def setUp(self):
+        cache.clear()
+
+    def test_index_lists_sections(self):
+        """Индекс ссылается на разделы, раздел - на посты."""
+        response = self.client.get(reverse('sitemap_index'))
+        for section in ('posts', 'groups', 'pages'):
+            self.assertContains(response, f'/sitemap-{section}.xml')
+        response = self.client.get(
+            reverse('sitemap', kwargs={'section': 'posts'})
+        )
+        for post in self.posts:
+            self.assertContains(response, f'/posts/{post.pk}/</loc>')
+
+    def test_large_section_split_into_pages(self):
+        """Раздел длиннее лимита делится на страницы в индексе."""
+        with mock.patch.object(PostSitemap, 'limit', 2):
+            response = self.client.get(reverse('sitemap_index'))
+            self.assertContains(response, '/sitemap-posts.xml?p=2')
+            response = self.client.get(
+                reverse('sitemap', kwargs={'section': 'posts'}), {'p': 2}
+            )
+        self.assertContains(response, '<url>', count=1)
+
+    def test_conditional_get_and_invalidation(self):
+        """Повторный запрос с ETag получает 304, пока посты не менялись."""
+        url = reverse('sitemap', kwargs={'section': 'posts'})
+        etag = self.client.get(url)['ETag']
+        response = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, HTTPStatus.NOT_MODIFIED)
+
+        post, = create_posts(self.user, text='Новый пост')
+        response = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, HTTPStatus.OK)
+        self.assertContains(response, f'/posts/{post.pk}/</loc>')
+
+    def test_new_post_invalidates_last_page_only(self):
+        """
+        Новый пост сбрасывает только последнюю страницу постов, а индекс -
+        только когда открывает новую страницу. Правка поста карту не
+        меняет.
+        """
+        def etags():
+            return {
+                name: self.client.get(url, params)['ETag']
+                for name, url, params in documents
+            }
+
+        def not_modified(tags):
+            return {
+                name for name, url, params in documents
+                if self.client.get(
+                    url, params, HTTP_IF_NONE_MATCH=tags[name]
+                ).status_code == HTTPStatus.NOT_MODIFIED
+            }
+
+        posts = reverse('sitemap', kwargs={'section': 'posts'})
+        documents = (
+            ('index', reverse('sitemap_index'), {}),
+            ('page1', posts, {'p': 1}),
+            ('page2', posts, {'p': 2}),
+            ('pages', reverse('sitemap', kwargs={'section': 'pages'}), {}),
+        )
+        with mock.patch.object(PostSitemap, 'limit', 2):
+            tags = etags()
+            create_posts(self.user, text='Четвёртый пост')
+            self.assertEqual(not_modified(tags), {'index', 'page1', 'pages'})
+
+            tags = etags()
+            self.posts[0].text = 'Правка'
+            self.posts[0].save()
+            self.assertEqual(
+                not_modified(tags), {'index', 'page1', 'page2', 'pages'}
+            )
+
+            create_posts(self.user, text='Пятый пост')
+            self.assertEqual(not_modified(tags), {'page1', 'page2', 'pages'})
+
+    def test_unknown_params_share_cache(self):
+        """Случайная строка запроса не обходит кеш и не плодит ключи."""
+        url = reverse('sitemap', kwargs={'section': 'posts'})
+        self.client.get(url)
+        with self.assertNumQueries(0):
+            response = self.client.get(url, {'x': 'random'})
+        self.assertEqual(response.status_code, HTTPStatus.OK)
+        feed = reverse('posts:group_rss', kwargs={'slug': self.group.slug})
+        self.client.get(feed)
+        with self.assertNumQueries(0):
+            self.client.get(feed, {'x': 'random'})
+
+
+class FeedTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.group = create_group()
+        cls.user = User.objects.create_user(username='HasNoName')
+        cls.post, = create_posts(cls.user, cls.group, text='Пост <для> ленты')
+
+    def setUp(self):
+        cache.clear()
+
+    def test_group_and_author_feeds(self):
+        """RSS и Atom группы и автора содержат пост."""
+        for name, kwargs in (
+            ('posts:group_rss', {'slug': self.group.slug}),
+            ('posts:group_atom', {'slug': self.group.slug}),
+            ('posts:profile_rss', {'username': self.user.username}),
+            ('posts:profile_atom', {'username': self.user.username}),
+        ):
+            with self.subTest(name=name):
+                response = self.client.get(reverse(name, kwargs=kwargs))
+                self.assertContains(response, f'/posts/{self.post.pk}/')
+                self.assertContains(response, 'Пост &lt;для&gt; ленты')
+                self.assertTrue(response.has_header('Last-Modified'))
+
+    def test_post_invalidates_own_feeds_only(self):
+        """Пост сбрасывает ленты своей группы и автора, а не все."""
+        other_group = create_group(2)
+        other_user = User.objects.create_user(username='Other')
+        create_posts(other_user, other_group)
+        urls = {
+            'group': reverse(
+                'posts:group_rss', kwargs={'slug': self.group.slug}
+            ),
+            'author': reverse(
+                'posts:profile_rss', kwargs={'username': self.user.username}
+            ),
+            'other_group': reverse(
+                'posts:group_rss', kwargs={'slug': other_group.slug}
+            ),
+            'other_author': reverse(
+                'posts:profile_rss', kwargs={'username': other_user.username}
+            ),
+        }
+        tags = {
+            name: self.client.get(url)['ETag'] for name, url in urls.items()
+        }
+        create_posts(self.user, self.group, text='Новый пост')
+        for name, url in urls.items():
+            with self.subTest(name=name):
+                response = self.client.get(url, HTTP_IF_NONE_MATCH=tags[name])
+                self.assertEqual(
+                    response.status_code,
+                    HTTPStatus.NOT_MODIFIED if name.startswith('other')
+                    else HTTPStatus.OK
+                )
+
+    def test_renamed_author_feed_gone(self):
+        """После смены username лента под старым адресом не отдаётся."""
+        url = reverse(
+            'posts:profile_rss', kwargs={'username': self.user.username}
+        )
+        self.assertEqual(self.client.get(url).status_code, HTTPStatus.OK)
+        user = User.objects.get(pk=self.user.pk)
+        user.username = 'Renamed'
+        user.save()
+        self.assertEqual(
+            self.client.get(url).status_code, HTTPStatus.NOT_FOUND
+        )
+
+    def test_unknown_group_feed_404(self):
+        response = self.client.get(
+            reverse('posts:group_rss', kwargs={'slug': 'missing'})
+        )
+        self.assertEqual(response.status_code, HTTPStatus.NOT_FOUND)
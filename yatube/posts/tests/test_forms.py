@@ -3,23 +3,25 @@ from django.test import Client, TestCase
 from django.urls import reverse
 
 from posts.models import Post
+from posts.tests.fixtures import stored_image_name, uploaded_gif
 
 User = get_user_model()
 
 
 class PostFormTests(TestCase):
 
-    def setUp(self):
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create_user(username='HasNoName')
+        cls.post = Post.objects.create(
+            text='Тестовый заголовок',
+            author=cls.user
+        )
 
-        self.user = User.objects.create_user(username='HasNoName')
+    def setUp(self):
         self.authorized_client = Client()
         self.authorized_client.force_login(self.user)
 
-        self.post = Post.objects.create(
-            text='Тестовый заголовок',
-            author=self.user
-        )
-
     def test_create_post(self):
         """Валидная форма создает запись в Task."""
         posts_count = Post.objects.count()
@@ -61,3 +63,12 @@ class PostFormTests(TestCase):
             Post.objects.get(
                 pk=self.post.pk).text,
             'Тестовый текст измененный')
+
+    def test_create_post_with_image(self):
+        """Картинка из формы создания сохраняется в посте."""
+        self.authorized_client.post(
+            reverse('posts:post_create'),
+            data={'text': 'Пост с картинкой', 'image': uploaded_gif()},
+        )
+        post = Post.objects.get(text='Пост с картинкой')
+        self.assertEqual(post.image.name, stored_image_name())
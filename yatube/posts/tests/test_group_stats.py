@@ -0,0 +1,86 @@
+from io import StringIO
+
+from django.contrib.auth import get_user_model
+from django.core.management import call_command
+from django.test import Client, TestCase
+from django.urls import reverse
+
+from posts.models import Group, Post
+
+User = get_user_model()
+
+
+class GroupStatsTests(TestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create_user(username='HasNoName')
+        cls.group = Group.objects.create(
+            title='Test group',
+            slug='test_slug',
+            description='This is test description'
+        )
+        cls.other_group = Group.objects.create(
+            title='Test group №2',
+            slug='test2_slug',
+            description='This is test 2 description'
+        )
+
+    def setUp(self):
+        self.authorized_client = Client()
+        self.authorized_client.force_login(self.user)
+
+    def assertStats(self, group, count, last_post):
+        group.refresh_from_db()
+        self.assertEqual(group.posts_count, count)
+        self.assertEqual(group.last_post, last_post)
+        self.assertEqual(
+            group.last_post_at, last_post.created if last_post else None
+        )
+
+    def test_create_and_delete(self):
+        """Создание и удаление поста меняют статистику группы."""
+        first = Post.objects.create(
+            text='Первый', author=self.user, group=self.group
+        )
+        second = Post.objects.create(
+            text='Второй', author=self.user, group=self.group
+        )
+        self.assertStats(self.group, 2, second)
+        second.delete()
+        self.assertStats(self.group, 1, first)
+        first.delete()
+        self.assertStats(self.group, 0, None)
+
+    def test_post_edit_moves_between_groups(self):
+        """post_edit с другой группой переносит пост в её статистику."""
+        post = Post.objects.create(
+            text='Пост', author=self.user, group=self.group
+        )
+        self.authorized_client.post(
+            reverse('posts:post_edit', kwargs={'post_id': post.pk}),
+            {'text': 'Пост', 'group': self.other_group.pk},
+        )
+        self.assertStats(self.group, 0, None)
+        self.assertStats(self.other_group, 1, post)
+
+    def test_rebuild_command(self):
+        """Команда пересчитывает испорченную статистику."""
+        post = Post.objects.create(
+            text='Пост', author=self.user, group=self.group
+        )
+        Group.objects.update(posts_count=100, last_post=None)
+        call_command('rebuild_group_stats', stdout=StringIO())
+        self.assertStats(self.group, 1, post)
+        self.assertStats(self.other_group, 0, None)
+
+    def test_directory_single_query(self):
+        """Каталог групп не считает посты запросом на группу."""
+        Post.objects.create(text='Пост', author=self.user, group=self.group)
+        with self.assertNumQueries(2):
+            # COUNT для пагинатора и сами группы.
+            response = self.client.get(reverse('posts:groups'))
+        self.assertEqual(
+            list(response.context['page_obj']),
+            [self.group, self.other_group]
+        )
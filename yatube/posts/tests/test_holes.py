@@ -0,0 +1,102 @@
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.test import Client, TestCase, override_settings
+from django.urls import reverse
+
+from posts.models import Post
+from posts.tests.fixtures import create_group, create_posts
+from posts.views import COUNT_PAGE
+
+User = get_user_model()
+
+
+@override_settings(HOLES_CACHE_TIMEOUT=20)
+class HolePunchingTests(TestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create_user(username='HasNoName')
+        cls.other = User.objects.create_user(username='OtherUser')
+        cls.group = create_group()
+        create_posts(cls.user, cls.group, count=COUNT_PAGE + 1)
+
+    def setUp(self):
+        cache.clear()
+        self.guest_client = Client()
+        self.authorized_client = Client()
+        self.authorized_client.force_login(self.user)
+        self.other_client = Client()
+        self.other_client.force_login(self.other)
+
+    def test_not_found_page_has_header(self):
+        """Страница 404 из закешированного view выходит без дыр."""
+        for url in (
+            reverse('posts:group_list', kwargs={'slug': 'nope'}),
+            reverse('posts:profile', kwargs={'username': 'nobody'}),
+        ):
+            with self.subTest(url=url):
+                response = self.authorized_client.get(url)
+                self.assertEqual(response.status_code, 404)
+                self.assertContains(
+                    response, self.user.username, status_code=404
+                )
+                self.assertNotContains(
+                    response, '<!--hole:', status_code=404
+                )
+
+    def test_cached_page_gets_personal_header(self):
+        """Закешированная лента показывает каждому свою шапку."""
+        url = reverse('posts:main_menu')
+        first = self.guest_client.get(url)
+        self.assertIsNotNone(first.context)
+        self.assertContains(first, 'Войти')
+
+        for client, username in (
+            (self.authorized_client, self.user.username),
+            (self.other_client, self.other.username),
+        ):
+            with self.subTest(username=username):
+                response = client.get(url)
+                self.assertTemplateNotUsed(response, 'posts/index.html')
+                self.assertTemplateUsed(response, 'includes/header.html')
+                self.assertContains(response, f'Пользователь: {username}')
+                self.assertNotContains(response, 'Войти')
+                self.assertNotContains(response, '<!--hole:')
+                self.assertIn('Cookie', response['Vary'])
+
+    def test_pages_cached_separately(self):
+        url = reverse('posts:main_menu')
+        self.guest_client.get(url)
+        response = self.guest_client.get(url, {'page': 2})
+        self.assertEqual(len(response.context['page_obj']), 1)
+
+    def test_new_post_invalidates_feeds(self):
+        """Новый пост сразу виден в закешированных лентах."""
+        url = reverse('posts:group_list', kwargs={'slug': self.group.slug})
+        self.guest_client.get(url)
+        post = Post.objects.create(
+            text='Свежий пост', author=self.user, group=self.group
+        )
+        response = self.guest_client.get(url)
+        self.assertTemplateUsed(response, 'posts/group_list.html')
+        self.assertContains(response, f'/posts/{post.pk}/')
+
+    def test_stream_fills_holes(self):
+        response = self.authorized_client.get(
+            reverse('posts:main_menu'), {'stream': 1}
+        )
+        content = b''.join(response.streaming_content).decode()
+        self.assertIn(f'Пользователь: {self.user.username}', content)
+        self.assertNotIn('<!--hole:', content)
+
+    def test_header_fragment_endpoint(self):
+        """Шапку можно получить отдельно для подстановки на клиенте."""
+        url = reverse('fragment', kwargs={'name': 'header'})
+        response = self.authorized_client.get(
+            url, {'path': reverse('posts:groups')}
+        )
+        self.assertContains(response, f'Пользователь: {self.user.username}')
+        self.assertContains(response, 'active')
+        self.assertIn('private', response['Cache-Control'])
+        missing = reverse('fragment', kwargs={'name': 'footer'})
+        self.assertEqual(self.guest_client.get(missing).status_code, 404)
@@ -0,0 +1,163 @@
+from io import StringIO
+from unittest import mock
+
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.core.management import call_command
+from django.contrib.admin.sites import site
+from django.test import Client, TestCase, TransactionTestCase
+from django.urls import reverse
+
+from core.counters import cache_incr
+from posts import counters
+from posts.models import Like, Post
+
+User = get_user_model()
+
+
+class LikeTests(TestCase):
+
+    def setUp(self):
+        cache.clear()
+        self.author = User.objects.create_user(username='HasNoName')
+        self.post = Post.objects.create(
+            text='Тестовый пост', author=self.author
+        )
+        self.url = reverse('posts:post_like', kwargs={'post_id': self.post.pk})
+
+    def like_by(self, username):
+        client = Client()
+        client.force_login(User.objects.create_user(username=username))
+        client.post(self.url)
+        return client
+
+    def test_likes_flushed_in_batch(self):
+        """Лайки копятся в кеше и попадают в пост одним сбросом."""
+        for number in range(3):
+            self.like_by(f'user{number}')
+        counters.likes.flush()
+        self.post.refresh_from_db()
+        self.assertEqual(self.post.likes_count, 3)
+        self.assertEqual(counters.likes.pending(self.post.pk), 0)
+
+    def test_second_click_removes_like(self):
+        """Повторный лайк того же пользователя снимает его."""
+        client = self.like_by('user')
+        client.post(self.url)
+        counters.likes.flush()
+        self.post.refresh_from_db()
+        self.assertEqual(self.post.likes_count, 0)
+        self.assertFalse(Like.objects.exists())
+
+    def test_unlike_after_flush_on_memcached(self):
+        """
+        Снятый после сброса лайк вычитается, хотя кеш, как memcached, не
+        хранит отрицательных чисел и не уходит ниже нуля.
+        """
+        incr = cache.incr
+
+        def unsigned_incr(key, delta=1, version=None):
+            if delta < 0:
+                return unsigned_decr(key, -delta, version)
+            return incr(key, delta, version)
+
+        def unsigned_decr(key, delta=1, version=None):
+            value = cache.get(key, version=version)
+            if value is None:
+                raise ValueError(key)
+            cache.set(key, max(0, value - delta), version=version)
+            return max(0, value - delta)
+
+        client = self.like_by('user')
+        with mock.patch.object(cache, 'incr', unsigned_incr), \
+                mock.patch.object(cache, 'decr', unsigned_decr):
+            counters.likes.flush()
+            client.post(self.url)
+            self.assertEqual(counters.likes.pending(self.post.pk), -1)
+            counters.likes.flush()
+        self.post.refresh_from_db()
+        self.assertEqual(self.post.likes_count, 0)
+        self.assertEqual(counters.likes.pending(self.post.pk), 0)
+
+    def test_late_dirty_key_flushed_next_time(self):
+        """Событие, чей dirty-ключ записан после сброса, не теряется."""
+        likes = counters.likes
+        cache_incr(likes.key('plus', self.post.pk))
+        seq = cache_incr(likes.key('seq'))
+        likes.flush()
+        cache.set(likes.key('dirty', seq), self.post.pk)
+        likes.flush()
+        self.post.refresh_from_db()
+        self.assertEqual(self.post.likes_count, 1)
+
+    def test_flush_writes_many_posts_in_one_update(self):
+        """Сброс по многим постам - один UPDATE, а не запрос на пост."""
+        Post.objects.bulk_create(
+            Post(text=f'Пост {number}', author=self.author)
+            for number in range(5)
+        )
+        posts = list(Post.objects.all())
+        for post in posts:
+            counters.likes.incr(post.pk, 2)
+        counters.likes.flush()
+        for post in posts:
+            counters.likes.incr(post.pk)
+        with self.assertNumQueries(3):
+            # SAVEPOINT, UPDATE ... CASE, RELEASE SAVEPOINT.
+            counters.likes.flush()
+
+    def test_detail_shows_pending_likes(self):
+        """Страница поста учитывает ещё не сброшенные лайки."""
+        self.like_by('user')
+        response = self.client.get(
+            reverse('posts:post_detail', kwargs={'post_id': self.post.pk})
+        )
+        self.assertEqual(response.context['likes_count'], 1)
+
+    def test_like_does_not_flush(self):
+        """Лайк только копит приращение, сброс делает flush_counters."""
+        self.like_by('user')
+        self.post.refresh_from_db()
+        self.assertEqual(self.post.likes_count, 0)
+        call_command('flush_counters', stdout=StringIO())
+        self.post.refresh_from_db()
+        self.assertEqual(self.post.likes_count, 1)
+
+    def test_reconcile(self):
+        """--reconcile пересчитывает счётчик по таблице лайков."""
+        self.like_by('user')
+        Post.objects.update(likes_count=10)
+        call_command('flush_counters', reconcile=True, stdout=StringIO())
+        self.post.refresh_from_db()
+        self.assertEqual(self.post.likes_count, 1)
+
+
+class LikeDeletionTests(TransactionTestCase):
+    """Лайки, удалённые мимо post_like, тоже вычитаются из счётчика."""
+
+    def setUp(self):
+        cache.clear()
+        self.author = User.objects.create_user(username='author')
+        self.post = Post.objects.create(text='Пост', author=self.author)
+        self.fan = User.objects.create_user(username='fan')
+        Like.objects.create(post=self.post, user=self.fan)
+        Post.objects.update(likes_count=1)
+
+    def assertLikesCount(self, expected):
+        counters.likes.flush()
+        self.post.refresh_from_db()
+        self.assertEqual(self.post.likes_count, expected)
+
+    def test_admin_delete_queryset(self):
+        site._registry[Like].delete_queryset(None, Like.objects.all())
+        self.assertFalse(Like.objects.exists())
+        self.assertLikesCount(0)
+
+    def test_admin_delete_model(self):
+        site._registry[Like].delete_model(None, Like.objects.get())
+        self.assertLikesCount(0)
+
+    def test_user_deletion(self):
+        self.fan.delete()
+        self.assertFalse(Like.objects.exists())
+        self.assertLikesCount(0)
@@ -1,15 +1,15 @@
 from django.contrib.auth import get_user_model
+from django.template import Context, Template
 from django.test import TestCase
 
-from ..models import Group, Post
+from ..models import Comment, Group, Post
 
 User = get_user_model()
 
 
 class PostModelTest(TestCase):
     @classmethod
-    def setUpClass(cls):
-        super().setUpClass()
+    def setUpTestData(cls):
         cls.user = User.objects.create_user(username='auth')
         cls.group = Group.objects.create(
             title='Тестовая группа',
@@ -30,3 +30,38 @@ class PostModelTest(TestCase):
         """Проверяем, что у моделей Post корректно работает __str__."""
         post_model = PostModelTest.post
         self.assertEqual(str(post_model), post_model.text[:15])
+
+    def test_text_html_matches_template_filters(self):
+        """text_html совпадает с тем, что давали фильтры шаблона."""
+        text = 'Первый <b>абзац</b>\n\nВторой & строка\nещё'
+        post = Post.objects.create(author=self.user, text=text)
+        comment = Comment.objects.create(
+            post=post, author=self.user, text=text
+        )
+        context = Context({'text': text})
+        self.assertEqual(
+            post.text_html,
+            Template('{{ text|linebreaks }}').render(context)
+        )
+        self.assertEqual(
+            comment.text_html, Template('{{ text }}').render(context)
+        )
+
+    def test_text_html_follows_text(self):
+        """HTML пересчитывается при сохранении текста, в том числе
+        через update_fields."""
+        post = Post.objects.get(pk=self.post.pk)
+        post.text = 'Новый <текст>'
+        post.save(update_fields=['text'])
+        post.refresh_from_db()
+        self.assertEqual(post.text_html, '<p>Новый &lt;текст&gt;</p>')
+
+    def test_deferred_text_not_loaded_on_save(self):
+        """Пост из ленты без текста сохраняется без чтения текста."""
+        post = Post.objects.defer('text', 'text_html').get(pk=self.post.pk)
+        post.views_count = 5
+        with self.assertNumQueries(1):
+            post.save()
+        self.assertEqual(post.get_deferred_fields(), {'text', 'text_html'})
+        post.refresh_from_db()
+        self.assertEqual(post.text_html, '<p>Тестовая пост</p>')
@@ -0,0 +1,91 @@
+from django.contrib.auth import get_user_model
+from django.test import Client, TestCase
+from django.urls import reverse
+
+from posts import group_stats
+from posts.models import Comment, Group, Post
+from posts.tests.mixins import QueryBudgetMixin
+
+User = get_user_model()
+
+AUTHORS = 5
+
+
+class QueryBudgetTests(QueryBudgetMixin, TestCase):
+    """Страницы с постами не делают запрос на каждый пост или комментарий."""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.authors = User.objects.bulk_create(
+            User(username=f'author{number}') for number in range(AUTHORS)
+        )
+        cls.author = User.objects.get(username='author0')
+        cls.group = Group.objects.create(
+            title='Test group',
+            slug='test_slug',
+            description='This is test description'
+        )
+        cls.post = Post.objects.create(
+            text='Пост с комментариями', author=cls.author, group=cls.group
+        )
+
+    def setUp(self):
+        self.guest_client = Client()
+        self.authorized_client = Client()
+        self.authorized_client.force_login(self.author)
+
+    def seed(self, size):
+        """Догружает посты разных авторов и комментарии до size штук."""
+        authors = list(User.objects.filter(username__startswith='author'))
+        missing = size - Post.objects.count()
+        Post.objects.bulk_create(
+            Post(
+                text=f'Пост {number}',
+                author=authors[number % len(authors)],
+                group=self.group,
+            )
+            for number in range(missing)
+        )
+        missing = size // 10 - Comment.objects.count()
+        Comment.objects.bulk_create(
+            Comment(
+                post=self.post,
+                author=authors[number % len(authors)],
+                text=f'Комментарий {number}',
+            )
+            for number in range(missing)
+        )
+        group_stats.rebuild(Group.objects.all())
+
+    def test_index(self):
+        self.assertBudget(
+            self.guest_client, reverse('posts:main_menu'), max_queries=2
+        )
+
+    def test_group_posts(self):
+        self.assertBudget(
+            self.guest_client,
+            reverse('posts:group_list', kwargs={'slug': self.group.slug}),
+            max_queries=3,
+        )
+
+    def test_profile(self):
+        self.assertBudget(
+            self.guest_client,
+            reverse('posts:profile', kwargs={'username': self.author}),
+            max_queries=4,
+        )
+
+    def test_post_detail(self):
+        # Просмотр только копит приращение в кеше: сброс счётчиков в
+        # базу делает flush_counters, а не запрос читателя.
+        self.assertBudget(
+            self.authorized_client,
+            reverse('posts:post_detail', kwargs={'post_id': self.post.pk}),
+            max_queries=6,
+        )
+
+    def test_popular(self):
+        self.assertBudget(
+            self.guest_client, reverse('posts:popular'), max_queries=2
+        )
@@ -0,0 +1,106 @@
+from http import HTTPStatus
+from unittest import mock
+
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.test import Client, RequestFactory, TestCase, override_settings
+from django.urls import reverse
+
+from core.ratelimit import client_ip, consume
+from posts.models import Comment, Post
+
+User = get_user_model()
+
+
+@override_settings(RATELIMITS={
+    'posts:post_create': '2/m',
+    'posts:add_comment': '1/m',
+})
+class RateLimitTests(TestCase):
+
+    def setUp(self):
+        cache.clear()
+        self.user = User.objects.create_user(username='HasNoName')
+        self.authorized_client = Client()
+        self.authorized_client.force_login(self.user)
+        self.post = Post.objects.create(text='Тестовый пост', author=self.user)
+
+    def test_post_create_limited(self):
+        """Сверх лимита пост не создаётся, ответ 429 с Retry-After."""
+        url = reverse('posts:post_create')
+        for number in range(2):
+            self.authorized_client.post(url, {'text': f'Пост {number}'})
+        posts_count = Post.objects.count()
+
+        response = self.authorized_client.post(url, {'text': 'Лишний пост'})
+
+        self.assertEqual(response.status_code, HTTPStatus.TOO_MANY_REQUESTS)
+        self.assertGreater(int(response['Retry-After']), 0)
+        self.assertEqual(Post.objects.count(), posts_count)
+
+    def test_get_not_limited(self):
+        """Открытие формы не расходует лимит."""
+        url = reverse('posts:post_create')
+        for _ in range(3):
+            response = self.authorized_client.get(url)
+            self.assertEqual(response.status_code, HTTPStatus.OK)
+
+    def test_limit_is_per_user(self):
+        """Лимит одного пользователя не мешает другому."""
+        url = reverse('posts:add_comment', kwargs={'post_id': self.post.pk})
+        other_client = Client()
+        other_client.force_login(User.objects.create_user(username='Other'))
+        self.authorized_client.post(url, {'text': 'Первый'})
+        limited = self.authorized_client.post(url, {'text': 'Второй'})
+        allowed = other_client.post(url, {'text': 'Чужой'})
+
+        self.assertEqual(limited.status_code, HTTPStatus.TOO_MANY_REQUESTS)
+        self.assertEqual(allowed.status_code, HTTPStatus.FOUND)
+        self.assertEqual(Comment.objects.count(), 2)
+
+
+class ClientIpTests(TestCase):
+
+    def setUp(self):
+        self.factory = RequestFactory()
+
+    def request(self, forwarded):
+        return self.factory.get(
+            '/', REMOTE_ADDR='127.0.0.1', HTTP_X_FORWARDED_FOR=forwarded
+        )
+
+    def test_header_ignored_without_proxies(self):
+        self.assertEqual(client_ip(self.request('10.0.0.1')), '127.0.0.1')
+
+    @override_settings(RATELIMIT_TRUSTED_PROXIES=1)
+    def test_spoofed_hops_ignored(self):
+        """Адреса, дописанные клиентом слева, не меняют его IP."""
+        request = self.request('127.0.0.1, 203.0.113.5')
+        self.assertEqual(client_ip(request), '203.0.113.5')
+
+    @override_settings(RATELIMIT_TRUSTED_PROXIES=2)
+    def test_short_header_falls_back_to_remote_addr(self):
+        self.assertEqual(client_ip(self.request('10.0.0.1')), '127.0.0.1')
+
+
+class SlidingWindowTests(TestCase):
+
+    def setUp(self):
+        cache.clear()
+
+    def consume_at(self, now):
+        with mock.patch('core.ratelimit.time.time', return_value=now):
+            return consume('test', 'ident', 10, 60)
+
+    def test_no_double_burst_at_period_boundary(self):
+        """В конце периода и сразу после него вместе - не больше limit."""
+        for _ in range(10):
+            self.assertIsNone(self.consume_at(6059))
+        self.assertIsNotNone(self.consume_at(6061))
+
+    def test_previous_period_expires_gradually(self):
+        for _ in range(10):
+            self.consume_at(6000)
+        # Прошла половина периода: из окна вышла половина запросов.
+        allowed = [self.consume_at(6090) is None for _ in range(6)]
+        self.assertEqual(allowed, [True] * 5 + [False])
@@ -0,0 +1,91 @@
+from unittest import mock
+
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.http import StreamingHttpResponse
+from django.test import Client, TestCase, override_settings
+from django.urls import reverse
+
+from posts.models import Post
+from posts.tests.fixtures import create_group, create_posts
+from posts.views import COUNT_PAGE
+
+User = get_user_model()
+
+
+class StreamingFeedTests(TestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create_user(username='HasNoName')
+        cls.group = create_group()
+        cls.posts = create_posts(
+            cls.user, cls.group, count=COUNT_PAGE * 2, text='Пост №'
+        )
+        cls.urls = (
+            reverse('posts:main_menu'),
+            reverse('posts:group_list', kwargs={'slug': cls.group.slug}),
+            reverse('posts:profile', kwargs={'username': cls.user.username}),
+        )
+
+    def setUp(self):
+        cache.clear()
+        self.client = Client()
+
+    def stream(self, url):
+        response = self.client.get(url, {'stream': 1})
+        self.assertIsInstance(response, StreamingHttpResponse)
+        return b''.join(response.streaming_content).decode()
+
+    def test_streams_whole_feed(self):
+        """С ?stream=1 лента выводится целиком, без пагинации."""
+        for url in self.urls:
+            with self.subTest(url=url):
+                content = self.stream(url)
+                self.assertIn('<html', content)
+                self.assertTrue(content.rstrip().endswith('</html>'))
+                self.assertNotIn('stream-', content)
+                self.assertNotIn('pagination', content)
+                for post in self.posts:
+                    self.assertIn(f'/posts/{post.pk}/', content)
+
+    def test_stream_matches_page_markup(self):
+        """Пост в потоке выглядит так же, как на обычной странице."""
+        url = reverse('posts:main_menu')
+        page = self.client.get(url).content.decode()
+        content = self.stream(url)
+        self.assertIn(f'Все публикации группы "{self.group.title}"', page)
+        self.assertIn(f'Все публикации группы "{self.group.title}"', content)
+
+    @mock.patch('core.streaming.STREAM_CHUNK_ITEMS', 3)
+    def test_stream_reads_feed_in_chunks(self):
+        """
+        Лента читается пачками по ключу (created, pk) и не обрезается:
+        запрос на пачку, каждый пост ровно один раз.
+        """
+        Post.objects.update(created=self.posts[0].created)
+        url = reverse('posts:main_menu')
+        chunks = -(-len(self.posts) // 3)
+        with self.assertNumQueries(chunks):
+            content = self.stream(url)
+        self.assertEqual(
+            content.count('Подробная информация'), len(self.posts)
+        )
+        for post in self.posts:
+            self.assertEqual(content.count(f'/posts/{post.pk}/"'), 1)
+
+    @override_settings(RATELIMITS={'posts:stream': '1/m'})
+    def test_stream_is_rate_limited(self):
+        """Потоковая лента дорогая: частые запросы получают 429."""
+        url = reverse('posts:main_menu')
+        self.stream(url)
+        response = self.client.get(url, {'stream': 1})
+        self.assertEqual(response.status_code, 429)
+        # Обычная страница ленты лимитом не ограничена.
+        self.assertEqual(self.client.get(url).status_code, 200)
+
+    def test_queries_do_not_grow_with_feed(self):
+        """Посты читаются пачками, без запроса на каждый пост."""
+        url = reverse('posts:group_list', kwargs={'slug': self.group.slug})
+        with self.assertNumQueries(2):
+            self.stream(url)
@@ -0,0 +1,66 @@
+from datetime import timedelta
+from io import StringIO
+
+from django.contrib.auth import get_user_model
+from django.core.management import call_command
+from django.test import TestCase
+from django.urls import reverse
+from django.utils import timezone
+
+from posts import trending
+from posts.models import Comment, Post
+
+User = get_user_model()
+
+
+class TrendingTests(TestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create_user(username='HasNoName')
+        cls.quiet = Post.objects.create(text='Тихий пост', author=cls.user)
+        cls.busy = Post.objects.create(text='Активный пост', author=cls.user)
+        cls.untouched = Post.objects.create(
+            text='Без событий', author=cls.user
+        )
+
+    def comment(self, post, count=1):
+        for number in range(count):
+            Comment.objects.create(
+                post=post, author=self.user, text=f'Комментарий {number}'
+            )
+
+    def test_more_activity_ranks_higher(self):
+        """Пост с большим числом комментариев выше в популярных."""
+        self.comment(self.quiet)
+        self.comment(self.busy, 3)
+        response = self.client.get(reverse('posts:popular'))
+        self.assertEqual(
+            list(response.context['page_obj']), [self.busy, self.quiet]
+        )
+
+    def test_old_activity_decays(self):
+        """Старые события весят меньше свежих."""
+        now = timezone.now()
+        for _ in range(3):
+            trending.record(
+                self.busy.pk, trending.COMMENT_WEIGHT, now - timedelta(days=3)
+            )
+        trending.record(self.quiet.pk, trending.COMMENT_WEIGHT, now)
+        self.assertEqual(list(trending.top(2)), [self.quiet, self.busy])
+
+    def test_recompute_matches_incremental(self):
+        """Пересчёт по истории даёт те же очки, что и инкрементальный."""
+        self.comment(self.quiet)
+        self.comment(self.busy, 2)
+        expected = dict(Post.objects.values_list('pk', 'trending_score'))
+        Post.objects.update(trending_score=None)
+
+        call_command('recompute_trending', stdout=StringIO())
+
+        for pk, score in Post.objects.values_list('pk', 'trending_score'):
+            with self.subTest(pk=pk):
+                if expected[pk] is None:
+                    self.assertIsNone(score)
+                else:
+                    self.assertAlmostEqual(score, expected[pk])
@@ -1,40 +1,32 @@
 from http import HTTPStatus
 
 from django.contrib.auth import get_user_model
+from django.core.cache import cache
 from django.test import Client, TestCase
 
-from posts.models import Group, Post
+from posts.tests.fixtures import create_group, create_posts
 
 User = get_user_model()
 
 
 class StaticURLTests(TestCase):
     @classmethod
-    def setUpClass(cls):
-        super().setUpClass()
-
-        Group.objects.create(
-            title='Test group',
-            slug='test_slug',
-            description='This is test description'
-        )
+    def setUpTestData(cls):
+        cls.group = create_group()
+        cls.user = User.objects.create_user(username='HasNoName')
+        cls.user_no_author = User.objects.create_user(username='HasNoAuthor')
+        cls.post, = create_posts(cls.user, cls.group)
+        cls.post_pk = cls.post.pk
+        cls.post_slug = cls.group.slug
 
     def setUp(self):
-        self.user = User.objects.create_user(username='HasNoName')
-        self.user_no_author = User.objects.create_user(username='HasNoAuthor')
+        # Ленты кешируются (core.holes): каждому тесту нужен промах.
+        cache.clear()
         self.authorized_client = Client()
         self.authorized_client_no_author = Client()
         self.authorized_client.force_login(self.user)
         self.authorized_client_no_author.force_login(self.user_no_author)
 
-        Post.objects.create(
-            text='Test post text',
-            group=Group.objects.get(pk=1),
-            author=self.user
-        )
-        self.post_pk = Post.objects.get(pk=1).pk
-        self.post_slug = Group.objects.get(pk=1).slug
-
     def test_urls_404(self):
         """Несуществующая страница /posts/lost/ возвращает 404."""
         response = self.authorized_client.get('/posts/lost/')
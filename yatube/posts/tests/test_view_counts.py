@@ -0,0 +1,80 @@
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.db import connection
+from django.test import Client, TestCase
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+
+from posts import counters
+from posts.models import Post
+
+User = get_user_model()
+
+
+class ViewCountTests(TestCase):
+
+    def setUp(self):
+        cache.clear()
+        self.user = User.objects.create_user(username='HasNoName')
+        self.post = Post.objects.create(
+            text='Тестовый пост', author=self.user
+        )
+        self.url = reverse(
+            'posts:post_detail', kwargs={'post_id': self.post.pk}
+        )
+
+    def test_repeated_views_counted_once(self):
+        """Повторные просмотры одного зрителя в окне не считаются."""
+        for _ in range(3):
+            self.client.get(self.url)
+        counters.views.flush()
+        self.post.refresh_from_db()
+        self.assertEqual(self.post.views_count, 1)
+
+    def test_different_viewers_counted(self):
+        """Разные зрители дают разные просмотры."""
+        self.client.get(self.url)
+        Client(HTTP_USER_AGENT='other').get(self.url)
+        authorized_client = Client()
+        authorized_client.force_login(self.user)
+        authorized_client.get(self.url)
+        counters.views.flush()
+        self.post.refresh_from_db()
+        self.assertEqual(self.post.views_count, 3)
+
+    def test_view_does_not_write_post(self):
+        """Просмотр только копит приращение и не пишет в базу."""
+        with CaptureQueriesContext(connection) as context:
+            response = self.client.get(self.url)
+        self.assertFalse([
+            query['sql'] for query in context.captured_queries
+            if not query['sql'].startswith('SELECT')
+        ])
+        self.assertEqual(response.context['views_count'], 1)
+
+    def test_flushed_views_raise_trending(self):
+        """Сброшенные просмотры попадают в рейтинг популярных."""
+        self.client.get(self.url)
+        counters.views.flush()
+        self.post.refresh_from_db()
+        self.assertIsNotNone(self.post.trending_score)
+
+    def test_flush_raises_trending_in_one_update(self):
+        """Рейтинг пачки постов пишется одним UPDATE, а не CAS на пост."""
+        Post.objects.bulk_create(
+            Post(text=f'Пост {number}', author=self.user)
+            for number in range(5)
+        )
+        for pk in Post.objects.values_list('pk', flat=True):
+            counters.views.incr(pk)
+        with CaptureQueriesContext(connection) as context:
+            counters.views.flush()
+        updates = [
+            query['sql'] for query in context.captured_queries
+            if query['sql'].startswith('UPDATE')
+        ]
+        # Одно обновление views_count и одно - trending_score.
+        self.assertEqual(len(updates), 2)
+        self.assertEqual(
+            Post.objects.filter(trending_score__isnull=False).count(), 6
+        )
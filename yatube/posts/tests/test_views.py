@@ -1,52 +1,38 @@
-import shutil
-import tempfile
-
-from django.conf import settings
 from django.contrib.auth import get_user_model
-from django.core.files.uploadedfile import SimpleUploadedFile
+from django.core.cache import cache
 from django.test import Client, TestCase, override_settings
 from django.urls import reverse
 
-from posts.models import Group, Post
+from posts.models import EXCERPT_LENGTH, FEED_DEFERRED_FIELDS, Post
+from posts.tests.fixtures import (
+    create_group, create_posts, stored_image_name, uploaded_gif,
+)
 from posts.views import COUNT_PAGE
 
-TEMP_MEDIA_ROOT = tempfile.mkdtemp(dir=settings.BASE_DIR)
-
 User = get_user_model()
 
 
+# Каждый подтест снова открывает ту же ленту и проверяет context,
+# которого у ответа из кеша нет.
+@override_settings(HOLES_CACHE_TIMEOUT=0)
 class PaginatorViewsTest(TestCase):
     @classmethod
-    def setUpClass(cls):
-        super().setUpClass()
-
-        Group.objects.create(
-            title='Test group',
-            slug='test_slug',
-            description='This is test description'
+    def setUpTestData(cls):
+        cls.group = create_group()
+        cls.user = User.objects.create_user(username='HasNoName')
+        cls.user_no_author = User.objects.create_user(username='HasNoAuthor')
+        cls.posts_context = create_posts(
+            cls.user, cls.group, count=12, text='Текст тестового поста №'
         )
+        cls.post_pk = cls.posts_context[0].pk
+        cls.group_slug = cls.group.slug
 
     def setUp(self):
-        self.user = User.objects.create_user(username='HasNoName')
-        self.user_no_author = User.objects.create_user(username='HasNoAuthor')
         self.authorized_client = Client()
         self.authorized_client_no_author = Client()
         self.authorized_client.force_login(self.user)
         self.authorized_client_no_author.force_login(self.user_no_author)
 
-        self.posts_context = []
-        for nomber_post in range(1, 13):
-            self.posts_context += [f'Текст тестового поста №{nomber_post}']
-
-        for post in self.posts_context:
-            Post.objects.create(
-                text=post,
-                group=Group.objects.get(pk=1),
-                author=self.user
-            )
-        self.post_pk = Post.objects.get(pk=1).pk
-        self.group_slug = Group.objects.get(pk=1).slug
-
     def test_first_page_contains_ten_records(self):
         '''Проверка: количество постов на первой странице равно 10.'''
 
@@ -82,40 +68,24 @@ class PaginatorViewsTest(TestCase):
 
 class GroupRedirectTests(TestCase):
     @classmethod
-    def setUpClass(cls):
-        super().setUpClass()
-
-        Group.objects.create(
-            title='Test group',
-            slug='test_slug',
-            description='This is test description'
-        )
-
-        Group.objects.create(
-            title='Test group №2',
-            slug='test2_slug',
-            description='This is test 2 description'
-        )
+    def setUpTestData(cls):
+        cls.group = create_group()
+        cls.other_group = create_group(2)
+        cls.user = User.objects.create_user(username='HasNoName')
+        cls.user_no_author = User.objects.create_user(username='HasNoAuthor')
+        cls.post, = create_posts(cls.user, cls.group)
+        cls.post_pk = cls.post.pk
+        cls.group_slug = cls.group.slug
+        cls.group_no_right_slug = cls.other_group.slug
 
     def setUp(self):
-        self.user = User.objects.create_user(username='HasNoName')
-        self.user_no_author = User.objects.create_user(username='HasNoAuthor')
+        # Ленты кешируются (core.holes): каждому тесту нужен промах.
+        cache.clear()
         self.authorized_client = Client()
         self.authorized_client_no_author = Client()
         self.authorized_client.force_login(self.user)
         self.authorized_client_no_author.force_login(self.user_no_author)
 
-        Post.objects.create(
-            text='Test post text',
-            group=Group.objects.get(pk=1),
-            author=self.user
-        )
-
-        self.post = Post.objects.get(text='Test post text')
-        self.post_pk = Post.objects.get(pk=1).pk
-        self.group_slug = Group.objects.get(pk=1).slug
-        self.group_no_right_slug = Group.objects.get(pk=2).slug
-
     def test_pages_uses_correct_template(self):
         """Проверяем, что вьюхи используют правильные шаблоны."""
         templates_pages_names = {
@@ -154,10 +124,7 @@ class GroupRedirectTests(TestCase):
                             kwargs={'post_id': self.post_pk}
                         )))
         self.assertEqual(response.context.get('post').text, 'Test post text')
-        self.assertEqual(
-            response.context.get('post').group,
-            Group.objects.get(
-                pk=1))
+        self.assertEqual(response.context.get('post').group, self.group)
         self.assertEqual(response.context.get('post').author, self.user)
 
     def test_group_list_pages_show_correct_context(self):
@@ -167,10 +134,7 @@ class GroupRedirectTests(TestCase):
                         'posts:group_list',
                         kwargs={'slug': self.group_slug}
                     )))
-        self.assertEqual(
-            response.context.get('group'),
-            Group.objects.get(
-                slug=self.group_slug))
+        self.assertEqual(response.context.get('group'), self.group)
 
     def test_create_post_show_correct_context(self):
         """При создании поста указать группу, то этот пост появляется на
@@ -209,9 +173,7 @@ class GroupRedirectTests(TestCase):
 class CasheTests(TestCase):
 
     @classmethod
-    def setUpClass(cls):
-        super().setUpClass()
-
+    def setUpTestData(cls):
         cls.user = User.objects.create_user(username='User_test')
         cls.post_cash = Post.objects.create(
             author=cls.user,
@@ -236,51 +198,23 @@ class CasheTests(TestCase):
         self.assertNotEqual(response, response_clear)
 
 
-@override_settings(MEDIA_ROOT=TEMP_MEDIA_ROOT)
 class TaskContextImageTests(TestCase):
     @classmethod
-    def setUpClass(cls):
-        super().setUpClass()
-
-        cls.group = Group.objects.create(
-            title='Test group',
-            slug='test_slug',
-            description='This is test description'
+    def setUpTestData(cls):
+        cls.group = create_group()
+        cls.user = User.objects.create_user(username='HasNoName')
+        cls.post = Post.objects.create(
+            text='Test post text',
+            group=cls.group,
+            author=cls.user,
+            image=uploaded_gif()
         )
-
-    @classmethod
-    def tearDownClass(cls):
-        super().tearDownClass()
-        shutil.rmtree(TEMP_MEDIA_ROOT, ignore_errors=True)
+        cls.image_name = stored_image_name()
 
     def setUp(self):
-        self.user = User.objects.create_user(username='HasNoName')
         self.authorized_client = Client()
         self.authorized_client.force_login(self.user)
 
-        small_gif = (
-            b'\x47\x49\x46\x38\x39\x61\x02\x00'
-            b'\x01\x00\x80\x00\x00\x00\x00\x00'
-            b'\xFF\xFF\xFF\x21\xF9\x04\x00\x00'
-            b'\x00\x00\x00\x2C\x00\x00\x00\x00'
-            b'\x02\x00\x01\x00\x00\x02\x02\x0C'
-            b'\x0A\x00\x3B'
-        )
-        self.uploaded = SimpleUploadedFile(
-            name='small.gif',
-            content=small_gif,
-            content_type='image/gif'
-        )
-
-        Post.objects.create(
-            text='Test post text',
-            group=Group.objects.get(pk=1),
-            author=self.user,
-            image=self.uploaded
-        )
-
-        self.post = Post.objects.get(pk=1)
-
     def test_create_task(self):
         """В контексте передается картинка."""
 
@@ -298,7 +232,7 @@ class TaskContextImageTests(TestCase):
                             get(revers_name))
 
                 self.assertEqual(response.context.get(
-                    'post').image, f'posts/{self.uploaded.name}')
+                    'post').image, self.image_name)
 
     def test_create_task2(self):
         """В контексте передается картинка."""
@@ -318,4 +252,38 @@ class TaskContextImageTests(TestCase):
 
                 self.assertEqual(
                     response.context['page_obj'][0].image,
-                    f'posts/{self.uploaded.name}')
+                    self.image_name)
+
+
+class ExcerptTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.group = create_group()
+        cls.user = User.objects.create_user(username='HasNoName')
+        cls.ending = 'Конец длинного поста'
+        cls.post, = create_posts(
+            cls.user, cls.group, text='Слово ' * EXCERPT_LENGTH + cls.ending
+        )
+
+    def test_feeds_show_excerpt_without_full_text(self):
+        """Ленты выводят отрывок и не загружают полный текст поста."""
+        for url in (
+            reverse('posts:main_menu'),
+            reverse('posts:group_list', kwargs={'slug': self.group.slug}),
+            reverse('posts:profile', kwargs={'username': 'HasNoName'}),
+        ):
+            with self.subTest(url=url):
+                response = self.client.get(url)
+                post = response.context['page_obj'][0]
+                self.assertEqual(
+                    post.get_deferred_fields(), set(FEED_DEFERRED_FIELDS)
+                )
+                self.assertNotContains(response, self.ending)
+                self.assertContains(response, 'Читать полностью')
+
+    def test_post_detail_shows_full_text(self):
+        """Страница поста выводит текст целиком."""
+        response = self.client.get(
+            reverse('posts:post_detail', kwargs={'post_id': self.post.pk})
+        )
+        self.assertContains(response, self.ending)
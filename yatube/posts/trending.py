@@ -0,0 +1,105 @@
+"""
+Рейтинг популярных постов с затуханием по времени.
+
+Каждое событие (комментарий, просмотр) добавляет посту вес, который
+вдвое теряет значимость за TRENDING_HALF_LIFE_HOURS. Чтобы не пересчитывать
+старые очки при каждом событии, все веса приводятся к одной точке отсчёта
+EPOCH: событие в момент t весит weight * 2 ** ((t - EPOCH) / half_life).
+Тогда порядок постов по сумме таких весов совпадает с порядком по
+затухающему рейтингу на любой момент, а новое событие просто добавляется
+к сумме. Сумма хранится в логарифме (Post.trending_score), чтобы не
+переполнить float, и проиндексирована: верхние N постов читаются
+по индексу без сортировки всей таблицы.
+"""
+import math
+from datetime import datetime
+
+from django.conf import settings
+from django.db import transaction
+from django.utils import timezone
+
+from .models import FEED_DEFERRED_FIELDS, Post
+
+EPOCH = datetime(2022, 1, 1, tzinfo=timezone.utc)
+COMMENT_WEIGHT = 3
+VIEW_WEIGHT = 1
+# Сколько раз повторить запись очков, если пост успели обновить параллельно.
+MAX_RETRIES = 5
+# Постов на одно чтение и один UPDATE в record_many.
+BATCH_SIZE = 500
+
+
+def half_life_seconds():
+    return getattr(settings, 'TRENDING_HALF_LIFE_HOURS', 24) * 3600
+
+
+def event_score(weight, when):
+    """Логарифм веса события, приведённого к EPOCH."""
+    elapsed = (when - EPOCH).total_seconds()
+    return math.log(weight) + elapsed / half_life_seconds() * math.log(2)
+
+
+def combine(score, other):
+    """log(exp(score) + exp(other)) без переполнения."""
+    if score is None:
+        return other
+    high, low = max(score, other), min(score, other)
+    return high + math.log1p(math.exp(low - high))
+
+
+def record(post_id, weight, when=None):
+    """
+    Добавляет посту событие с весом weight.
+
+    Запись условная (UPDATE ... WHERE trending_score = прочитанное), так
+    что параллельные события не затирают друг друга и строка не
+    блокируется дольше одного UPDATE.
+    """
+    if weight <= 0:
+        return
+    score = event_score(weight, when or timezone.now())
+    posts = Post.objects.filter(pk=post_id)
+    for _ in range(MAX_RETRIES):
+        current = posts.values_list('trending_score', flat=True)
+        if not current:
+            return
+        current = current[0]
+        if posts.filter(trending_score=current).update(
+            trending_score=combine(current, score)
+        ):
+            return
+
+
+def record_many(weights, when=None):
+    """
+    Добавляет события пачке постов {pk: вес}: одно чтение и один UPDATE
+    вместо условной записи на каждый пост.
+
+    Строки читаются с блокировкой до конца транзакции, поэтому
+    параллельный record не затрёт результат, а перечитает его.
+    """
+    pks = [pk for pk, weight in weights.items() if weight > 0]
+    when = when or timezone.now()
+    for start in range(0, len(pks), BATCH_SIZE):
+        with transaction.atomic():
+            posts = list(
+                Post.objects.select_for_update()
+                .filter(pk__in=pks[start:start + BATCH_SIZE])
+                .only('pk', 'trending_score')
+            )
+            for post in posts:
+                post.trending_score = combine(
+                    post.trending_score, event_score(weights[post.pk], when)
+                )
+            Post.objects.bulk_update(posts, ['trending_score'])
+
+
+def top(limit):
+    """Самые популярные посты; читаются по индексу trending_score."""
+    return (
+        Post.objects
+        .filter(trending_score__isnull=False)
+        .select_related('author', 'group')
+        .defer(*FEED_DEFERRED_FIELDS)
+        .order_by('-trending_score')[:limit]
+    )
@@ -1,14 +1,37 @@
 from django.urls import path
 from django.conf import settings
-from django.conf.urls.static import static
 
-from . import views
+from core.conditional import cache_conditional
+
+from . import feeds, views
+
+# Лента для читалок перестраивается только после изменения постов своей
+# группы или своего автора.
+cached_feed = cache_conditional(feeds.generation)
 
 app_name = 'posts'
 
 urlpatterns = [
+    path('popular/', views.popular, name='popular'),
+    path('group/', views.groups, name='groups'),
     path('group/<slug:slug>/', views.group_posts, name='group_list'),
+    path(
+        'group/<slug:slug>/rss/',
+        cached_feed(feeds.GroupFeed()), name='group_rss'
+    ),
+    path(
+        'group/<slug:slug>/atom/',
+        cached_feed(feeds.GroupAtomFeed()), name='group_atom'
+    ),
     path('profile/<str:username>/', views.profile, name='profile'),
+    path(
+        'profile/<str:username>/rss/',
+        cached_feed(feeds.AuthorFeed()), name='profile_rss'
+    ),
+    path(
+        'profile/<str:username>/atom/',
+        cached_feed(feeds.AuthorAtomFeed()), name='profile_atom'
+    ),
     path('posts/<int:post_id>/', views.post_detail, name='post_detail'),
     path('create/', views.post_create, name='post_create'),
     path('posts/<int:post_id>/edit/', views.post_edit, name='post_edit'),
@@ -16,10 +39,14 @@ urlpatterns = [
         'posts/<int:post_id>/comment/',
         views.add_comment, name='add_comment'
     ),
+    path('posts/<int:post_id>/like/', views.post_like, name='post_like'),
     path('', views.index, name='main_menu'),
 ]
 
 if settings.DEBUG:
+    # Раздача загрузок самим Django нужна только при разработке.
+    from django.conf.urls.static import static
+
     urlpatterns += static(
         settings.MEDIA_URL, document_root=settings.MEDIA_ROOT
     )
@@ -1,12 +1,23 @@
 from django.contrib.auth.models import User
 from django.core.paginator import Paginator
+from django.db.models import F
 from django.shortcuts import get_object_or_404, redirect, render
 from django.contrib.auth.decorators import login_required
+from django.views.decorators.http import require_POST
 
+from core.holes import cache_with_holes
+from core.ratelimit import exceeded, ratelimit, too_many_requests
+from core.streaming import stream_render
+
+from . import counters, trending
 from .forms import PostForm, CommentForm
-from .models import Group, Post, Comment
+from .models import (
+    FEED_DEFERRED_FIELDS, ArchivedComment, ArchivedPost, Comment, Group,
+    Like, Post,
+)
 
 COUNT_PAGE = 10
+POPULAR_LIMIT = 100
 
 
 def paginator(request, posts):
@@ -15,11 +26,47 @@ def paginator(request, posts):
     return paginator.get_page(page_number)
 
 
+def render_feed(request, template, context, posts, **block_context):
+    """
+    Страница ленты; с ?stream=1 - вся лента одним потоковым ответом
+    без пагинации (для выгрузки и больших страниц).
+    """
+    if request.GET.get('stream') == '1':
+        retry_after = exceeded(request, 'posts:stream', '5/m')
+        if retry_after:
+            return too_many_requests(request, retry_after)
+        return stream_render(
+            request, template, context, posts,
+            'includes/post_block.html', item_name='post',
+            item_context=block_context, separator='<hr>',
+            ordering=('-created', '-pk'),
+        )
+    context['page_obj'] = paginator(request, posts)
+    return render(request, template, context)
+
+
+@cache_with_holes()
 def index(request):
     template = 'posts/index.html'
     title = 'Последние обновления на сайте'
-    posts = Post.objects.all()
-    page_obj = paginator(request, posts)
+    posts = (
+        Post.objects
+        .select_related('author', 'group')
+        .defer(*FEED_DEFERRED_FIELDS)
+    )
+
+    context = {
+        'title': title,
+    }
+    return render_feed(
+        request, template, context, posts, show_author=True, show_group=True
+    )
+
+
+def popular(request):
+    template = 'posts/popular.html'
+    title = 'Популярные записи'
+    page_obj = paginator(request, trending.top(POPULAR_LIMIT))
 
     context = {
         'title': title,
@@ -28,56 +75,118 @@ def index(request):
     return render(request, template, context)
 
 
+def groups(request):
+    groups = (
+        Group.objects
+        .order_by(F('last_post_at').desc(nulls_last=True), 'title')
+    )
+    page_obj = paginator(request, groups)
+
+    context = {
+        'page_obj': page_obj,
+    }
+    return render(request, 'posts/groups.html', context)
+
+
+@cache_with_holes()
 def group_posts(request, slug):
     template = 'posts/group_list.html'
     group = get_object_or_404(Group, slug=slug)
     posts = (
         Post.objects
         .filter(group=group)
+        .select_related('author', 'group')
+        .defer(*FEED_DEFERRED_FIELDS)
     )
-    page_obj = paginator(request, posts)
 
     context = {
         'group': group,
-        'page_obj': page_obj
     }
-    return render(request, template, context)
+    return render_feed(
+        request, template, context, posts, show_author=True, show_group=False
+    )
 
 
+@cache_with_holes()
 def profile(request, username):
     author = get_object_or_404(User, username=username)
-    posts = Post.objects.filter(author=author.pk)
+    posts = (
+        Post.objects
+        .filter(author=author.pk)
+        .select_related('author', 'group')
+        .defer(*FEED_DEFERRED_FIELDS)
+    )
     post_numbers = Post.objects.filter(author=author.pk).count()
-    page_obj = paginator(request, posts)
 
     context = {
         'author': author,
         'posts_numbers': post_numbers,
-        'page_obj': page_obj,
     }
-    return render(request, 'posts/profile.html', context)
+    return render_feed(
+        request, 'posts/profile.html', context, posts,
+        show_author=False, show_group=True,
+    )
 
 
 def post_detail(request, post_id):
-    post = get_object_or_404(Post, pk=post_id)
+    try:
+        post = Post.objects.select_related('author', 'group').get(
+            pk=post_id
+        )
+    except Post.DoesNotExist:
+        return archived_post_detail(request, post_id)
     post_numbers = Post.objects.filter(author=post.author).count()
-    comments = Comment.objects.filter(post=post)
+    comments = Comment.objects.filter(post=post).select_related('author')
     form = CommentForm(request.POST or None)
     if request.method == 'POST':
         return redirect('posts: add_comment')
+    counters.record_view(request, post.pk)
+    likes_count = post.likes_count + counters.likes.pending(post.pk)
+    views_count = post.views_count + counters.views.pending(post.pk)
+    liked = (
+        request.user.is_authenticated
+        and Like.objects.filter(post=post, user=request.user).exists()
+    )
     context = {
         'post': post,
         'posts_numbers': post_numbers,
         'comments': comments,
         'form': form,
+        'likes_count': likes_count,
+        'views_count': views_count,
+        'liked': liked,
+    }
+    return render(request, 'posts/post_detail.html', context)
+
+
+def archived_post_detail(request, post_id):
+    """Пост, перенесённый в архив: только чтение, без комментирования."""
+    post = get_object_or_404(ArchivedPost, pk=post_id)
+    comments = list(ArchivedComment.objects.filter(post_id=post.pk))
+    # У архивных таблиц нет внешних ключей: авторов поста и комментариев
+    # читаем одним запросом вместо запроса на каждый комментарий.
+    authors = User.objects.in_bulk(
+        {post.author_id, *(comment.author_id for comment in comments)}
+    )
+    post.author = authors.get(post.author_id)
+    for comment in comments:
+        comment.author = authors.get(comment.author_id)
+    context = {
+        'post': post,
+        'posts_numbers': Post.objects.filter(author=post.author_id).count(),
+        'comments': comments,
+        'likes_count': post.likes_count,
+        'views_count': post.views_count,
+        'archived': True,
     }
     return render(request, 'posts/post_detail.html', context)
 
 
 @login_required
+@ratelimit('posts:post_create', rate='5/m')
 def post_create(request):
     if request.method == 'POST':
-        form = PostForm(request.POST)
+        form = PostForm(request.POST, files=request.FILES or None)
         if form.is_valid():
             post = form.save(commit=False)
             post.author = request.user
@@ -112,6 +221,7 @@ def post_edit(request, post_id):
 
 
 @login_required
+@ratelimit('posts:add_comment', rate='10/m')
 def add_comment(request, post_id):
     post = get_object_or_404(Post, id=post_id)
     form = CommentForm(request.POST or None)
@@ -121,3 +231,19 @@ def add_comment(request, post_id):
         comment.post = post
         comment.save()
     return redirect('posts:post_detail', post_id=post_id)
+
+
+@login_required
+@require_POST
+@ratelimit('posts:post_like', rate='30/m')
+def post_like(request, post_id):
+    """Ставит или снимает лайк; счётчик поста обновится при сбросе буфера."""
+    post = get_object_or_404(Post, id=post_id)
+    deleted, _ = Like.objects.filter(post=post, user=request.user).delete()
+    if deleted:
+        counters.likes.incr(post.pk, -1)
+    else:
+        _, created = Like.objects.get_or_create(post=post, user=request.user)
+        if created:
+            counters.likes.incr(post.pk)
+    return redirect('posts:post_detail', post_id=post_id)
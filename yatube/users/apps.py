@@ -1,5 +1,17 @@
 from django.apps import AppConfig
+from django.conf import settings
+from django.db.models.signals import post_delete, post_save
 
 
 class UsersConfig(AppConfig):
     name = 'users'
+
+    def ready(self):
+        from .backends import invalidate_cached_user
+
+        post_save.connect(
+            invalidate_cached_user, sender=settings.AUTH_USER_MODEL
+        )
+        post_delete.connect(
+            invalidate_cached_user, sender=settings.AUTH_USER_MODEL
+        )
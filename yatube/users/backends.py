@@ -0,0 +1,33 @@
+from django.conf import settings
+from django.contrib.auth.backends import ModelBackend
+from django.core.cache import cache
+
+USER_CACHE_KEY = 'users:user:{}'
+
+
+def user_cache_key(user_id):
+    return USER_CACHE_KEY.format(user_id)
+
+
+def invalidate_cached_user(sender, instance, **kwargs):
+    """Сбрасывает закешированного пользователя при изменении или удалении."""
+    cache.delete(user_cache_key(instance.pk))
+
+
+class CachedModelBackend(ModelBackend):
+    """
+    ModelBackend, который берёт request.user из кеша.
+
+    Без него AuthenticationMiddleware делает запрос к auth_user на каждую
+    страницу залогиненного пользователя.
+    """
+
+    def get_user(self, user_id):
+        key = user_cache_key(user_id)
+        user = cache.get(key)
+        if user is None:
+            user = super().get_user(user_id)
+            if user is None:
+                return None
+            cache.set(key, user, getattr(settings, 'USER_CACHE_TIMEOUT', 300))
+        return user if self.user_can_authenticate(user) else None
@@ -0,0 +1,45 @@
+"""
+Хешеры паролей со стоимостью из настроек.
+
+Стоимость хеша - это CPU на каждый вход и регистрацию. Она задаётся
+настройками PASSWORD_ARGON2_*, PASSWORD_BCRYPT_ROUNDS и
+PASSWORD_PBKDF2_ITERATIONS; подобрать её под железо помогает
+manage.py bench_auth. Django сам пересчитывает хеш при успешном входе,
+если он сделан не первым хешером из PASSWORD_HASHERS или с другой
+стоимостью, поэтому смена политики применяется постепенно и без сброса
+паролей.
+"""
+from django.conf import settings
+from django.contrib.auth import hashers
+
+
+class Argon2PasswordHasher(hashers.Argon2PasswordHasher):
+
+    @property
+    def time_cost(self):
+        return getattr(settings, 'PASSWORD_ARGON2_TIME_COST', 2)
+
+    @property
+    def memory_cost(self):
+        return getattr(settings, 'PASSWORD_ARGON2_MEMORY_COST', 512)
+
+    @property
+    def parallelism(self):
+        return getattr(settings, 'PASSWORD_ARGON2_PARALLELISM', 2)
+
+
+class BCryptSHA256PasswordHasher(hashers.BCryptSHA256PasswordHasher):
+
+    @property
+    def rounds(self):
+        return getattr(settings, 'PASSWORD_BCRYPT_ROUNDS', 12)
+
+
+class PBKDF2PasswordHasher(hashers.PBKDF2PasswordHasher):
+
+    @property
+    def iterations(self):
+        return getattr(
+            settings, 'PASSWORD_PBKDF2_ITERATIONS',
+            hashers.PBKDF2PasswordHasher.iterations
+        )
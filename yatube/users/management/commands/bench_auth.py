@@ -0,0 +1,75 @@
+import time
+
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.contrib.auth.hashers import get_hasher
+from django.core.management.base import BaseCommand
+from django.test import Client, override_settings
+from django.urls import reverse
+from django.utils.module_loading import import_string
+
+from core.bench import scratch_database
+
+User = get_user_model()
+
+PASSWORD = 'bench-Password-123'
+
+
+def cpu_ms(function, repeat):
+    """Среднее процессорное время вызова function в миллисекундах."""
+    started = time.process_time()
+    for _ in range(repeat):
+        function()
+    return (time.process_time() - started) * 1000 / repeat
+
+
+class Command(BaseCommand):
+    help = (
+        'Замеряет процессорное время проверки пароля каждым хешером из '
+        'PASSWORD_HASHERS и целого запроса входа, и сколько входов в '
+        'секунду выдержит один воркер.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--repeat', type=int, default=5,
+            help='Сколько проверок пароля и входов усреднять.'
+        )
+
+    def handle(self, *args, **options):
+        repeat = options['repeat']
+        self.stdout.write(f'{"хешер":<60}{"мс CPU":>10}{"входов/с":>10}')
+        for path in settings.PASSWORD_HASHERS:
+            hasher = import_string(path)()
+            try:
+                encoded = hasher.encode(PASSWORD, hasher.salt())
+            except ValueError:
+                self.stdout.write(f'{path:<60}{"нет библиотеки":>20}')
+                continue
+            self.report(path, cpu_ms(
+                lambda: hasher.verify(PASSWORD, encoded), repeat
+            ))
+
+        with scratch_database(), override_settings(
+            ALLOWED_HOSTS=['testserver'],
+            # Замер сам упёрся бы в ограничение попыток входа.
+            RATELIMITS={'users:login': None, 'users:login:account': None},
+        ):
+            User.objects.create_user(username='bench', password=PASSWORD)
+            client = Client()
+            url = reverse('users:login')
+            login = {'username': 'bench', 'password': PASSWORD}
+            # Первый вход прогревает шаблоны и кеши и в замер не входит.
+            client.post(url, login)
+            self.report('вход целиком', cpu_ms(
+                lambda: client.post(url, login), repeat
+            ))
+        self.stdout.write(self.style.SUCCESS(
+            f'Новые пароли хешируются {get_hasher().algorithm}'
+        ))
+
+    def report(self, label, milliseconds):
+        per_second = 1000 / max(milliseconds, 0.001)
+        self.stdout.write(
+            f'{label:<60}{milliseconds:>10.1f}{per_second:>10.1f}'
+        )
@@ -0,0 +1,86 @@
+from http import HTTPStatus
+
+from django.contrib.auth import get_user_model
+from django.contrib.auth.hashers import make_password
+from django.core.cache import cache
+from django.test import TestCase, override_settings
+from django.urls import reverse
+
+User = get_user_model()
+
+PASSWORD = 'Secret-password-1'
+
+
+@override_settings(RATELIMITS={
+    'users:login': '3/m',
+    'users:login:account': '2/m',
+})
+class LoginThrottleTests(TestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create_user(
+            username='HasNoName', password=PASSWORD
+        )
+
+    def setUp(self):
+        cache.clear()
+        self.url = reverse('users:login')
+
+    def login(self, username, ip, password='wrong'):
+        return self.client.post(
+            self.url, {'username': username, 'password': password},
+            REMOTE_ADDR=ip,
+        )
+
+    def test_account_limited_across_ips(self):
+        """Подбор пароля к одной учётной записи с разных IP ограничен."""
+        for number in range(2):
+            self.login('HasNoName', f'10.0.0.{number}')
+        response = self.login('hasnoname', '10.0.0.9', PASSWORD)
+        self.assertEqual(response.status_code, HTTPStatus.TOO_MANY_REQUESTS)
+        self.assertNotIn('_auth_user_id', self.client.session)
+
+    def test_ip_limited_across_accounts(self):
+        """Перебор учётных записей с одного IP ограничен."""
+        for number in range(3):
+            self.login(f'user{number}', '10.0.0.1')
+        response = self.login('HasNoName', '10.0.0.1', PASSWORD)
+        self.assertEqual(response.status_code, HTTPStatus.TOO_MANY_REQUESTS)
+
+    def test_login_within_limit(self):
+        """В пределах лимита вход работает."""
+        response = self.login('HasNoName', '10.0.0.1', PASSWORD)
+        self.assertRedirects(response, reverse('posts:main_menu'))
+
+
+class PasswordRehashTests(TestCase):
+
+    def login_and_reload(self, user):
+        self.client.post(
+            reverse('users:login'),
+            {'username': user.username, 'password': PASSWORD},
+        )
+        user.refresh_from_db()
+        return user.password
+
+    @override_settings(
+        PASSWORD_HASHERS=[
+            'users.hashers.PBKDF2PasswordHasher',
+            'django.contrib.auth.hashers.MD5PasswordHasher',
+        ],
+        PASSWORD_PBKDF2_ITERATIONS=1000,
+    )
+    def test_old_hashes_upgraded_on_login(self):
+        """Хеш старым хешером или с другой стоимостью пересчитывается."""
+        user = User.objects.create(
+            username='old',
+            password=make_password(PASSWORD, hasher='md5'),
+        )
+        self.assertTrue(
+            self.login_and_reload(user).startswith('pbkdf2_sha256$1000$')
+        )
+        with self.settings(PASSWORD_PBKDF2_ITERATIONS=2000):
+            self.assertTrue(
+                self.login_and_reload(user).startswith('pbkdf2_sha256$2000$')
+            )
@@ -0,0 +1,46 @@
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.test import Client, TestCase
+from django.urls import reverse
+
+User = get_user_model()
+
+
+class CachedSessionTests(TestCase):
+
+    def setUp(self):
+        cache.clear()
+        self.user = User.objects.create_user(username='HasNoName')
+        self.authorized_client = Client()
+        self.authorized_client.force_login(self.user)
+        self.url = reverse('about:author')
+
+    def test_guest_does_not_touch_session_store(self):
+        """Гость без cookie сессии не делает запросов к базе."""
+        with self.assertNumQueries(0):
+            self.client.get(self.url)
+
+    def test_stale_session_cookie_checked_once(self):
+        """Несуществующая сессия проверяется в базе один раз."""
+        self.client.cookies[settings.SESSION_COOKIE_NAME] = 'x' * 32
+        with self.assertNumQueries(1):
+            self.client.get(self.url)
+        self.client.cookies[settings.SESSION_COOKIE_NAME] = 'x' * 32
+        with self.assertNumQueries(0):
+            self.client.get(self.url)
+
+    def test_user_lookup_is_cached(self):
+        """Повторный запрос пользователя не читает сессию и auth_user."""
+        self.authorized_client.get(self.url)
+        with self.assertNumQueries(0):
+            response = self.authorized_client.get(self.url)
+        self.assertEqual(response.wsgi_request.user, self.user)
+
+    def test_user_change_invalidates_cache(self):
+        """Сохранение пользователя сбрасывает закешированную копию."""
+        self.authorized_client.get(self.url)
+        self.user.first_name = 'Новое имя'
+        self.user.save()
+        response = self.authorized_client.get(self.url)
+        self.assertEqual(response.wsgi_request.user.first_name, 'Новое имя')
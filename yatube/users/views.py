@@ -1,10 +1,38 @@
+import hashlib
+
+from django.contrib.auth.views import LoginView
 from django.urls import reverse_lazy
+from django.utils.decorators import method_decorator
 from django.views.generic import CreateView
 
+from core.ratelimit import ratelimit
+
 from .forms import CreationForm
 
 
+def account_key(request):
+    """Учётная запись, в которую пытаются войти, независимо от IP."""
+    username = request.POST.get('username', '').strip().lower()
+    if not username:
+        return None
+    return 'account:' + hashlib.md5(username.encode()).hexdigest()
+
+
+@method_decorator(ratelimit('users:signup', '10/h', key='ip'), 'dispatch')
 class SignUp(CreateView):
     form_class = CreationForm
     success_url = reverse_lazy('posts:main_menu')
     template_name = 'users/signup.html'
+
+
+@method_decorator(ratelimit('users:login', '20/m', key='ip'), 'dispatch')
+@method_decorator(
+    ratelimit('users:login:account', '5/m', key=account_key), 'dispatch'
+)
+class ThrottledLoginView(LoginView):
+    """
+    Вход с ограничением попыток с одного IP и в одну учётную запись.
+
+    Лимит проверяется до хеширования пароля, поэтому перебор не
+    расходует CPU на проверку хеша.
+    """
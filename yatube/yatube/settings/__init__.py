@@ -0,0 +1,18 @@
+"""
+Выбор профиля настроек по переменной окружения YATUBE_ENV.
+
+dev (по умолчанию) - локальная разработка, prod - боевой сервер.
+"""
+import os
+
+YATUBE_ENV = os.environ.get('YATUBE_ENV', 'dev')
+
+if YATUBE_ENV == 'prod':
+    from .prod import *  # noqa: F401,F403
+elif YATUBE_ENV == 'dev':
+    from .dev import *  # noqa: F401,F403
+else:
+    raise ValueError(
+        f'Неизвестный профиль настроек YATUBE_ENV={YATUBE_ENV!r}, '
+        'ожидается dev или prod'
+    )
@@ -0,0 +1,264 @@
+"""
+Django settings for yatube project.
+
+Общие настройки всех окружений. Конкретный профиль (dev/prod) выбирается
+переменной окружения YATUBE_ENV в yatube/settings/__init__.py.
+
+Generated by 'django-admin startproject' using Django 2.2.19.
+
+For more information on this file, see
+https://docs.djangoproject.com/en/2.2/topics/settings/
+
+For the full list of settings and their values, see
+https://docs.djangoproject.com/en/2.2/ref/settings/
+"""
+
+import os
+from importlib.util import find_spec
+
+# Build paths inside the project like this: os.path.join(BASE_DIR, ...)
+BASE_DIR = os.path.dirname(
+    os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+)
+
+
+# SECRET_KEY, DEBUG и ALLOWED_HOSTS задаются в профилях dev.py и prod.py
+# See https://docs.djangoproject.com/en/2.2/howto/deployment/checklist/
+
+DEBUG = False
+
+ALLOWED_HOSTS = []
+
+
+# Application definition
+
+INSTALLED_APPS = [
+    'about.apps.AboutConfig',
+    'core.apps.CoreConfig',
+    'users.apps.UsersConfig',
+    'posts.apps.PostsConfig',
+    'django.contrib.admin',
+    'django.contrib.auth',
+    'django.contrib.contenttypes',
+    'django.contrib.sessions',
+    'django.contrib.messages',
+    'django.contrib.staticfiles',
+    'django.contrib.sitemaps',
+    'sorl.thumbnail',
+]
+
+MIDDLEWARE = [
+    'core.middleware.MetricsMiddleware',
+    'django.middleware.security.SecurityMiddleware',
+    'core.middleware.NotFoundMiddleware',
+    'django.contrib.sessions.middleware.SessionMiddleware',
+    'django.middleware.common.CommonMiddleware',
+    'django.middleware.csrf.CsrfViewMiddleware',
+    'django.contrib.auth.middleware.AuthenticationMiddleware',
+    'django.contrib.messages.middleware.MessageMiddleware',
+    'django.middleware.clickjacking.XFrameOptionsMiddleware',
+]
+
+ROOT_URLCONF = 'yatube.urls'
+TEMPLATES_DIR = os.path.join(BASE_DIR, 'templates')
+
+TEMPLATES = [
+    {
+        'BACKEND': 'django.template.backends.django.DjangoTemplates',
+        'DIRS': [TEMPLATES_DIR],
+        'APP_DIRS': True,
+        'OPTIONS': {
+            'context_processors': [
+                'django.template.context_processors.debug',
+                'django.template.context_processors.request',
+                'django.contrib.auth.context_processors.auth',
+                'django.contrib.messages.context_processors.messages',
+                'core.context_processors.year.year',
+            ],
+        },
+    },
+]
+
+WSGI_APPLICATION = 'yatube.wsgi.application'
+
+
+# Database
+# https://docs.djangoproject.com/en/2.2/ref/settings/#databases
+
+DATABASES = {
+    'default': {
+        'ENGINE': 'django.db.backends.sqlite3',
+        'NAME': os.path.join(BASE_DIR, 'db.sqlite3'),
+    }
+}
+
+# Архивные посты уходят в базу с псевдонимом ARCHIVE_DATABASE, если она
+# описана в DATABASES, иначе остаются в основной (см. posts.routers).
+DATABASE_ROUTERS = ['posts.routers.ArchiveRouter']
+ARCHIVE_DATABASE = 'archive'
+ARCHIVE_AFTER_DAYS = 365
+
+
+# Sessions and authentication
+# Сессии из кеша с подстраховкой в базе, пользователь запроса тоже из кеша.
+# Запросы без cookie сессии хранилище не трогают вовсе.
+# Замер: python manage.py bench_session
+
+SESSION_ENGINE = 'core.sessions'
+
+AUTHENTICATION_BACKENDS = ['users.backends.CachedModelBackend']
+
+
+# Password validation
+# https://docs.djangoproject.com/en/2.2/ref/settings/#auth-password-validators
+
+AUTH_PASSWORD_VALIDATORS = [
+    {
+        'NAME': 'django.contrib.auth.password_validation.UserAttributeSimilarityValidator',
+    },
+    {
+        'NAME': 'django.contrib.auth.password_validation.MinimumLengthValidator',
+    },
+    {
+        'NAME': 'django.contrib.auth.password_validation.CommonPasswordValidator',
+    },
+    {
+        'NAME': 'django.contrib.auth.password_validation.NumericPasswordValidator',
+    },
+]
+
+
+# Новые пароли хешируются Argon2 (argon2-cffi) или bcrypt, если пакет
+# установлен, иначе PBKDF2. Хеши остальных хешеров списка проверяются и при
+# входе пересчитываются первым. Стоимость - ниже, замер: manage.py bench_auth
+PASSWORD_HASHERS = [
+    *(['users.hashers.Argon2PasswordHasher'] if find_spec('argon2') else []),
+    *(['users.hashers.BCryptSHA256PasswordHasher']
+      if find_spec('bcrypt') else []),
+    'users.hashers.PBKDF2PasswordHasher',
+    'django.contrib.auth.hashers.PBKDF2SHA1PasswordHasher',
+]
+PASSWORD_ARGON2_TIME_COST = 2
+PASSWORD_ARGON2_MEMORY_COST = 512
+PASSWORD_ARGON2_PARALLELISM = 2
+PASSWORD_BCRYPT_ROUNDS = 12
+PASSWORD_PBKDF2_ITERATIONS = 150000
+
+
+# Internationalization
+# https://docs.djangoproject.com/en/2.2/topics/i18n/
+
+LANGUAGE_CODE = 'ru'
+
+TIME_ZONE = 'UTC'
+
+USE_I18N = True
+
+USE_L10N = True
+
+USE_TZ = True
+
+
+# Static files (CSS, JavaScript, Images)
+# https://docs.djangoproject.com/en/2.2/howto/static-files/
+
+STATIC_URL = '/static/'
+
+STATICFILES_DIRS = [os.path.join(BASE_DIR, 'static')]
+
+STATIC_ROOT = os.path.join(BASE_DIR, 'collected_static')
+
+# Файлы, из которых при сборке (manage.py build_static) удаляются селекторы,
+# не встречающиеся в шаблонах. Классы, которые появляются только из Python,
+# перечисляются в STATIC_PURGE_SAFELIST.
+STATIC_PURGE_CSS = ['css/bootstrap.min.css']
+STATIC_PURGE_SAFELIST = []
+
+LOGIN_URL = 'users:login'
+LOGIN_REDIRECT_URL = 'posts:main_menu'
+# LOGOUT_REDIRECT_URL = 'posts:main_menu'
+
+
+EMAIL_BACKEND = 'django.core.mail.backends.filebased.EmailBackend'
+# указываем директорию, в которую будут складываться файлы писем
+EMAIL_FILE_PATH = [os.path.join(BASE_DIR, 'sent_emails')]
+
+CSRF_FAILURE_VIEW = 'core.views.csrf_failure'
+
+MEDIA_URL = '/media/'
+MEDIA_ROOT = os.path.join(BASE_DIR, 'media')
+
+# Загрузки хранятся под хешем содержимого, осиротевшие файлы удаляет
+# manage.py gc_media. Для S3-совместимого хранилища:
+# core.storage.ContentAddressedS3Storage (нужен django-storages).
+DEFAULT_FILE_STORAGE = 'core.storage.ContentAddressedFileSystemStorage'
+# sorl сам выбирает имена миниатюр, адресация по содержимому ему не нужна.
+THUMBNAIL_STORAGE = 'django.core.files.storage.FileSystemStorage'
+
+# Лимиты записи по view: 'число/период' (s, m, h, d), None - без лимита.
+# См. core.ratelimit.
+RATELIMITS = {
+    'posts:post_create': '5/m',
+    'posts:add_comment': '10/m',
+    'posts:post_like': '30/m',
+    # Потоковые ленты (?stream=1) - на пользователя или IP гостя.
+    'posts:stream': '5/m',
+    # Попытки входа: с одного IP и в одну учётную запись.
+    'users:login': '20/m',
+    'users:login:account': '5/m',
+    'users:signup': '10/h',
+}
+# Сколько прокси перед Django дописывают адрес в X-Forwarded-For (обычно
+# 1 - nginx). 0: заголовку не верим и берём REMOTE_ADDR.
+RATELIMIT_TRUSTED_PROXIES = 0
+
+# Буферизованные счётчики (core.counters): раз в сколько секунд
+# flush_counters --every записывает накопленные приращения в базу.
+COUNTERS_FLUSH_INTERVAL = 10
+# Повторный просмотр поста тем же зрителем в течение окна не считается.
+VIEWS_DEDUP_WINDOW = 30 * 60
+
+# За сколько часов событие вдвое теряет вес в ленте популярного
+# (posts.trending). После изменения: manage.py recompute_trending.
+TRENDING_HALF_LIFE_HOURS = 24
+
+CACHES = {
+    'default': {
+        'BACKEND': 'core.metrics.InstrumentedLocMemCache',
+    }
+}
+
+# Временный MEDIA_ROOT на процесс и быстрый хеш паролей в тестах;
+# прогон в несколько процессов: manage.py test --parallel.
+TEST_RUNNER = 'core.test_runner.YatubeTestRunner'
+
+# Ленты (index, group_posts, profile) кешируются целиком для всех
+# пользователей на столько секунд; шапка подставляется на каждый запрос
+# (core.holes).
+HOLES_CACHE_TIMEOUT = 20
+
+# Страницы, которые manage.py prerender при деплое рендерит в HTML для
+# гостей (core.prerender), вместе со страницами ошибок.
+PRERENDER_ROOT = os.path.join(BASE_DIR, 'prerendered')
+PRERENDER_PAGES = ['about:author', 'about:tech']
+PRERENDER_MAX_AGE = 24 * 60 * 60
+
+# Гости получают закешированный ответ 404 на адрес, отвечавший 404, в
+# течение стольких секунд (core.not_found); 0 - не кешировать.
+NOT_FOUND_CACHE_TIMEOUT = 10 * 60
+# Адрес считается в top_404, если отвечал 404 дважды за окно (секунды);
+# больше стольких адресов в базе не хранится.
+NOT_FOUND_ADMIT_WINDOW = 60 * 60
+NOT_FOUND_MAX_PATHS = 10000
+
+# Карта сайта и RSS/Atom (core.conditional) кешируются до изменения постов,
+# но не дольше стольких секунд.
+CONDITIONAL_CACHE_TIMEOUT = 24 * 60 * 60
+
+# Метрики для Prometheus (core.metrics) на /metrics. Воркеры складывают
+# свои значения в METRICS_DIR; без него видно только ответивший процесс.
+METRICS_DIR = None
+METRICS_DUMP_INTERVAL = 1
+METRICS_NAMESPACES = ['posts', 'users', 'about']
+# Prometheus передаёт его в Authorization: Bearer; None - /metrics закрыт.
+METRICS_TOKEN = None
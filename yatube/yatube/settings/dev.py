@@ -0,0 +1,14 @@
+"""Настройки для локальной разработки."""
+from .base import *  # noqa: F401,F403
+
+# SECURITY WARNING: keep the secret key used in production secret!
+SECRET_KEY = 'xd$@ydpcte26qt%rwp8vwqlio&ndih8n0r(0+23_@l0i0$kre3'
+
+DEBUG = True
+
+ALLOWED_HOSTS = [
+    'localhost',
+    '127.0.0.1',
+    '[::1]',
+    'testserver',
+]
@@ -0,0 +1,80 @@
+"""
+Настройки боевого сервера.
+
+Значения, зависящие от окружения, читаются из переменных окружения.
+Проверить профиль на медленные настройки:
+    YATUBE_ENV=prod python manage.py check --deploy --tag performance
+"""
+import os
+
+from .base import *  # noqa: F401,F403
+from .base import ARCHIVE_DATABASE, BASE_DIR, MIDDLEWARE, TEMPLATES
+
+SECRET_KEY = os.environ['DJANGO_SECRET_KEY']
+
+DEBUG = False
+
+ALLOWED_HOSTS = os.environ.get('DJANGO_ALLOWED_HOSTS', 'localhost').split(',')
+
+# Соединение с базой живёт между запросами, а не открывается на каждый.
+DATABASES = {
+    'default': {
+        'ENGINE': 'django.db.backends.sqlite3',
+        'NAME': os.environ.get(
+            'DJANGO_DB_PATH', os.path.join(BASE_DIR, 'db.sqlite3')
+        ),
+        'CONN_MAX_AGE': 600,
+    }
+}
+if os.environ.get('DJANGO_ARCHIVE_DB_PATH'):
+    DATABASES[ARCHIVE_DATABASE] = {
+        'ENGINE': 'django.db.backends.sqlite3',
+        'NAME': os.environ['DJANGO_ARCHIVE_DB_PATH'],
+        'CONN_MAX_AGE': 600,
+    }
+
+# Шаблоны компилируются один раз на процесс.
+TEMPLATES[0]['APP_DIRS'] = False
+TEMPLATES[0]['OPTIONS']['loaders'] = [
+    ('django.template.loaders.cached.Loader', [
+        'django.template.loaders.filesystem.Loader',
+        'django.template.loaders.app_directories.Loader',
+    ]),
+]
+
+# Кеш общий для всех воркеров, а не свой у каждого процесса.
+CACHES = {
+    'default': {
+        'BACKEND': 'core.metrics.InstrumentedMemcachedCache',
+        'LOCATION': os.environ.get('MEMCACHED_LOCATION', '127.0.0.1:11211'),
+        'KEY_PREFIX': 'yatube',
+    }
+}
+
+# gunicorn слушает 127.0.0.1 за nginx: REMOTE_ADDR у всех один, и без
+# X-Forwarded-For все гости делили бы один лимит.
+RATELIMIT_TRUSTED_PROXIES = int(
+    os.environ.get('DJANGO_RATELIMIT_TRUSTED_PROXIES', 1)
+)
+
+SESSION_COOKIE_SECURE = True
+CSRF_COOKIE_SECURE = True
+
+# Имена статики с хешем содержимого и сжатые копии рядом с файлами.
+# Собирается командой manage.py build_static.
+STATICFILES_STORAGE = 'core.staticfiles.CompressedManifestStaticFilesStorage'
+
+# Статика отдаётся до сессий и аутентификации, с вечным кешем, а заранее
+# отрендеренные страницы (manage.py prerender) - гостям без шаблонов.
+MIDDLEWARE = [
+    *MIDDLEWARE[:2],
+    'core.middleware.StaticFilesMiddleware',
+    'core.middleware.PrerenderedPagesMiddleware',
+    *MIDDLEWARE[2:],
+]
+
+# Общий каталог метрик всех воркеров; очищается при старте gunicorn.
+METRICS_DIR = os.environ.get(
+    'DJANGO_METRICS_DIR', os.path.join(BASE_DIR, 'metrics')
+)
+METRICS_TOKEN = os.environ.get('DJANGO_METRICS_TOKEN')
@@ -1,6 +1,16 @@
 from django.contrib import admin
+from django.contrib.sitemaps import views as sitemap_views
 from django.urls import include, path
 
+from core import views as core_views
+from core.conditional import cache_conditional
+from posts import sitemaps
+
+# Каждый документ карты сайта перестраивается только после изменений,
+# которые его касаются (posts.sitemaps); из параметров на него влияет
+# только номер страницы p.
+cached_sitemap = cache_conditional(sitemaps.generation, params=('p',))
+
 handler404 = 'core.views.page_not_found'
 
 urlpatterns = [
@@ -8,5 +18,21 @@ urlpatterns = [
     path('auth/', include('django.contrib.auth.urls')),
     path('admin/', admin.site.urls),
     path('about/', include(('about.urls', 'about'), namespace='about')),
+    path(
+        'fragments/<slug:name>/', core_views.fragment, name='fragment'
+    ),
+    path('metrics', core_views.metrics, name='metrics'),
+    path(
+        'sitemap.xml',
+        cached_sitemap(sitemap_views.index),
+        {'sitemaps': sitemaps.SITEMAPS, 'sitemap_url_name': 'sitemap'},
+        name='sitemap_index'
+    ),
+    path(
+        'sitemap-<section>.xml',
+        cached_sitemap(sitemap_views.sitemap),
+        {'sitemaps': sitemaps.SITEMAPS},
+        name='sitemap'
+    ),
     path('', include('posts.urls', namespace='posts'))
 ]